@@ -0,0 +1,55 @@
+from pathlib import Path
+from timeit import repeat
+from typing import Callable, List
+
+from n2t.core.assembler.instruction import CInstruction
+from n2t.core.util.parser import DeleteCommentAndStrip
+from n2t.core.util.trash_filter import CompositeTrashFilter
+
+PROGRAM = Path(__file__).parent.parent.joinpath("tests", "e2e", "asm", "pong.asm")
+REPEAT = 5
+NUMBER = 10
+
+
+def load_c_instructions(path: Path) -> List[CInstruction]:
+    with path.open("r") as file:
+        lines = map(str.strip, file)
+        parsed = map(
+            DeleteCommentAndStrip(), filter(CompositeTrashFilter.passes, lines)
+        )
+        return [
+            CInstruction(line)
+            for line in parsed
+            if not line.startswith("@") and "(" not in line
+        ]
+
+
+def per_field_lookup(instructions: List[CInstruction]) -> None:
+    for instruction in instructions:
+        f"111{instruction.get_comp()}{instruction.get_dest()}{instruction.get_jump()}"
+
+
+def table_lookup(instructions: List[CInstruction]) -> None:
+    for instruction in instructions:
+        instruction.get_bits()
+
+
+def measure(
+    encode: Callable[[List[CInstruction]], None], items: List[CInstruction]
+) -> float:
+    return min(repeat(lambda: encode(items), repeat=REPEAT, number=NUMBER)) / NUMBER
+
+
+def main() -> None:
+    instructions = load_c_instructions(PROGRAM)
+    baseline = measure(per_field_lookup, instructions)
+    table = measure(table_lookup, instructions)
+
+    print(f"{len(instructions)} C-instructions from {PROGRAM.name}")
+    print(f"per-field lookup: {baseline * 1000:8.3f} ms")
+    print(f"table lookup:     {table * 1000:8.3f} ms")
+    print(f"speedup:          {baseline / table:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from array import array
+from timeit import repeat
+
+from n2t.core.assembler.instruction import CInstruction
+from n2t.core.disassembler import ControlFlowGraph
+
+LOOP = ["@16", "D=M", "@100", "D;JGT", "M=D+1"]
+REPEAT = 5
+NUMBER = 3
+
+
+def full_rom() -> array[int]:
+    return array(
+        "H",
+        (
+            int(word[1:]) if word.startswith("@") else CInstruction.encode(word)
+            for word in LOOP * (32767 // len(LOOP))
+        ),
+    )
+
+
+def main() -> None:
+    words = full_rom()
+    seconds = min(
+        repeat(lambda: ControlFlowGraph.build(words), repeat=REPEAT, number=NUMBER)
+    )
+    graph = ControlFlowGraph.build(words)
+
+    print(f"{len(words)} words, {len(graph)} blocks")
+    print(f"build:            {seconds / NUMBER * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+from timeit import repeat
+from typing import List, Union
+
+from n2t.core import CompactAssembler, ParallelAssembler
+
+PROGRAM = Path(__file__).parent.parent.joinpath("tests", "e2e", "asm", "pong.asm")
+JOBS = [2, 4]
+REPEAT = 3
+NUMBER = 1
+
+
+def measure(
+    assembler: Union[CompactAssembler, ParallelAssembler], lines: List[str]
+) -> float:
+    seconds = repeat(
+        lambda: assembler.assemble_words(lines), repeat=REPEAT, number=NUMBER
+    )
+    return min(seconds) / NUMBER
+
+
+def main() -> None:
+    lines = PROGRAM.read_text().splitlines()
+    serial = measure(CompactAssembler.create(), lines)
+
+    print(f"{len(lines)} lines from {PROGRAM.name}, {os.cpu_count()} CPUs")
+    print(f"serial:           {serial * 1000:8.3f} ms")
+    for jobs in JOBS:
+        parallel = measure(ParallelAssembler.create(jobs), lines)
+        print(
+            f"{jobs} workers:        {parallel * 1000:8.3f} ms "
+            f"({serial / parallel:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
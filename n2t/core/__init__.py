@@ -1,7 +1,26 @@
-from n2t.core.assembler import Assembler
-from n2t.core.disassembler import Disassembler
+from n2t.core.assembler import (
+    Assembler,
+    AssemblyCache,
+    CompactAssembler,
+    IncrementalAssembler,
+    ParallelAssembler,
+    PeepholeOptimizer,
+    ReuseReport,
+    StreamingAssembler,
+)
+from n2t.core.disassembler import ControlFlowGraph, Disassembler
+from n2t.core.vm_emulator import VMEmulator
 
 __all__ = [
     "Assembler",
+    "AssemblyCache",
+    "CompactAssembler",
+    "ControlFlowGraph",
     "Disassembler",
+    "IncrementalAssembler",
+    "ParallelAssembler",
+    "PeepholeOptimizer",
+    "ReuseReport",
+    "StreamingAssembler",
+    "VMEmulator",
 ]
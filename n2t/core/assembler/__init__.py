@@ -1,5 +1,25 @@
-from n2t.core.assembler.facade import Assembler
+from n2t.core.assembler.facade import Assembler, CompactAssembler
+from n2t.core.assembler.incremental import (
+    AssemblyCache,
+    IncrementalAssembler,
+    ReuseReport,
+)
+from n2t.core.assembler.optimizer import OptimizationReport, PeepholeOptimizer
+from n2t.core.assembler.parallel import ParallelAssembler
+from n2t.core.assembler.source_map import SourceLocation, SourceMap, SourceMapView
+from n2t.core.assembler.streaming import StreamingAssembler
 
 __all__ = [
     "Assembler",
+    "AssemblyCache",
+    "CompactAssembler",
+    "IncrementalAssembler",
+    "OptimizationReport",
+    "ParallelAssembler",
+    "PeepholeOptimizer",
+    "ReuseReport",
+    "SourceLocation",
+    "SourceMap",
+    "SourceMapView",
+    "StreamingAssembler",
 ]
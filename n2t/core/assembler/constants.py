@@ -55,6 +55,8 @@ JUMP_TABLE: Dict[str, str] = {
     "JMP": "111",
 }
 
+MAX_A_VALUE: int = 0x7FFF
+
 PREDEDINED_SYMBOLS_TABLE: Dict[str, int] = {
     "SP": 0,
     "LCL": 1,
@@ -80,3 +82,16 @@ PREDEDINED_SYMBOLS_TABLE: Dict[str, int] = {
     "SCREEN": 16384,
     "KBD": 24576,
 }
+
+C_INSTRUCTION_TABLE: Dict[str, str] = {
+    f"{dest}={comp};{jump}".removeprefix("=").removesuffix(";"): (
+        f"111{comp_bits}{dest_bits}{jump_bits}"
+    )
+    for comp, comp_bits in COMP_TABLE.items()
+    for dest, dest_bits in DEST_TABLE.items()
+    for jump, jump_bits in JUMP_TABLE.items()
+}
+
+C_INSTRUCTION_WORDS: Dict[str, int] = {
+    instruction: int(bits, base=2) for instruction, bits in C_INSTRUCTION_TABLE.items()
+}
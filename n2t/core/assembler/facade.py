@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Iterable
+from typing import Iterable, Optional, Tuple
 
 from n2t.core.assembler.constants import PREDEDINED_SYMBOLS_TABLE
 from n2t.core.assembler.instruction import ACLFactory, InstructionFactory, LInstruction
+from n2t.core.assembler.ir import (
+    AssemblyIR,
+    IRAfterReservedCounter,
+    IRBuilder,
+    IRInstructionCounter,
+    IRLabelPass,
+    IRSymbolPass,
+    IRWordEncoder,
+)
+from n2t.core.assembler.optimizer import IROptimizer
+from n2t.core.assembler.source_map import SourceMap
 from n2t.core.assembler.util import (
     AfterReservedCounter,
     InstructionCounter,
     LabelAddressGenerator,
     SymbolAddressGenerator,
 )
+from n2t.core.assembler.vectorized import HackTextRenderer, VectorizedEncoder
 from n2t.core.util.parser import DeleteCommentAndStrip, InstructionParser
 from n2t.core.util.trash_filter import CompositeTrashFilter, TrashFilter
 
@@ -51,3 +64,47 @@ class Assembler:
         )
         binary = map(lambda instruction: instruction.get_bits(), ac_instructions_mapped)
         return binary
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        return array("H", (int(bits, base=2) for bits in self.assemble(assembly)))
+
+    def assemble_text(self, assembly: Iterable[str]) -> bytes:
+        return HackTextRenderer.render(self.assemble_words(assembly))
+
+
+@dataclass
+class CompactAssembler:
+    builder: IRBuilder = field(default_factory=IRBuilder)
+    label_pass: IRLabelPass = field(default_factory=IRInstructionCounter)
+    symbol_pass: IRSymbolPass = field(default_factory=IRAfterReservedCounter)
+    encoder: IRWordEncoder = field(default_factory=VectorizedEncoder)
+    optimizer: Optional[IROptimizer] = None
+
+    @classmethod
+    def create(cls) -> CompactAssembler:
+        return cls()
+
+    def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
+        return (format(word, "016b") for word in self.assemble_words(assembly))
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        ir = self._build(assembly)
+        addresses = self.symbol_pass(ir, self.label_pass(ir))
+        return self.encoder.encode(ir, addresses)
+
+    def assemble_mapped(
+        self, assembly: Iterable[str], source: str
+    ) -> Tuple[array[int], SourceMap]:
+        ir = self._build(assembly)
+        addresses = self.symbol_pass(ir, self.label_pass(ir))
+        words = self.encoder.encode(ir, addresses)
+        return words, SourceMap.from_ir(ir, addresses, source)
+
+    def _build(self, assembly: Iterable[str]) -> AssemblyIR:
+        ir = self.builder.build(assembly)
+        if self.optimizer is not None:
+            ir = self.optimizer(ir)
+        return ir
+
+    def assemble_text(self, assembly: Iterable[str]) -> bytes:
+        return HackTextRenderer.render(self.assemble_words(assembly))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import sys
+import zlib
+from array import array
+from base64 import b64decode, b64encode
+from dataclasses import dataclass, field
+from hashlib import sha1
+from typing import Any, Dict, Iterable, Iterator, List
+
+from n2t.core.assembler.constants import PREDEDINED_SYMBOLS_TABLE
+from n2t.core.assembler.ir import IRBuilder
+from n2t.core.assembler.parallel import Chunk, ChunkLayout, SymbolTableMerger
+from n2t.core.assembler.vectorized import HackTextRenderer
+
+CACHE_VERSION: int = 1
+MIN_CHUNK_LINES: int = 32
+CHUNK_BOUNDARY_MODULUS: int = 64
+
+
+@dataclass
+class CachedChunk(ChunkLayout):
+    symbols: Dict[str, int] = field(default_factory=dict)
+    words: array[int] = field(default_factory=lambda: array("H"))
+
+    def is_valid_for(self, table: Dict[str, int]) -> bool:
+        return all(table.get(name) == address for name, address in self.symbols.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        words = array("H", self.words)
+        if sys.byteorder != "little":
+            words.byteswap()
+        return {
+            "length": self.length,
+            "labels": self.labels,
+            "references": self.references,
+            "symbols": self.symbols,
+            "words": b64encode(words.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> CachedChunk:
+        words = array("H")
+        words.frombytes(b64decode(data["words"]))
+        if sys.byteorder != "little":
+            words.byteswap()
+        return cls(
+            length=data["length"],
+            labels=data["labels"],
+            references=data["references"],
+            symbols=data["symbols"],
+            words=words,
+        )
+
+
+@dataclass
+class AssemblyCache:
+    variables: List[str] = field(default_factory=list)
+    chunks: Dict[str, CachedChunk] = field(default_factory=dict)
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "variables": self.variables,
+                "chunks": {
+                    digest: chunk.to_dict() for digest, chunk in self.chunks.items()
+                },
+            }
+        )
+
+    @classmethod
+    def loads(cls, text: str) -> AssemblyCache:
+        try:
+            data = json.loads(text)
+            if data["version"] != CACHE_VERSION:
+                return cls()
+            return cls(
+                variables=data["variables"],
+                chunks={
+                    digest: CachedChunk.from_dict(chunk)
+                    for digest, chunk in data["chunks"].items()
+                },
+            )
+        except (ValueError, KeyError, TypeError):
+            return cls()
+
+
+@dataclass
+class ReuseReport:
+    reused_words: int = 0
+    total_words: int = 0
+    reused_chunks: int = 0
+    total_chunks: int = 0
+    full_build: bool = False
+
+
+@dataclass
+class IncrementalAssembler:
+    cache: AssemblyCache = field(default_factory=AssemblyCache)
+    builder: IRBuilder = field(default_factory=IRBuilder)
+    report: ReuseReport = field(default_factory=ReuseReport)
+
+    @classmethod
+    def create(cls, cache: AssemblyCache) -> IncrementalAssembler:
+        return cls(cache=cache)
+
+    def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
+        return (format(word, "016b") for word in self.assemble_words(assembly))
+
+    def assemble_text(self, assembly: Iterable[str]) -> bytes:
+        return HackTextRenderer.render(self.assemble_words(assembly))
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        sources = list(self._split(list(assembly)))
+        digests = [sha1("\n".join(lines).encode()).hexdigest() for lines in sources]
+
+        layouts: List[ChunkLayout] = []
+        scanned: Dict[int, Chunk] = {}
+        for index, (digest, lines) in enumerate(zip(digests, sources)):
+            if digest in self.cache.chunks:
+                layouts.append(self.cache.chunks[digest])
+            else:
+                scanned[index] = Chunk.scan(self.builder, lines)
+                layouts.append(scanned[index])
+
+        reserved = PREDEDINED_SYMBOLS_TABLE | SymbolTableMerger.labels(layouts)
+        variables = SymbolTableMerger.variables(layouts, reserved)
+        table = reserved | variables
+        full_build = bool(self.cache.chunks) and list(variables) != self.cache.variables
+
+        self.report = ReuseReport(total_chunks=len(sources), full_build=full_build)
+        cache = AssemblyCache(variables=list(variables))
+        words = array("H")
+        for index, (digest, lines) in enumerate(zip(digests, sources)):
+            cached = self.cache.chunks.get(digest)
+            if not full_build and cached is not None and cached.is_valid_for(table):
+                self.report.reused_words += len(cached.words)
+                self.report.reused_chunks += 1
+                entry = cached
+            else:
+                chunk = scanned.get(index) or Chunk.scan(self.builder, lines)
+                entry = CachedChunk(
+                    length=chunk.length,
+                    labels=chunk.labels,
+                    references=chunk.references,
+                    symbols={name: table[name] for name in chunk.references},
+                    words=chunk.encode(table),
+                )
+            cache.chunks[digest] = entry
+            words.extend(entry.words)
+
+        self.report.total_words = len(words)
+        self.cache = cache
+        return words
+
+    @classmethod
+    def _split(cls, lines: List[str]) -> Iterator[List[str]]:
+        chunk: List[str] = []
+        for line in lines:
+            if len(chunk) >= MIN_CHUNK_LINES and cls._is_boundary(line):
+                yield chunk
+                chunk = []
+            chunk.append(line)
+        if chunk:
+            yield chunk
+
+    @classmethod
+    def _is_boundary(cls, line: str) -> bool:
+        if line.startswith("("):
+            return True
+        return zlib.crc32(line.encode()) % CHUNK_BOUNDARY_MODULUS == 0
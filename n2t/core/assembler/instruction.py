@@ -2,7 +2,14 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Dict, Protocol
 
-from n2t.core.assembler.constants import COMP_TABLE, DEST_TABLE, JUMP_TABLE
+from n2t.core.assembler.constants import (
+    C_INSTRUCTION_TABLE,
+    C_INSTRUCTION_WORDS,
+    COMP_TABLE,
+    DEST_TABLE,
+    JUMP_TABLE,
+    MAX_A_VALUE,
+)
 
 
 @dataclass
@@ -24,11 +31,18 @@ class AInstruction(Instruction):
     def get_bits(self) -> str:
         content = self.assembly_str[1:]
         if content.isdecimal():
-            address = int(content)
+            address = self.encode(content)
         else:
             address = self.addresses[content]
         return bin(address)[2:].zfill(16)
 
+    @classmethod
+    def encode(cls, constant: str) -> int:
+        address = int(constant)
+        if address > MAX_A_VALUE:
+            raise ValueError(f"A-instruction constant out of range <@{constant}>")
+        return address
+
 
 @dataclass
 class CInstruction(Instruction):
@@ -37,7 +51,17 @@ class CInstruction(Instruction):
         self.semicolon_index = self.assembly_str.find(";")
 
     def get_bits(self) -> str:
-        return f"111{self.get_comp()}{self.get_dest()}{self.get_jump()}"
+        try:
+            return C_INSTRUCTION_TABLE[self.assembly_str]
+        except KeyError:
+            raise ValueError(f"Unknown C-instruction <{self.assembly_str}>") from None
+
+    @classmethod
+    def encode(cls, assembly_str: str) -> int:
+        try:
+            return C_INSTRUCTION_WORDS[assembly_str]
+        except KeyError:
+            raise ValueError(f"Unknown C-instruction <{assembly_str}>") from None
 
     def get_dest(self) -> str:
         if self.equal_index != -1:
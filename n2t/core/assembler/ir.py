@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterable, List, Protocol
+
+from n2t.core.assembler.constants import PREDEDINED_SYMBOLS_TABLE
+from n2t.core.assembler.instruction import AInstruction, CInstruction
+from n2t.core.util.parser import DeleteCommentAndStrip, InstructionParser
+from n2t.core.util.trash_filter import CompositeTrashFilter, TrashFilter
+
+FIRST_VARIABLE_ADDRESS: int = 16
+UNRESOLVED: int = -1
+
+
+class InstructionKind(IntEnum):
+    ADDRESS = 0
+    SYMBOL = 1
+    COMMAND = 2
+    LABEL = 3
+
+
+@dataclass
+class SymbolPool:
+    names: List[str] = field(default_factory=list)
+    ids: Dict[str, int] = field(default_factory=dict)
+
+    def intern(self, name: str) -> int:
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            symbol_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol_id
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass
+class AssemblyIR:
+    kinds: array[int] = field(default_factory=lambda: array("B"))
+    operands: array[int] = field(default_factory=lambda: array("I"))
+    lines: array[int] = field(default_factory=lambda: array("I"))
+    symbols: SymbolPool = field(default_factory=SymbolPool)
+
+    def append(self, kind: int, operand: int, line: int = 0) -> None:
+        self.kinds.append(kind)
+        self.operands.append(operand)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+@dataclass
+class IRBuilder:
+    trash_filter: TrashFilter = field(default_factory=CompositeTrashFilter)
+    parser: InstructionParser = field(default_factory=DeleteCommentAndStrip)
+
+    def build(self, assembly: Iterable[str]) -> AssemblyIR:
+        ir = AssemblyIR()
+        for line, source in enumerate(assembly, start=1):
+            if not self.trash_filter.passes(source):
+                continue
+            instruction = self.parser(source)
+            if instruction.startswith("@"):
+                content = instruction[1:]
+                if content.isdecimal():
+                    ir.append(
+                        InstructionKind.ADDRESS, AInstruction.encode(content), line
+                    )
+                else:
+                    symbol = ir.symbols.intern(content)
+                    ir.append(InstructionKind.SYMBOL, symbol, line)
+            elif "(" in instruction:
+                symbol = ir.symbols.intern(instruction[1:-1])
+                ir.append(InstructionKind.LABEL, symbol, line)
+            else:
+                ir.append(
+                    InstructionKind.COMMAND, CInstruction.encode(instruction), line
+                )
+        return ir
+
+
+class IRLabelPass(Protocol):
+    @classmethod
+    def __call__(cls, ir: AssemblyIR) -> array[int]:
+        pass
+
+
+class IRSymbolPass(Protocol):
+    @classmethod
+    def __call__(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        pass
+
+
+class IRInstructionCounter(IRLabelPass):
+    @classmethod
+    def generate(cls, ir: AssemblyIR) -> array[int]:
+        addresses = array("l", [UNRESOLVED]) * len(ir.symbols)
+        address = 0
+        for kind, operand in zip(ir.kinds, ir.operands):
+            if kind == InstructionKind.LABEL:
+                if addresses[operand] != UNRESOLVED:
+                    raise ValueError(f"Duplicate label <{ir.symbols.names[operand]}>")
+                addresses[operand] = address
+                continue
+            address += 1
+        return addresses
+
+    @classmethod
+    def __call__(cls, ir: AssemblyIR) -> array[int]:
+        return cls.generate(ir)
+
+
+class IRAfterReservedCounter(IRSymbolPass):
+    @classmethod
+    def generate(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        for symbol_id, name in enumerate(ir.symbols.names):
+            if addresses[symbol_id] == UNRESOLVED and name in PREDEDINED_SYMBOLS_TABLE:
+                addresses[symbol_id] = PREDEDINED_SYMBOLS_TABLE[name]
+
+        index = FIRST_VARIABLE_ADDRESS
+        for kind, operand in zip(ir.kinds, ir.operands):
+            if kind == InstructionKind.SYMBOL and addresses[operand] == UNRESOLVED:
+                addresses[operand] = index
+                index += 1
+        return addresses
+
+    @classmethod
+    def __call__(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        return cls.generate(ir, addresses)
+
+
+class IRWordEncoder(Protocol):
+    @classmethod
+    def encode(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        pass
+
+
+class IREncoder(IRWordEncoder):
+    @classmethod
+    def encode(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        words = array("H")
+        for kind, operand in zip(ir.kinds, ir.operands):
+            if kind == InstructionKind.SYMBOL:
+                words.append(addresses[operand])
+            elif kind != InstructionKind.LABEL:
+                words.append(operand)
+        return words
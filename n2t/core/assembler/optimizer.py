@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Protocol, Tuple
+
+from n2t.core.assembler.constants import C_INSTRUCTION_WORDS, PREDEDINED_SYMBOLS_TABLE
+from n2t.core.assembler.ir import AssemblyIR, InstructionKind
+
+DEST_A_BIT: int = 0b100000
+JUMP_BITS: int = 0b111
+UNCONDITIONAL_JUMP: int = 0b111
+
+INCREMENT_M: int = C_INSTRUCTION_WORDS["M=M+1"]
+DECREMENT_M: int = C_INSTRUCTION_WORDS["M=M-1"]
+FUSED_PAIRS: Dict[Tuple[int, int], Optional[int]] = {
+    (INCREMENT_M, DECREMENT_M): None,
+    (DECREMENT_M, INCREMENT_M): None,
+    (DECREMENT_M, C_INSTRUCTION_WORDS["AM=M+1"]): C_INSTRUCTION_WORDS["A=M"],
+    (INCREMENT_M, C_INSTRUCTION_WORDS["AM=M-1"]): C_INSTRUCTION_WORDS["A=M"],
+}
+
+AValue = Tuple[int, int]
+
+
+@dataclass
+class OptimizationReport:
+    redundant_loads: int = 0
+    fused_pairs: int = 0
+    dead_instructions: int = 0
+    saved: int = 0
+    skipped: bool = False
+
+
+class IROptimizer(Protocol):
+    def __call__(self, ir: AssemblyIR) -> AssemblyIR:
+        pass
+
+
+@dataclass
+class PeepholeOptimizer(IROptimizer):
+    report: OptimizationReport = field(default_factory=OptimizationReport)
+
+    def optimize(self, ir: AssemblyIR) -> AssemblyIR:
+        self.report = OptimizationReport()
+        if self._jumps_to_fixed_addresses(ir):
+            self.report.skipped = True
+            return ir
+
+        result = AssemblyIR(symbols=ir.symbols)
+        known_a: Optional[AValue] = None
+        reachable = True
+        for kind, operand, line in zip(ir.kinds, ir.operands, ir.lines):
+            if kind == InstructionKind.LABEL:
+                result.append(kind, operand, line)
+                known_a = None
+                reachable = True
+                continue
+            if not reachable:
+                self.report.dead_instructions += 1
+                self.report.saved += 1
+                continue
+
+            if kind == InstructionKind.COMMAND:
+                self._append_command(result, operand, line)
+                if operand & DEST_A_BIT:
+                    known_a = None
+                reachable = operand & JUMP_BITS != UNCONDITIONAL_JUMP
+                continue
+
+            value = self._a_value(ir, kind, operand)
+            if value == known_a:
+                self.report.redundant_loads += 1
+                self.report.saved += 1
+                continue
+            result.append(kind, operand, line)
+            known_a = value
+        return result
+
+    def __call__(self, ir: AssemblyIR) -> AssemblyIR:
+        return self.optimize(ir)
+
+    def _append_command(self, result: AssemblyIR, word: int, line: int) -> None:
+        if result.kinds and result.kinds[-1] == InstructionKind.COMMAND:
+            pair = (result.operands[-1], word)
+            if pair in FUSED_PAIRS:
+                self._pop(result)
+                fused = FUSED_PAIRS[pair]
+                if fused is not None:
+                    result.append(InstructionKind.COMMAND, fused, line)
+                self.report.fused_pairs += 1
+                self.report.saved += 1 if fused is not None else 2
+                return
+        result.append(InstructionKind.COMMAND, word, line)
+
+    @classmethod
+    def _pop(cls, ir: AssemblyIR) -> None:
+        ir.kinds.pop()
+        ir.operands.pop()
+        ir.lines.pop()
+
+    @classmethod
+    def _a_value(cls, ir: AssemblyIR, kind: int, operand: int) -> AValue:
+        if kind == InstructionKind.SYMBOL:
+            name = ir.symbols.names[operand]
+            if name not in PREDEDINED_SYMBOLS_TABLE:
+                return InstructionKind.SYMBOL, operand
+            operand = PREDEDINED_SYMBOLS_TABLE[name]
+        return InstructionKind.ADDRESS, operand
+
+    @classmethod
+    def _jumps_to_fixed_addresses(cls, ir: AssemblyIR) -> bool:
+        previous: Tuple[int, int] = (InstructionKind.LABEL, 0)
+        for kind, operand in zip(ir.kinds, ir.operands):
+            is_jump = kind == InstructionKind.COMMAND and operand & JUMP_BITS
+            if is_jump and cls._is_fixed_address(ir, *previous):
+                return True
+            previous = (kind, operand)
+        return False
+
+    @classmethod
+    def _is_fixed_address(cls, ir: AssemblyIR, kind: int, operand: int) -> bool:
+        if kind == InstructionKind.ADDRESS:
+            return True
+        return (
+            kind == InstructionKind.SYMBOL
+            and ir.symbols.names[operand] in PREDEDINED_SYMBOLS_TABLE
+        )
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from n2t.core.assembler.constants import PREDEDINED_SYMBOLS_TABLE
+from n2t.core.assembler.ir import (
+    FIRST_VARIABLE_ADDRESS,
+    UNRESOLVED,
+    AssemblyIR,
+    InstructionKind,
+    IRBuilder,
+)
+from n2t.core.assembler.vectorized import HackTextRenderer, VectorizedEncoder
+
+Mapper = Callable[..., Iterable[Any]]
+Bounds = Tuple[int, int]
+
+
+@dataclass
+class ChunkLayout:
+    length: int = 0
+    labels: Dict[str, int] = field(default_factory=dict)
+    references: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Chunk(ChunkLayout):
+    ir: AssemblyIR = field(default_factory=AssemblyIR)
+
+    @classmethod
+    def scan(cls, builder: IRBuilder, lines: List[str]) -> Chunk:
+        chunk = cls(ir=builder.build(lines))
+        names = chunk.ir.symbols.names
+        referenced: Set[int] = set()
+        for kind, operand in zip(chunk.ir.kinds, chunk.ir.operands):
+            if kind == InstructionKind.LABEL:
+                if names[operand] in chunk.labels:
+                    raise ValueError(f"Duplicate label <{names[operand]}>")
+                chunk.labels[names[operand]] = chunk.length
+                continue
+            if kind == InstructionKind.SYMBOL and operand not in referenced:
+                referenced.add(operand)
+                chunk.references.append(names[operand])
+            chunk.length += 1
+        return chunk
+
+    def encode(self, table: Dict[str, int]) -> array[int]:
+        addresses = array(
+            "l", (table.get(name, UNRESOLVED) for name in self.ir.symbols.names)
+        )
+        return VectorizedEncoder.encode(self.ir, addresses)
+
+
+class SymbolTableMerger:
+    @classmethod
+    def merge(cls, chunks: Sequence[ChunkLayout]) -> Dict[str, int]:
+        reserved = PREDEDINED_SYMBOLS_TABLE | cls.labels(chunks)
+        return reserved | cls.variables(chunks, reserved)
+
+    @classmethod
+    def labels(cls, chunks: Sequence[ChunkLayout]) -> Dict[str, int]:
+        labels: Dict[str, int] = {}
+        offset = 0
+        for chunk in chunks:
+            for label, address in chunk.labels.items():
+                if label in labels:
+                    raise ValueError(f"Duplicate label <{label}>")
+                labels[label] = offset + address
+            offset += chunk.length
+        return labels
+
+    @classmethod
+    def variables(
+        cls, chunks: Sequence[ChunkLayout], reserved: Dict[str, int]
+    ) -> Dict[str, int]:
+        variables: Dict[str, int] = {}
+        for chunk in chunks:
+            for symbol in chunk.references:
+                if symbol not in reserved and symbol not in variables:
+                    variables[symbol] = FIRST_VARIABLE_ADDRESS + len(variables)
+        return variables
+
+
+@dataclass
+class ChunkWorker:
+    builder: IRBuilder
+    lines: List[str]
+    chunks: Dict[Bounds, Chunk] = field(default_factory=dict)
+
+    def scan(self, bounds: Bounds) -> ChunkLayout:
+        chunk = self._chunk(bounds)
+        return ChunkLayout(chunk.length, chunk.labels, chunk.references)
+
+    def encode(self, bounds: Bounds, table: Dict[str, int]) -> array[int]:
+        return self._chunk(bounds).encode(table)
+
+    def _chunk(self, bounds: Bounds) -> Chunk:
+        if bounds not in self.chunks:
+            start, stop = bounds
+            self.chunks[bounds] = Chunk.scan(self.builder, self.lines[start:stop])
+        return self.chunks[bounds]
+
+
+_worker: Optional[ChunkWorker] = None
+
+
+def _initialize_worker(builder: IRBuilder, lines: List[str]) -> None:
+    global _worker
+    _worker = ChunkWorker(builder, lines)
+
+
+def _scan_in_worker(bounds: Bounds) -> ChunkLayout:
+    assert _worker is not None
+    return _worker.scan(bounds)
+
+
+def _encode_in_worker(bounds: Bounds, table: Dict[str, int]) -> array[int]:
+    assert _worker is not None
+    return _worker.encode(bounds, table)
+
+
+@dataclass
+class ParallelAssembler:
+    jobs: int = 1
+    builder: IRBuilder = field(default_factory=IRBuilder)
+
+    @classmethod
+    def create(cls, jobs: int = 1) -> ParallelAssembler:
+        return cls(jobs=jobs)
+
+    def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
+        return (format(word, "016b") for word in self.assemble_words(assembly))
+
+    def assemble_text(self, assembly: Iterable[str]) -> bytes:
+        return HackTextRenderer.render(self.assemble_words(assembly))
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        lines = list(assembly)
+        bounds = list(self._split(len(lines)))
+        if self.jobs <= 1:
+            worker = ChunkWorker(self.builder, lines)
+            return self._assemble_chunks(map, worker.scan, worker.encode, bounds)
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_initialize_worker,
+            initargs=(self.builder, lines),
+        ) as executor:
+            return self._assemble_chunks(
+                executor.map, _scan_in_worker, _encode_in_worker, bounds
+            )
+
+    @classmethod
+    def _assemble_chunks(
+        cls,
+        mapper: Mapper,
+        scan: Callable[[Bounds], ChunkLayout],
+        encode: Callable[[Bounds, Dict[str, int]], array[int]],
+        bounds: List[Bounds],
+    ) -> array[int]:
+        table = SymbolTableMerger.merge(list(mapper(scan, bounds)))
+
+        words = array("H")
+        for encoded in mapper(encode, bounds, repeat(table)):
+            words.extend(encoded)
+        return words
+
+    def _split(self, size: int) -> Iterator[Bounds]:
+        step = max(1, -(-size // max(1, self.jobs)))
+        for start in range(0, size, step):
+            yield start, min(start + step, size)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from n2t.core.assembler.ir import AssemblyIR, InstructionKind
+
+SOURCE_MAP_MAGIC: bytes = b"HMAP"
+SOURCE_MAP_VERSION: int = 1
+HEADER = struct.Struct("<4sHHIII")
+LOCATION = struct.Struct("<HxxI")
+LABEL = struct.Struct("<III")
+STRING = struct.Struct("<II")
+
+
+@dataclass(frozen=True)
+class SourceLocation:
+    file: str
+    line: int
+
+
+@dataclass
+class SourceMap:
+    files: List[str] = field(default_factory=list)
+    file_ids: array[int] = field(default_factory=lambda: array("H"))
+    lines: array[int] = field(default_factory=lambda: array("I"))
+    labels: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_ir(cls, ir: AssemblyIR, addresses: array[int], source: str) -> SourceMap:
+        source_map = cls(files=[source])
+        for kind, operand, line in zip(ir.kinds, ir.operands, ir.lines):
+            if kind == InstructionKind.LABEL:
+                source_map.labels[ir.symbols.names[operand]] = addresses[operand]
+                continue
+            source_map.file_ids.append(0)
+            source_map.lines.append(line)
+        return source_map
+
+    def to_bytes(self) -> bytes:
+        strings = bytearray()
+        files = bytearray()
+        for name in self.files:
+            files += STRING.pack(*self._intern(strings, name))
+        labels = bytearray()
+        for name, address in self.labels.items():
+            labels += LABEL.pack(address, *self._intern(strings, name))
+
+        header = HEADER.pack(
+            SOURCE_MAP_MAGIC,
+            SOURCE_MAP_VERSION,
+            0,
+            len(self.lines),
+            len(self.files),
+            len(self.labels),
+        )
+        locations = b"".join(
+            LOCATION.pack(file_id, line)
+            for file_id, line in zip(self.file_ids, self.lines)
+        )
+        return header + locations + bytes(files) + bytes(labels) + bytes(strings)
+
+    @classmethod
+    def _intern(cls, strings: bytearray, name: str) -> Tuple[int, int]:
+        encoded = name.encode("utf-8")
+        offset = len(strings)
+        strings += encoded
+        return offset, len(encoded)
+
+
+@dataclass
+class SourceMapView:
+    buffer: memoryview
+    size: int = field(init=False)
+    file_count: int = field(init=False)
+    label_count: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        magic, version, _, size, file_count, label_count = HEADER.unpack_from(
+            self.buffer
+        )
+        assert magic == SOURCE_MAP_MAGIC, "Not a hack source map"
+        assert version == SOURCE_MAP_VERSION, f"Unsupported version {version}"
+        self.size = size
+        self.file_count = file_count
+        self.label_count = label_count
+
+    def lookup(self, address: int) -> SourceLocation:
+        if not 0 <= address < self.size:
+            raise IndexError(f"ROM address {address} is not mapped")
+        file_id, line = LOCATION.unpack_from(
+            self.buffer, HEADER.size + address * LOCATION.size
+        )
+        return SourceLocation(self.file(file_id), line)
+
+    def file(self, file_id: int) -> str:
+        offset = self._files_offset + file_id * STRING.size
+        return self._string(*STRING.unpack_from(self.buffer, offset))
+
+    def labels(self) -> Iterator[Tuple[str, int]]:
+        for index in range(self.label_count):
+            offset = self._labels_offset + index * LABEL.size
+            address, name_offset, length = LABEL.unpack_from(self.buffer, offset)
+            yield self._string(name_offset, length), address
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def _files_offset(self) -> int:
+        return HEADER.size + self.size * LOCATION.size
+
+    @property
+    def _labels_offset(self) -> int:
+        return self._files_offset + self.file_count * STRING.size
+
+    @property
+    def _strings_offset(self) -> int:
+        return self._labels_offset + self.label_count * LABEL.size
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return bytes(self.buffer[start : start + length]).decode("utf-8")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from n2t.core.assembler.constants import PREDEDINED_SYMBOLS_TABLE
+from n2t.core.assembler.instruction import AInstruction, CInstruction
+from n2t.core.assembler.vectorized import HackTextRenderer
+from n2t.core.util.parser import DeleteCommentAndStrip, InstructionParser
+from n2t.core.util.trash_filter import CompositeTrashFilter, TrashFilter
+
+FIRST_VARIABLE_ADDRESS: int = 16
+
+
+@dataclass
+class FixupTable:
+    fixups: List[Tuple[int, str]] = field(default_factory=list)
+
+    def record(self, address: int, symbol: str) -> None:
+        self.fixups.append((address, symbol))
+
+    def patch(self, words: array[int], labels: Dict[str, int]) -> None:
+        variables: Dict[str, int] = {}
+        for address, symbol in self.fixups:
+            if symbol in labels:
+                words[address] = labels[symbol]
+                continue
+            if symbol not in variables:
+                variables[symbol] = FIRST_VARIABLE_ADDRESS + len(variables)
+            words[address] = variables[symbol]
+
+
+@dataclass
+class StreamingAssembler:
+    trash_filter: TrashFilter = field(default_factory=CompositeTrashFilter)
+    parser: InstructionParser = field(default_factory=DeleteCommentAndStrip)
+
+    @classmethod
+    def create(cls) -> StreamingAssembler:
+        return cls()
+
+    def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
+        return (format(word, "016b") for word in self.assemble_words(assembly))
+
+    def assemble_text(self, assembly: Iterable[str]) -> bytes:
+        return HackTextRenderer.render(self.assemble_words(assembly))
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        words: array[int] = array("H")
+        labels: Dict[str, int] = {}
+        fixups = FixupTable()
+
+        for instruction in self._parse(assembly):
+            if instruction.startswith("@"):
+                content = instruction[1:]
+                if content.isdecimal():
+                    words.append(AInstruction.encode(content))
+                elif content in PREDEDINED_SYMBOLS_TABLE:
+                    words.append(PREDEDINED_SYMBOLS_TABLE[content])
+                elif content in labels:
+                    words.append(labels[content])
+                else:
+                    fixups.record(len(words), content)
+                    words.append(0)
+            elif "(" in instruction:
+                label = instruction[1:-1]
+                if label in labels:
+                    raise ValueError(f"Duplicate label <{label}>")
+                labels[label] = len(words)
+            else:
+                words.append(CInstruction.encode(instruction))
+
+        fixups.patch(words, labels)
+        return words
+
+    def _parse(self, assembly: Iterable[str]) -> Iterator[str]:
+        return map(self.parser, filter(self.trash_filter.passes, assembly))
@@ -25,7 +25,10 @@ class InstructionCounter(LabelAddressGenerator):
         address = 0
         for instruction in instructions:
             if isinstance(instruction, LInstruction):
-                table[instruction.assembly_str[1:-1]] = address
+                label = instruction.assembly_str[1:-1]
+                if label in table:
+                    raise ValueError(f"Duplicate label <{label}>")
+                table[label] = address
                 continue
             address += 1
         return table
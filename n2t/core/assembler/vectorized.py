@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from array import array
+from typing import Sequence
+
+from n2t.core.assembler.ir import AssemblyIR, InstructionKind, IREncoder
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+WORD_WIDTH: int = 16
+
+
+class VectorizedEncoder:
+    @classmethod
+    def encode(cls, ir: AssemblyIR, addresses: array[int]) -> array[int]:
+        if np is None:  # pragma: no cover
+            return IREncoder.encode(ir, addresses)
+
+        kinds = np.frombuffer(ir.kinds, dtype=np.uint8)
+        operands = np.frombuffer(ir.operands, dtype=np.uint32).astype(np.int64)
+        symbols = kinds == InstructionKind.SYMBOL
+        if symbols.any():
+            resolved = np.frombuffer(addresses, dtype=f"i{addresses.itemsize}")
+            operands[symbols] = resolved[operands[symbols]]
+
+        words = array("H")
+        words.frombytes(
+            operands[kinds != InstructionKind.LABEL].astype(np.uint16).tobytes()
+        )
+        return words
+
+
+class HackTextRenderer:
+    @classmethod
+    def render(cls, words: Sequence[int]) -> bytes:
+        if np is None:  # pragma: no cover
+            return "".join(f"{word:016b}\n" for word in words).encode("ascii")
+
+        big_endian = np.asarray(words, dtype=np.uint16).astype(">u2")
+        bits = np.unpackbits(big_endian.view(np.uint8)).reshape(-1, WORD_WIDTH)
+
+        text = np.empty((len(bits), WORD_WIDTH + 1), dtype=np.uint8)
+        text[:, :WORD_WIDTH] = bits + ord("0")
+        text[:, WORD_WIDTH] = ord("\n")
+        return text.tobytes()
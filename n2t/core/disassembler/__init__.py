@@ -1,5 +1,7 @@
+from n2t.core.disassembler.cfg import ControlFlowGraph
 from n2t.core.disassembler.facade import Disassembler
 
 __all__ = [
+    "ControlFlowGraph",
     "Disassembler",
 ]
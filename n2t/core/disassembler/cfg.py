@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from hashlib import sha1
+from typing import Iterator, Sequence, Set
+
+CFG_MAGIC: bytes = b"HCFG"
+CFG_VERSION: int = 1
+HEADER = struct.Struct("<4sHH20sIIII")
+
+ADDRESS_BIT: int = 0x8000
+COMMAND_BITS: int = 0xE000
+JUMP_BITS: int = 0b111
+UNCONDITIONAL_JUMP: int = 0b111
+BLOCK_INDIRECT: int = 0b1
+
+
+def rom_digest(words: Sequence[int]) -> bytes:
+    rom = array("H", words)
+    return sha1(rom.tobytes()).digest()
+
+
+@dataclass
+class ControlFlowGraph:
+    size: int = 0
+    digest: bytes = bytes(20)
+    starts: array[int] = field(default_factory=lambda: array("I"))
+    offsets: array[int] = field(default_factory=lambda: array("I", [0]))
+    successors: array[int] = field(default_factory=lambda: array("I"))
+    flags: array[int] = field(default_factory=lambda: array("B"))
+    targets: array[int] = field(default_factory=lambda: array("I"))
+
+    @classmethod
+    def build(cls, words: Sequence[int]) -> ControlFlowGraph:
+        size = len(words)
+        targets: Set[int] = set()
+        leaders: Set[int] = {0} if size else set()
+        jumps: Set[int] = set()
+        previous = ADDRESS_BIT
+        for address, word in enumerate(words):
+            if cls.is_jump(word):
+                jumps.add(address)
+                if not previous & ADDRESS_BIT and previous < size:
+                    targets.add(previous)
+                if address + 1 < size:
+                    leaders.add(address + 1)
+            previous = word
+        leaders |= targets
+
+        graph = cls(
+            size=size,
+            digest=rom_digest(words),
+            starts=array("I", sorted(leaders)),
+            targets=array("I", sorted(targets)),
+        )
+        for index in range(len(graph)):
+            end = graph._end(index)
+            last = end - 1
+            flags = 0
+            if last in jumps:
+                target = words[last - 1] if last > 0 else ADDRESS_BIT
+                if not target & ADDRESS_BIT and target < size:
+                    graph.successors.append(graph.block_of(target))
+                else:
+                    flags |= BLOCK_INDIRECT
+                if words[last] & JUMP_BITS != UNCONDITIONAL_JUMP and end < size:
+                    graph.successors.append(index + 1)
+            elif end < size:
+                graph.successors.append(index + 1)
+            graph.flags.append(flags)
+            graph.offsets.append(len(graph.successors))
+        return graph
+
+    @classmethod
+    def is_jump(cls, word: int) -> bool:
+        return word & COMMAND_BITS == COMMAND_BITS and bool(word & JUMP_BITS)
+
+    def block_of(self, address: int) -> int:
+        if not 0 <= address < self.size:
+            raise IndexError(f"ROM address {address} is outside the program")
+        return bisect_right(self.starts, address) - 1
+
+    def block_range(self, block: int) -> range:
+        return range(self.starts[block], self._end(block))
+
+    def successors_of(self, block: int) -> array[int]:
+        return self.successors[self.offsets[block] : self.offsets[block + 1]]
+
+    def is_indirect(self, block: int) -> bool:
+        return bool(self.flags[block] & BLOCK_INDIRECT)
+
+    def blocks(self) -> Iterator[range]:
+        for block in range(len(self)):
+            yield self.block_range(block)
+
+    def matches(self, words: Sequence[int]) -> bool:
+        return self.size == len(words) and self.digest == rom_digest(words)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(
+            CFG_MAGIC,
+            CFG_VERSION,
+            0,
+            self.digest,
+            self.size,
+            len(self.starts),
+            len(self.successors),
+            len(self.targets),
+        )
+        return b"".join(
+            [
+                header,
+                self._little_endian(self.starts),
+                self._little_endian(self.offsets),
+                self._little_endian(self.successors),
+                self._little_endian(self.targets),
+                self.flags.tobytes(),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> ControlFlowGraph:
+        magic, version, _, digest, size, blocks, edges, targets = HEADER.unpack_from(
+            buffer
+        )
+        assert magic == CFG_MAGIC, "Not a hack control flow graph"
+        assert version == CFG_VERSION, f"Unsupported version {version}"
+
+        graph = cls(size=size, digest=digest)
+        offset = HEADER.size
+        for name, count in [
+            ("starts", blocks),
+            ("offsets", blocks + 1),
+            ("successors", edges),
+            ("targets", targets),
+        ]:
+            values = array("I", struct.unpack_from(f"<{count}I", buffer, offset))
+            setattr(graph, name, values)
+            offset += count * 4
+        graph.flags = array("B", buffer[offset : offset + blocks])
+        return graph
+
+    def _end(self, block: int) -> int:
+        if block + 1 < len(self.starts):
+            return self.starts[block + 1]
+        return self.size
+
+    @classmethod
+    def _little_endian(cls, values: array[int]) -> bytes:
+        return struct.pack(f"<{len(values)}I", *values)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
 
+from n2t.core.disassembler.cfg import ControlFlowGraph
 from n2t.core.disassembler.chain import (
     AddressingDisassembler,
     AlphabetValidator,
@@ -11,11 +12,16 @@ from n2t.core.disassembler.chain import (
     LengthValidator,
 )
 from n2t.core.disassembler.entities import Word
+from n2t.core.disassembler.table import DisassemblyTable
 
 
 @dataclass
 class Disassembler:
     chain: DisassemblerChain
+    table: DisassemblyTable = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.table = DisassemblyTable(self.chain)
 
     @classmethod
     def create(cls) -> Disassembler:
@@ -30,5 +36,27 @@ class Disassembler:
         for word in words:
             yield self.disassemble_one(word)
 
+    def disassemble_words(self, words: Iterable[int]) -> Iterable[str]:
+        for word in words:
+            yield self.table.lookup(word)
+
+    def disassemble_labeled(
+        self, words: Sequence[int], graph: ControlFlowGraph
+    ) -> Iterable[str]:
+        targets = set(graph.targets)
+        for address, word in enumerate(words):
+            if address in targets:
+                yield f"(L{address})"
+            if word in targets and self._loads_jump_target(words, address):
+                yield f"@L{word}"
+            else:
+                yield self.table.lookup(word)
+
     def disassemble_one(self, word: str) -> str:
+        if DisassemblyTable.is_well_formed(word):
+            return self.table.lookup(int(word, base=2))
         return self.chain.disassemble(Word(word))
+
+    @classmethod
+    def _loads_jump_target(cls, words: Sequence[int], address: int) -> bool:
+        return address + 1 < len(words) and ControlFlowGraph.is_jump(words[address + 1])
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from n2t.core.disassembler.chain import DisassemblerChain
+from n2t.core.disassembler.entities import Word
+
+WORD_SPACE: int = 1 << 16
+WORD_WIDTH: int = 16
+BINARY_ALPHABET: str = "01"
+
+
+@dataclass
+class DisassemblyTable:
+    chain: DisassemblerChain
+    entries: List[Optional[str]] = field(default_factory=list)
+
+    def lookup(self, word: int) -> str:
+        if not self.entries:
+            self.entries = [None] * WORD_SPACE
+
+        assembly = self.entries[word]
+        if assembly is None:
+            assembly = self.chain.disassemble(Word(format(word, "016b")))
+            self.entries[word] = assembly
+        return assembly
+
+    @classmethod
+    def is_well_formed(cls, word: str) -> bool:
+        return len(word) == WORD_WIDTH and not word.strip(BINARY_ALPHABET)
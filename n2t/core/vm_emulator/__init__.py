@@ -0,0 +1,12 @@
+from n2t.core.vm_emulator.facade import VMEmulator
+from n2t.core.vm_emulator.image import Operation, VMImage
+from n2t.core.vm_emulator.jit import VMJit
+from n2t.core.vm_emulator.profiler import VMProfiler
+
+__all__ = [
+    "Operation",
+    "VMEmulator",
+    "VMImage",
+    "VMJit",
+    "VMProfiler",
+]
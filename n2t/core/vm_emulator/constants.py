@@ -0,0 +1,45 @@
+from typing import Dict
+
+from n2t.core.vm_translator.ir import Segment
+
+RAM_SIZE: int = 32768
+WORD_MASK: int = 0xFFFF
+SIGN_BIT: int = 0x8000
+TRUE: int = 0xFFFF
+
+SP: int = 0
+LCL: int = 1
+ARG: int = 2
+THIS: int = 3
+THAT: int = 4
+TEMP_BASE: int = 5
+STATIC_BASE: int = 16
+STACK_BASE: int = 256
+FRAME_SIZE: int = 5
+
+ENTRY_FUNCTION: str = "Sys.init"
+MAX_STEPS: int = 10_000_000
+JIT_THRESHOLD: int = 50
+
+SEGMENT_REGISTERS: Dict[Segment, int] = {
+    Segment.LOCAL: LCL,
+    Segment.ARGUMENT: ARG,
+    Segment.THIS: THIS,
+    Segment.THAT: THAT,
+}
+
+FIXED_SEGMENT_BASES: Dict[Segment, int] = {
+    Segment.POINTER: THIS,
+    Segment.TEMP: TEMP_BASE,
+}
+
+HEAP_BASE: int = 2048
+HEAP_END: int = 16384
+
+STRING_CHARS: int = 0
+STRING_LENGTH: int = 1
+STRING_CAPACITY: int = 2
+STRING_SIZE: int = 3
+NEW_LINE: int = 128
+BACKSPACE: int = 129
+DOUBLE_QUOTE: int = 34
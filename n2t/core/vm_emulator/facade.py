@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from n2t.core.vm_emulator.constants import (
+    ARG,
+    FRAME_SIZE,
+    LCL,
+    MAX_STEPS,
+    RAM_SIZE,
+    SIGN_BIT,
+    SP,
+    STACK_BASE,
+    THAT,
+    THIS,
+    TRUE,
+    WORD_MASK,
+)
+from n2t.core.vm_emulator.image import Operation, VMImage
+from n2t.core.vm_emulator.jit import VMJit
+from n2t.core.vm_emulator.natives import NATIVE_FUNCTIONS, NativeOS, SysError
+from n2t.core.vm_emulator.profiler import SAMPLE_STEPS, VMProfiler
+from n2t.core.vm_translator.call_graph import VMSource
+
+PUSH_CONSTANT = Operation.PUSH_CONSTANT.value
+PUSH_SEGMENT = Operation.PUSH_SEGMENT.value
+PUSH_ADDRESS = Operation.PUSH_ADDRESS.value
+POP_SEGMENT = Operation.POP_SEGMENT.value
+POP_ADDRESS = Operation.POP_ADDRESS.value
+ADD = Operation.ADD.value
+SUB = Operation.SUB.value
+NEG = Operation.NEG.value
+EQ = Operation.EQ.value
+GT = Operation.GT.value
+LT = Operation.LT.value
+AND = Operation.AND.value
+OR = Operation.OR.value
+NOT = Operation.NOT.value
+GOTO = Operation.GOTO.value
+IF_GOTO = Operation.IF_GOTO.value
+CALL = Operation.CALL.value
+FUNCTION = Operation.FUNCTION.value
+RETURN = Operation.RETURN.value
+PROFILED_CALL = Operation.PROFILED_CALL.value
+PROFILED_RETURN = Operation.PROFILED_RETURN.value
+NATIVE = Operation.NATIVE.value
+COUNTED_FUNCTION = Operation.COUNTED_FUNCTION.value
+JIT_ENTER = Operation.JIT_ENTER.value
+
+
+@dataclass
+class VMEmulator:
+    image: VMImage
+    ram: List[int] = field(default_factory=lambda: [0] * RAM_SIZE)
+    pc: int = 0
+    steps: int = 0
+    halted: bool = False
+    error: Optional[int] = None
+    profiler: Optional[VMProfiler] = None
+    native: Optional[NativeOS] = None
+    jit: Optional[VMJit] = None
+
+    @classmethod
+    def create(
+        cls,
+        sources: List[VMSource],
+        native: bool = False,
+        jit_threshold: Optional[int] = None,
+    ) -> VMEmulator:
+        if not native:
+            emulator = cls(VMImage.load(sources))
+        else:
+            emulator = cls(VMImage.load(sources, NATIVE_FUNCTIONS))
+            emulator.native = NativeOS(emulator.ram)
+        if jit_threshold is not None:
+            emulator.jit = VMJit.attach(emulator.image, emulator.native, jit_threshold)
+        emulator.reset()
+        return emulator
+
+    def reset(self) -> None:
+        self.ram[:] = [0] * RAM_SIZE
+        self.ram[SP] = STACK_BASE
+        if self.native is not None:
+            self.native.reset()
+        self.pc = self.image.entry
+        self.steps = 0
+        self.halted = False
+        self.error = None
+
+    def profile(
+        self, max_steps: int = MAX_STEPS, sample_steps: int = SAMPLE_STEPS
+    ) -> VMProfiler:
+        assert self.jit is None, "Cannot profile JIT-compiled code"
+        profiler = self.profiler = VMProfiler.attach(self.image)
+        profiler.clock = start = self.steps
+        while self.steps - start < max_steps and not self.halted:
+            self.run(min(sample_steps, max_steps - self.steps + start))
+            profiler.sample()
+        profiler.finish(self.steps)
+        self.profiler = None
+        return profiler
+
+    def run(self, max_steps: int = MAX_STEPS) -> int:
+        profiler = self.profiler
+        native = self.native
+        jit = self.jit
+        natives = self.image.natives
+        operations = self.image.operations
+        if profiler is not None:
+            operations = profiler.operations
+        if jit is not None:
+            operations = jit.operations
+        clock = self.steps
+        arguments = self.image.arguments
+        operands = self.image.operands
+        ram = self.ram
+        pc = self.pc
+        sp = ram[SP]
+        step = 0
+        while step < max_steps:
+            operation = operations[pc]
+            step += 1
+            if operation == PUSH_SEGMENT:
+                ram[sp] = ram[ram[operands[pc]] + arguments[pc]]
+                sp += 1
+                pc += 1
+            elif operation == PUSH_CONSTANT:
+                ram[sp] = arguments[pc]
+                sp += 1
+                pc += 1
+            elif operation == POP_SEGMENT:
+                sp -= 1
+                ram[ram[operands[pc]] + arguments[pc]] = ram[sp]
+                pc += 1
+            elif operation == PUSH_ADDRESS:
+                ram[sp] = ram[arguments[pc]]
+                sp += 1
+                pc += 1
+            elif operation == POP_ADDRESS:
+                sp -= 1
+                ram[arguments[pc]] = ram[sp]
+                pc += 1
+            elif operation == ADD:
+                sp -= 1
+                ram[sp - 1] = (ram[sp - 1] + ram[sp]) & WORD_MASK
+                pc += 1
+            elif operation == IF_GOTO:
+                sp -= 1
+                pc = arguments[pc] if ram[sp] else pc + 1
+            elif operation == GOTO:
+                target = arguments[pc]
+                if target == pc:
+                    self.halted = True
+                    break
+                pc = target
+            elif operation == SUB:
+                sp -= 1
+                ram[sp - 1] = (ram[sp - 1] - ram[sp]) & WORD_MASK
+                pc += 1
+            elif operation == LT:
+                sp -= 1
+                ram[sp - 1] = TRUE if ram[sp - 1] ^ SIGN_BIT < ram[sp] ^ SIGN_BIT else 0
+                pc += 1
+            elif operation == GT:
+                sp -= 1
+                ram[sp - 1] = TRUE if ram[sp - 1] ^ SIGN_BIT > ram[sp] ^ SIGN_BIT else 0
+                pc += 1
+            elif operation == EQ:
+                sp -= 1
+                ram[sp - 1] = TRUE if ram[sp - 1] == ram[sp] else 0
+                pc += 1
+            elif operation == NOT:
+                ram[sp - 1] ^= WORD_MASK
+                pc += 1
+            elif operation == AND:
+                sp -= 1
+                ram[sp - 1] &= ram[sp]
+                pc += 1
+            elif operation == OR:
+                sp -= 1
+                ram[sp - 1] |= ram[sp]
+                pc += 1
+            elif operation == NEG:
+                ram[sp - 1] = -ram[sp - 1] & WORD_MASK
+                pc += 1
+            elif operation == CALL:
+                ram[sp : sp + FRAME_SIZE] = [
+                    pc + 1,
+                    ram[LCL],
+                    ram[ARG],
+                    ram[THIS],
+                    ram[THAT],
+                ]
+                sp += FRAME_SIZE
+                ram[ARG] = sp - FRAME_SIZE - operands[pc]
+                ram[LCL] = sp
+                pc = arguments[pc]
+            elif operation == FUNCTION:
+                locals_count = operands[pc]
+                ram[sp : sp + locals_count] = [0] * locals_count
+                sp += locals_count
+                pc += 1
+            elif operation == RETURN:
+                frame = ram[LCL]
+                argument = ram[ARG]
+                saved = ram[frame - FRAME_SIZE : frame]
+                ram[argument] = ram[sp - 1]
+                sp = argument + 1
+                pc, ram[LCL], ram[ARG], ram[THIS], ram[THAT] = saved
+            elif operation == NATIVE:
+                assert native is not None
+                count = operands[pc]
+                sp -= count
+                try:
+                    ram[sp] = native.call(natives[arguments[pc]], ram[sp : sp + count])
+                except SysError as error:
+                    self.error = error.code
+                    self.halted = True
+                    break
+                sp += 1
+                pc += 1
+            elif operation == JIT_ENTER:
+                assert jit is not None
+                region, block = jit.entries[pc]
+                try:
+                    pc, sp, executed = region(ram, sp, block, max_steps - step + 1)
+                except SysError as error:
+                    self.error = error.code
+                    self.halted = True
+                    break
+                step += executed - 1
+                jit.stats.compiled_steps += executed
+            elif operation == COUNTED_FUNCTION:
+                assert jit is not None
+                if jit.tier_up(pc):
+                    step -= 1
+                    continue
+                locals_count = operands[pc]
+                ram[sp : sp + locals_count] = [0] * locals_count
+                sp += locals_count
+                pc += 1
+            elif operation == PROFILED_CALL:
+                assert profiler is not None
+                target = arguments[pc]
+                profiler.enter(arguments[target], clock + step)
+                ram[sp : sp + FRAME_SIZE] = [
+                    pc + 1,
+                    ram[LCL],
+                    ram[ARG],
+                    ram[THIS],
+                    ram[THAT],
+                ]
+                sp += FRAME_SIZE
+                ram[ARG] = sp - FRAME_SIZE - operands[pc]
+                ram[LCL] = sp
+                pc = target
+            elif operation == PROFILED_RETURN:
+                assert profiler is not None
+                profiler.leave(clock + step)
+                frame = ram[LCL]
+                argument = ram[ARG]
+                saved = ram[frame - FRAME_SIZE : frame]
+                ram[argument] = ram[sp - 1]
+                sp = argument + 1
+                pc, ram[LCL], ram[ARG], ram[THIS], ram[THAT] = saved
+            else:
+                self.halted = True
+                break
+
+        ram[SP] = sp
+        self.pc = pc
+        self.steps += step
+        return step
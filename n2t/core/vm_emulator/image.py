@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Collection, Dict, List, Tuple
+
+from n2t.core.vm_emulator.constants import (
+    ENTRY_FUNCTION,
+    FIXED_SEGMENT_BASES,
+    SEGMENT_REGISTERS,
+    STATIC_BASE,
+)
+from n2t.core.vm_translator.call_graph import VMSource
+from n2t.core.vm_translator.ir import Opcode, Segment, VMCommand
+
+Label = Tuple[str, str]
+
+
+class Operation(IntEnum):
+    PUSH_CONSTANT = 0
+    PUSH_SEGMENT = 1
+    PUSH_ADDRESS = 2
+    POP_SEGMENT = 3
+    POP_ADDRESS = 4
+    ADD = 5
+    SUB = 6
+    NEG = 7
+    EQ = 8
+    GT = 9
+    LT = 10
+    AND = 11
+    OR = 12
+    NOT = 13
+    GOTO = 14
+    IF_GOTO = 15
+    CALL = 16
+    FUNCTION = 17
+    RETURN = 18
+    HALT = 19
+    PROFILED_CALL = 20
+    PROFILED_RETURN = 21
+    NATIVE = 22
+    COUNTED_FUNCTION = 23
+    JIT_ENTER = 24
+
+
+ARITHMETIC_OPERATIONS: Dict[Opcode, Operation] = {
+    Opcode.ADD: Operation.ADD,
+    Opcode.SUB: Operation.SUB,
+    Opcode.NEG: Operation.NEG,
+    Opcode.EQ: Operation.EQ,
+    Opcode.GT: Operation.GT,
+    Opcode.LT: Operation.LT,
+    Opcode.AND: Operation.AND,
+    Opcode.OR: Operation.OR,
+    Opcode.NOT: Operation.NOT,
+}
+
+
+@dataclass
+class VMImage:
+    operations: array[int] = field(default_factory=lambda: array("B"))
+    arguments: array[int] = field(default_factory=lambda: array("i"))
+    operands: array[int] = field(default_factory=lambda: array("i"))
+    functions: List[str] = field(default_factory=list)
+    entries: Dict[str, int] = field(default_factory=dict)
+    statics: Dict[Tuple[str, int], int] = field(default_factory=dict)
+    natives: List[str] = field(default_factory=list)
+    entry: int = 0
+
+    @classmethod
+    def load(cls, sources: List[VMSource], natives: Collection[str] = ()) -> VMImage:
+        image = cls()
+        labels: Dict[Label, int] = {}
+        jumps: List[Tuple[int, Label]] = []
+        calls: List[Tuple[int, str]] = []
+        for file_name, commands in sources:
+            scope = file_name
+            for command in commands:
+                opcode = command.opcode
+                if opcode is Opcode.LABEL:
+                    labels[(scope, command.name)] = len(image)
+                elif opcode is Opcode.FUNCTION:
+                    scope = command.name
+                    image.entries[command.name] = len(image)
+                    image.emit(Operation.FUNCTION, len(image.functions), command.index)
+                    image.functions.append(command.name)
+                elif opcode is Opcode.GOTO or opcode is Opcode.IF_GOTO:
+                    jumps.append((len(image), (scope, command.name)))
+                    image.emit(Operation[opcode.name])
+                elif opcode is Opcode.CALL and command.name in natives:
+                    image.emit(Operation.NATIVE, len(image.natives), command.index)
+                    image.natives.append(command.name)
+                elif opcode is Opcode.CALL:
+                    calls.append((len(image), command.name))
+                    image.emit(Operation.CALL, 0, command.index)
+                elif opcode is Opcode.RETURN:
+                    image.emit(Operation.RETURN)
+                elif opcode is Opcode.PUSH or opcode is Opcode.POP:
+                    image._emit_access(file_name, command)
+                elif opcode is not Opcode.TRASH:
+                    assert opcode in ARITHMETIC_OPERATIONS, f"Cannot run {command}"
+                    image.emit(ARITHMETIC_OPERATIONS[opcode])
+
+        if ENTRY_FUNCTION in image.entries:
+            image.entry = len(image)
+            calls.append((len(image), ENTRY_FUNCTION))
+            image.emit(Operation.CALL)
+        image.emit(Operation.HALT)
+
+        for address, label in jumps:
+            assert label in labels, f"Unknown label {label[1]} in {label[0]}"
+            image.arguments[address] = labels[label]
+        for address, name in calls:
+            assert name in image.entries, f"Unknown function {name}"
+            image.arguments[address] = image.entries[name]
+        return image
+
+    def emit(self, operation: Operation, argument: int = 0, operand: int = 0) -> None:
+        self.operations.append(operation)
+        self.arguments.append(argument)
+        self.operands.append(operand)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def _emit_access(self, file_name: str, command: VMCommand) -> None:
+        push = command.opcode is Opcode.PUSH
+        segment, index = command.segment, command.index
+        if segment is Segment.CONSTANT:
+            assert push, f"Cannot pop into constant {index}"
+            self.emit(Operation.PUSH_CONSTANT, index)
+        elif segment in SEGMENT_REGISTERS:
+            operation = Operation.PUSH_SEGMENT if push else Operation.POP_SEGMENT
+            self.emit(operation, index, SEGMENT_REGISTERS[segment])
+        else:
+            operation = Operation.PUSH_ADDRESS if push else Operation.POP_ADDRESS
+            self.emit(operation, self._address(file_name, segment, index))
+
+    def _address(self, file_name: str, segment: Segment, index: int) -> int:
+        if segment is Segment.STATIC:
+            return self.statics.setdefault(
+                (file_name, index), STATIC_BASE + len(self.statics)
+            )
+        return FIXED_SEGMENT_BASES[segment] + index
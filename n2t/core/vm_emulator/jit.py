@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from n2t.core.vm_emulator.constants import JIT_THRESHOLD, SIGN_BIT, TRUE, WORD_MASK
+from n2t.core.vm_emulator.image import Operation, VMImage
+from n2t.core.vm_emulator.natives import NativeOS
+
+Region = Callable[[List[int], int, int, int], Tuple[int, int, int]]
+
+BINARY_EXPRESSIONS: Dict[Operation, str] = {
+    Operation.ADD: f"({{x}} + {{y}}) & {WORD_MASK}",
+    Operation.SUB: f"({{x}} - {{y}}) & {WORD_MASK}",
+    Operation.AND: "{x} & {y}",
+    Operation.OR: "{x} | {y}",
+    Operation.EQ: f"{TRUE} if {{x}} == {{y}} else 0",
+    Operation.GT: f"{TRUE} if {{x}} ^ {SIGN_BIT} > {{y}} ^ {SIGN_BIT} else 0",
+    Operation.LT: f"{TRUE} if {{x}} ^ {SIGN_BIT} < {{y}} ^ {SIGN_BIT} else 0",
+}
+UNARY_EXPRESSIONS: Dict[Operation, str] = {
+    Operation.NEG: f"-{{x}} & {WORD_MASK}",
+    Operation.NOT: f"{{x}} ^ {WORD_MASK}",
+}
+JUMPS: Set[Operation] = {Operation.GOTO, Operation.IF_GOTO}
+EXITS: Set[Operation] = {Operation.CALL, Operation.RETURN, Operation.HALT}
+
+
+@dataclass
+class JitStats:
+    tier_ups: int = 0
+    compile_seconds: float = 0.0
+    compiled_steps: int = 0
+    functions: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BlockCompiler:
+    image: VMImage
+    blocks: Dict[int, int]
+    end: int
+    lines: List[str] = field(default_factory=list)
+    stack: List[str] = field(default_factory=list)
+    consumed: int = 0
+    temps: int = 0
+
+    def compile(self, start: int, stop: int) -> List[str]:
+        image = self.image
+        for pc in range(start, stop):
+            operation = Operation(image.operations[pc])
+            argument, operand = image.arguments[pc], image.operands[pc]
+            if operation is Operation.PUSH_CONSTANT:
+                self.stack.append(str(argument))
+            elif operation is Operation.PUSH_SEGMENT:
+                self._push(f"ram[ram[{operand}] + {argument}]")
+            elif operation is Operation.PUSH_ADDRESS:
+                self._push(f"ram[{argument}]")
+            elif operation is Operation.POP_SEGMENT:
+                self.lines.append(f"ram[ram[{operand}] + {argument}] = {self._pop()}")
+            elif operation is Operation.POP_ADDRESS:
+                self.lines.append(f"ram[{argument}] = {self._pop()}")
+            elif operation in BINARY_EXPRESSIONS:
+                y, x = self._pop(), self._pop()
+                self._push(BINARY_EXPRESSIONS[operation].format(x=x, y=y))
+            elif operation in UNARY_EXPRESSIONS:
+                self._push(UNARY_EXPRESSIONS[operation].format(x=self._pop()))
+            elif operation is Operation.FUNCTION:
+                self.stack += ["0"] * operand
+            elif operation is Operation.NATIVE:
+                arguments = [self._pop() for _ in range(operand)][::-1]
+                name = image.natives[argument]
+                self._push(f"native.call({name!r}, [{', '.join(arguments)}])")
+            elif operation is Operation.GOTO and argument != pc:
+                self._flush(pc - start + 1)
+                self.lines.append(self._goto(argument))
+                return self.lines
+            elif operation is Operation.IF_GOTO:
+                condition = self._pop()
+                self._flush(pc - start + 1)
+                self.lines += [f"if {condition}:", f"    {self._goto(argument)}"]
+                self.lines += ["else:", f"    {self._goto(pc + 1)}"]
+                return self.lines
+            else:
+                self._flush(pc - start)
+                self.lines.append(f"return {pc}, sp, steps")
+                return self.lines
+        self._flush(stop - start)
+        self.lines.append(self._goto(stop))
+        return self.lines
+
+    def _push(self, expression: str) -> None:
+        temp = f"t{self.temps}"
+        self.temps += 1
+        self.lines.append(f"{temp} = {expression}")
+        self.stack.append(temp)
+
+    def _pop(self) -> str:
+        if self.stack:
+            return self.stack.pop()
+        self.consumed += 1
+        self._push(f"ram[sp - {self.consumed}]")
+        return self.stack.pop()
+
+    def _flush(self, steps: int) -> None:
+        for index, value in enumerate(self.stack):
+            self.lines.append(f"ram[{_slot(index - self.consumed)}] = {value}")
+        growth = len(self.stack) - self.consumed
+        if growth:
+            self.lines.append(f"sp {'+' if growth > 0 else '-'}= {abs(growth)}")
+        if steps:
+            self.lines.append(f"steps += {steps}")
+
+    def _goto(self, target: int) -> str:
+        if target in self.blocks:
+            return f"block = {self.blocks[target]}"
+        return f"return {target}, sp, steps"
+
+
+def _slot(offset: int) -> str:
+    if offset < 0:
+        return f"sp - {-offset}"
+    return f"sp + {offset}" if offset else "sp"
+
+
+@dataclass
+class FunctionCompiler:
+    image: VMImage
+    start: int
+    end: int
+
+    def leaders(self) -> List[int]:
+        leaders = {self.start}
+        for pc in range(self.start, self.end):
+            operation = self.image.operations[pc]
+            if operation in JUMPS:
+                leaders |= {self.image.arguments[pc], pc + 1}
+            elif operation in EXITS:
+                leaders.add(pc + 1)
+        return sorted(pc for pc in leaders if self.start <= pc < self.end)
+
+    def generate(self) -> Tuple[str, List[int]]:
+        leaders = self.leaders()
+        blocks = {pc: index for index, pc in enumerate(leaders)}
+        lines = [
+            "def region(ram, sp, block, budget):",
+            "    steps = 0",
+            "    while True:",
+        ]
+        for index, start in enumerate(leaders):
+            stop = leaders[index + 1] if index + 1 < len(leaders) else self.end
+            lines.append(f"        {'if' if not index else 'elif'} block == {index}:")
+            body = BlockCompiler(self.image, blocks, self.end).compile(start, stop)
+            lines += [f"            {line}" for line in body]
+        lines += [
+            "        if steps >= budget:",
+            "            return PCS[block], sp, steps",
+        ]
+        return "\n".join(lines) + "\n", leaders
+
+
+@dataclass
+class VMJit:
+    image: VMImage
+    operations: array[int]
+    native: Optional[NativeOS] = None
+    threshold: int = JIT_THRESHOLD
+    counters: Dict[int, int] = field(default_factory=dict)
+    entries: Dict[int, Tuple[Region, int]] = field(default_factory=dict)
+    stats: JitStats = field(default_factory=JitStats)
+
+    @classmethod
+    def attach(
+        cls, image: VMImage, native: Optional[NativeOS], threshold: int = JIT_THRESHOLD
+    ) -> VMJit:
+        operations = array(
+            "B",
+            (
+                (
+                    Operation.COUNTED_FUNCTION
+                    if operation == Operation.FUNCTION
+                    else operation
+                )
+                for operation in image.operations
+            ),
+        )
+        return cls(image, operations, native, threshold)
+
+    def tier_up(self, pc: int) -> bool:
+        calls = self.counters.get(pc, 0) + 1
+        self.counters[pc] = calls
+        if calls < self.threshold:
+            return False
+        self.compile(pc)
+        return True
+
+    def compile(self, entry: int) -> None:
+        start = time.perf_counter()
+        name = self.image.functions[self.image.arguments[entry]]
+        source, leaders = FunctionCompiler(
+            self.image, entry, self._end(entry)
+        ).generate()
+        namespace: Dict[str, Any] = {"native": self.native, "PCS": tuple(leaders)}
+        exec(compile(source, f"<jit {name}>", "exec"), namespace)
+        region = namespace["region"]
+        for block, pc in enumerate(leaders):
+            resumes = self.image.operations[pc - 1] == Operation.CALL
+            if (pc == entry or resumes) and not self._exits_immediately(pc):
+                self.entries[pc] = (region, block)
+                self.operations[pc] = Operation.JIT_ENTER
+        self.stats.tier_ups += 1
+        self.stats.functions.append(name)
+        self.stats.compile_seconds += time.perf_counter() - start
+
+    def _exits_immediately(self, pc: int) -> bool:
+        operation = self.image.operations[pc]
+        if operation == Operation.GOTO:
+            return self.image.arguments[pc] == pc
+        return operation in EXITS
+
+    def _end(self, entry: int) -> int:
+        following = [pc for pc in self.image.entries.values() if pc > entry]
+        if self.image.entry > entry:
+            following.append(self.image.entry)
+        return min(following, default=len(self.image))
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import time
+from bisect import insort
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from n2t.core.vm_emulator.constants import (
+    BACKSPACE,
+    DOUBLE_QUOTE,
+    HEAP_BASE,
+    HEAP_END,
+    NEW_LINE,
+    SIGN_BIT,
+    STRING_CAPACITY,
+    STRING_CHARS,
+    STRING_LENGTH,
+    STRING_SIZE,
+    WORD_MASK,
+)
+from n2t.core.vm_emulator.profiler import VMProfiler
+
+
+class SysError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(f"Sys.error {code}")
+        self.code = code
+
+
+@dataclass
+class NativeStats:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class NativeSpeedup:
+    name: str
+    calls: int
+    vm_seconds: float
+    native_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.vm_seconds / self.native_seconds if self.native_seconds else 0.0
+
+
+@dataclass
+class NativeOS:
+    ram: List[int]
+    free: List[Tuple[int, int]] = field(
+        default_factory=lambda: [(HEAP_BASE, HEAP_END - HEAP_BASE)]
+    )
+    stats: Dict[str, NativeStats] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        self.free = [(HEAP_BASE, HEAP_END - HEAP_BASE)]
+        self.stats = {}
+
+    def call(self, name: str, arguments: List[int]) -> int:
+        start = time.perf_counter()
+        result = NATIVE_FUNCTIONS[name](self, arguments)
+        stats = self.stats.setdefault(name, NativeStats())
+        stats.calls += 1
+        stats.seconds += time.perf_counter() - start
+        return result & WORD_MASK
+
+    def multiply(self, arguments: List[int]) -> int:
+        x, y = arguments
+        return x * y
+
+    def divide(self, arguments: List[int]) -> int:
+        x, y = map(_signed, arguments)
+        if not y:
+            raise SysError(3)
+        quotient = abs(x) // abs(y)
+        return quotient if (x < 0) == (y < 0) else -quotient
+
+    def alloc(self, arguments: List[int]) -> int:
+        (size,) = map(_signed, arguments)
+        if size <= 0:
+            raise SysError(5)
+        length = size + 1
+        for index, (address, available) in enumerate(self.free):
+            if available < length:
+                continue
+            if available == length:
+                del self.free[index]
+            else:
+                self.free[index] = (address + length, available - length)
+            self.ram[address] = length
+            return address + 1
+        raise SysError(6)
+
+    def de_alloc(self, arguments: List[int]) -> int:
+        address = arguments[0] - 1
+        insort(self.free, (address, self.ram[address]))
+        merged: List[Tuple[int, int]] = []
+        for start, length in self.free:
+            if merged and sum(merged[-1]) == start:
+                merged[-1] = (merged[-1][0], merged[-1][1] + length)
+            else:
+                merged.append((start, length))
+        self.free = merged
+        return 0
+
+    def string_new(self, arguments: List[int]) -> int:
+        (capacity,) = map(_signed, arguments)
+        if capacity < 0:
+            raise SysError(14)
+        this = self.alloc([STRING_SIZE])
+        self.ram[this + STRING_CHARS] = self.alloc([capacity]) if capacity else 0
+        self.ram[this + STRING_LENGTH] = 0
+        self.ram[this + STRING_CAPACITY] = capacity
+        return this
+
+    def string_dispose(self, arguments: List[int]) -> int:
+        (this,) = arguments
+        if self.ram[this + STRING_CHARS]:
+            self.de_alloc([self.ram[this + STRING_CHARS]])
+        return self.de_alloc([this])
+
+    def string_length(self, arguments: List[int]) -> int:
+        return self.ram[arguments[0] + STRING_LENGTH]
+
+    def string_char_at(self, arguments: List[int]) -> int:
+        this, index = arguments
+        if index >= self.ram[this + STRING_LENGTH]:
+            raise SysError(15)
+        return self.ram[self.ram[this + STRING_CHARS] + index]
+
+    def string_set_char_at(self, arguments: List[int]) -> int:
+        this, index, character = arguments
+        if index >= self.ram[this + STRING_LENGTH]:
+            raise SysError(16)
+        self.ram[self.ram[this + STRING_CHARS] + index] = character
+        return 0
+
+    def string_append_char(self, arguments: List[int]) -> int:
+        this, character = arguments
+        length = self.ram[this + STRING_LENGTH]
+        if length >= self.ram[this + STRING_CAPACITY]:
+            raise SysError(17)
+        self.ram[self.ram[this + STRING_CHARS] + length] = character
+        self.ram[this + STRING_LENGTH] = length + 1
+        return this
+
+    def string_erase_last_char(self, arguments: List[int]) -> int:
+        (this,) = arguments
+        if not self.ram[this + STRING_LENGTH]:
+            raise SysError(18)
+        self.ram[this + STRING_LENGTH] -= 1
+        return 0
+
+    def string_int_value(self, arguments: List[int]) -> int:
+        (this,) = arguments
+        chars = self.ram[this + STRING_CHARS]
+        text = self.ram[chars : chars + self.ram[this + STRING_LENGTH]]
+        negative = bool(text) and text[0] == ord("-")
+        value = 0
+        for character in text[negative:]:
+            if not ord("0") <= character <= ord("9"):
+                break
+            value = value * 10 + character - ord("0")
+        return -value if negative else value
+
+    def string_set_int(self, arguments: List[int]) -> int:
+        this, number = arguments
+        digits = [ord(digit) for digit in str(_signed(number))]
+        if len(digits) > self.ram[this + STRING_CAPACITY]:
+            raise SysError(19)
+        chars = self.ram[this + STRING_CHARS]
+        self.ram[chars : chars + len(digits)] = digits
+        self.ram[this + STRING_LENGTH] = len(digits)
+        return 0
+
+    def string_new_line(self, arguments: List[int]) -> int:
+        return NEW_LINE
+
+    def string_back_space(self, arguments: List[int]) -> int:
+        return BACKSPACE
+
+    def string_double_quote(self, arguments: List[int]) -> int:
+        return DOUBLE_QUOTE
+
+    def speedups(
+        self, baseline: VMProfiler, seconds_per_step: float
+    ) -> List[NativeSpeedup]:
+        inclusive = {profile.name: profile.inclusive for profile in baseline.functions}
+        return [
+            NativeSpeedup(
+                name,
+                stats.calls,
+                inclusive.get(name, 0) * seconds_per_step,
+                stats.seconds,
+            )
+            for name, stats in sorted(self.stats.items())
+        ]
+
+
+def _signed(value: int) -> int:
+    return value - (value & SIGN_BIT) * 2
+
+
+NATIVE_FUNCTIONS: Dict[str, Callable[[NativeOS, List[int]], int]] = {
+    "Math.multiply": NativeOS.multiply,
+    "Math.divide": NativeOS.divide,
+    "Memory.alloc": NativeOS.alloc,
+    "Memory.deAlloc": NativeOS.de_alloc,
+    "String.new": NativeOS.string_new,
+    "String.dispose": NativeOS.string_dispose,
+    "String.length": NativeOS.string_length,
+    "String.charAt": NativeOS.string_char_at,
+    "String.setCharAt": NativeOS.string_set_char_at,
+    "String.appendChar": NativeOS.string_append_char,
+    "String.eraseLastChar": NativeOS.string_erase_last_char,
+    "String.intValue": NativeOS.string_int_value,
+    "String.setInt": NativeOS.string_set_int,
+    "String.newLine": NativeOS.string_new_line,
+    "String.backSpace": NativeOS.string_back_space,
+    "String.doubleQuote": NativeOS.string_double_quote,
+}
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from n2t.core.vm_emulator.image import Operation, VMImage
+
+ROOT_NAME: str = "(boot)"
+SAMPLE_STEPS: int = 10_000
+
+PROFILED_OPERATIONS: Dict[Operation, Operation] = {
+    Operation.CALL: Operation.PROFILED_CALL,
+    Operation.RETURN: Operation.PROFILED_RETURN,
+}
+
+
+@dataclass
+class FunctionProfile:
+    name: str
+    calls: int = 0
+    inclusive: int = 0
+    exclusive: int = 0
+    depth: int = 0
+    entered: int = 0
+
+
+@dataclass
+class VMProfiler:
+    operations: array[int]
+    functions: List[FunctionProfile]
+    stack: List[int] = field(default_factory=list)
+    samples: Dict[str, int] = field(default_factory=dict)
+    clock: int = 0
+
+    @classmethod
+    def attach(cls, image: VMImage) -> VMProfiler:
+        operations = array(
+            "B",
+            (
+                PROFILED_OPERATIONS.get(Operation(operation), operation)
+                for operation in image.operations
+            ),
+        )
+        names = [*image.functions, ROOT_NAME]
+        return cls(operations, [FunctionProfile(name) for name in names], [-1])
+
+    def enter(self, function: int, clock: int) -> None:
+        self._charge(clock)
+        profile = self.functions[function]
+        profile.calls += 1
+        if not profile.depth:
+            profile.entered = clock
+        profile.depth += 1
+        self.stack.append(function)
+
+    def leave(self, clock: int) -> None:
+        self._charge(clock)
+        profile = self.functions[self.stack.pop()]
+        profile.depth -= 1
+        if not profile.depth:
+            profile.inclusive += clock - profile.entered
+
+    def sample(self) -> None:
+        names = [self.functions[function].name for function in self.stack[1:]]
+        stack = ";".join(names) or ROOT_NAME
+        self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def finish(self, clock: int) -> None:
+        self._charge(clock)
+        for profile in self.functions:
+            if profile.depth:
+                profile.inclusive += clock - profile.entered
+                profile.entered = clock
+
+    def folded(self) -> List[str]:
+        return [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+
+    def report(self) -> List[FunctionProfile]:
+        called = [profile for profile in self.functions if profile.calls]
+        return sorted(called, key=lambda profile: (-profile.exclusive, profile.name))
+
+    def table(self) -> List[str]:
+        profiles = self.report()
+        width = max([len("function"), *(len(profile.name) for profile in profiles)])
+        lines = [
+            f"{'function':<{width}}{'calls':>10}{'inclusive':>12}{'exclusive':>12}"
+        ]
+        for profile in profiles:
+            lines.append(
+                f"{profile.name:<{width}}{profile.calls:>10}"
+                f"{profile.inclusive:>12}{profile.exclusive:>12}"
+            )
+        return lines
+
+    def _charge(self, clock: int) -> None:
+        self.functions[self.stack[-1]].exclusive += clock - self.clock
+        self.clock = clock
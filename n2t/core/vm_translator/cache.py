@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from hashlib import sha1
+from typing import Any, Dict, List, Optional
+
+from n2t import __version__
+from n2t.core.vm_translator.ir import VMCommand
+from n2t.core.vm_translator.optimizer import VMOptimizationReport
+from n2t.core.vm_translator.rom_report import FunctionSize, RomReport
+from n2t.core.vm_translator.stack_instruction import TranslationData
+
+CACHE_VERSION: int = 2
+CACHE_CAPACITY: int = 512
+
+
+def translator_version() -> str:
+    return f"{CACHE_VERSION}-{__version__}"
+
+
+@dataclass
+class FileTranslation:
+    assembly: str
+    data: TranslationData
+    optimization: Optional[VMOptimizationReport] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "assembly": self.assembly,
+            "branching_counter": self.data.branching_counter,
+            "return_counter": self.data.return_counter,
+            "routines": self.data.routines,
+            "rom_size": self.data.rom_size,
+            "saved_size": self.data.saved_size,
+            "functions": [asdict(size) for size in self.data.rom_report.functions],
+            "optimization": self.optimization and asdict(self.optimization),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> FileTranslation:
+        optimization = data["optimization"]
+        return cls(
+            assembly=data["assembly"],
+            data=TranslationData(
+                branching_counter=data["branching_counter"],
+                return_counter=data["return_counter"],
+                routines=data["routines"],
+                rom_size=data["rom_size"],
+                saved_size=data["saved_size"],
+                rom_report=RomReport(
+                    [FunctionSize(**size) for size in data["functions"]]
+                ),
+            ),
+            optimization=optimization and VMOptimizationReport(**optimization),
+        )
+
+
+@dataclass
+class TranslationCache:
+    entries: Dict[str, FileTranslation] = field(default_factory=dict)
+    capacity: int = CACHE_CAPACITY
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def key(cls, options: str, file_name: str, commands: List[VMCommand]) -> str:
+        digest = sha1(f"{options}\n{file_name}\n".encode())
+        for command in commands:
+            digest.update(f"{command}\n".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[FileTranslation]:
+        translation = self.entries.pop(key, None)
+        if translation is None:
+            self.misses += 1
+            return None
+        self.entries[key] = translation
+        self.hits += 1
+        return translation
+
+    def put(self, key: str, translation: FileTranslation) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = translation
+        while len(self.entries) > self.capacity:
+            del self.entries[next(iter(self.entries))]
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "version": translator_version(),
+                "entries": {
+                    key: translation.to_dict()
+                    for key, translation in self.entries.items()
+                },
+            }
+        )
+
+    @classmethod
+    def loads(cls, text: str, capacity: int = CACHE_CAPACITY) -> TranslationCache:
+        try:
+            data = json.loads(text)
+            if data["version"] != translator_version():
+                return cls(capacity=capacity)
+            return cls(
+                entries={
+                    key: FileTranslation.from_dict(entry)
+                    for key, entry in data["entries"].items()
+                },
+                capacity=capacity,
+            )
+        except (ValueError, KeyError, TypeError):
+            return cls(capacity=capacity)
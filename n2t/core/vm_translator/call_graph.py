@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from n2t.core.vm_translator.ir import Opcode, VMCommand
+
+VMSource = Tuple[str, List[VMCommand]]
+FunctionBody = Tuple[Optional[str], List[VMCommand]]
+
+
+def split_functions(commands: List[VMCommand]) -> Iterator[FunctionBody]:
+    name: Optional[str] = None
+    body: List[VMCommand] = []
+    for command in commands:
+        if command.opcode is Opcode.FUNCTION:
+            if body or name is not None:
+                yield name, body
+            name, body = command.name, []
+        body.append(command)
+    if body or name is not None:
+        yield name, body
+
+
+@dataclass
+class CallGraph:
+    calls: Dict[Optional[str], Set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, sources: List[VMSource]) -> CallGraph:
+        graph = cls()
+        for _, commands in sources:
+            for name, body in split_functions(commands):
+                callees = graph.calls.setdefault(name, set())
+                callees.update(
+                    command.name for command in body if command.opcode is Opcode.CALL
+                )
+        return graph
+
+    def reachable(self, entry: str) -> Set[Optional[str]]:
+        live: Set[Optional[str]] = {None, entry}
+        pending = [None, entry]
+        while pending:
+            for callee in self.calls.get(pending.pop(), ()):
+                if callee not in live:
+                    live.add(callee)
+                    pending.append(callee)
+        return live
+
+
+@dataclass
+class DeadFunctionReport:
+    functions: Dict[str, List[str]] = field(default_factory=dict)
+    saved_words: Dict[str, int] = field(default_factory=dict)
+
+    def saved_bytes(self) -> Dict[str, int]:
+        return {file: 2 * words for file, words in self.saved_words.items()}
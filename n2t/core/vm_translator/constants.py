@@ -8,11 +8,11 @@ ADDRESS_TYPE_TABLE: Dict[str, str] = {
     "static": "static",
 }
 
-BINARY_SYMBOLS_TABLE: Dict[str, str] = {
-    "add": "+",
-    "sub": "-",
-    "and": "&",
-    "or": "|",
+BINARY_COMPUTATIONS_TABLE: Dict[str, str] = {
+    "add": "D+M",
+    "sub": "M-D",
+    "and": "D&M",
+    "or": "D|M",
 }
 
 NEGATION_SYMBOLS_TABLE: Dict[str, str] = {"not": "!", "neg": "-"}
@@ -23,7 +23,7 @@ BINARY_OPERATION_FORMAT: str = "\n".join(
         "A=M-1",
         "D=M",
         "A=A-1",
-        "M=M{operator}D",
+        "M={computation}",
         "@SP",
         "M=M-1",
         "",
@@ -46,20 +46,20 @@ BRANCH_OPERATION_FORMAT: str = "\n".join(
         "D=M",
         "A=A-1",
         "D=M-D",
-        "@TRUE{branching_counter}",
+        "@{file_name}$TRUE{branching_counter}",
         "D;J{operator}",
         "@SP",
         "A=M-1",
         "A=A-1",
         "M=0",
-        "@END{branching_counter}",
+        "@{file_name}$END{branching_counter}",
         "0;JMP",
-        "(TRUE{branching_counter})",
+        "({file_name}$TRUE{branching_counter})",
         "@SP",
         "A=M-1",
         "A=A-1",
         "M=-1",
-        "(END{branching_counter})",
+        "({file_name}$END{branching_counter})",
         "@SP",
         "M=M-1",
         "",
@@ -311,7 +311,7 @@ FUNCTION_CALL_FORMAT: str = "\n".join(
     ]
 )
 
-RETURN_LABEL_FORMAT: str = "RETURN.{function_name}.{return_counter}"
+RETURN_LABEL_FORMAT: str = "{file_name}$RETURN.{function_name}.{return_counter}"
 
 GOTO_FORMAT: str = "\n".join(["@{label}", "0;JMP", ""])
 
@@ -321,6 +321,8 @@ BOOT_FORMAT: str = "\n".join(["@256", "D=A", "@SP", "M=D", "{function_call}"])
 
 SYS_INIT_CALL: str = "call Sys.init 0"
 
+BOOT_NAMESPACE: str = "N2T$BOOT"
+
 FUNCTION_DECLARATION_SEGMENT_FORMAT: str = "\n".join(
     ["@SP", "A=M", "M=0", "@SP", "M=M+1", ""]
 )
@@ -328,3 +330,223 @@ FUNCTION_DECLARATION_SEGMENT_FORMAT: str = "\n".join(
 FUNCTION_DECLARATION_NAME_PREFIX: str = "\n".join(["({function_name})", ""])
 
 LABEL_FORMAT: str = "\n".join(["({label_name})", ""])
+
+MAX_CONSTANT: int = 32767
+
+TEMP_BASE_ADDRESS: int = 5
+
+POINTER_ADDRESS_TABLE: Dict[int, str] = {0: "THIS", 1: "THAT"}
+
+MOVE_LOAD_FORMATS: Dict[str, str] = {
+    "constant": "\n".join(["@{num}", "D=A", ""]),
+    "static": "\n".join(["@{file_name}.{num}", "D=M", ""]),
+    "direct": "\n".join(["@{address}", "D=M", ""]),
+    "indirect": "\n".join(["@{address_type}", "D=M", "@{num}", "A=D+A", "D=M", ""]),
+}
+
+MOVE_STORE_FORMATS: Dict[str, str] = {
+    "static": "\n".join(["{load}@{file_name}.{num}", "M=D", ""]),
+    "direct": "\n".join(["{load}@{address}", "M=D", ""]),
+    "indirect": "\n".join(
+        [
+            "@{address_type}",
+            "D=M",
+            "@{num}",
+            "D=D+A",
+            "@13",
+            "M=D",
+            "{load}@13",
+            "A=M",
+            "M=D",
+            "",
+        ]
+    ),
+}
+
+COMPARE_GOTO_FORMAT: str = "\n".join(
+    [
+        "@SP",
+        "AM=M-1",
+        "D=M",
+        "A=A-1",
+        "D=M-D",
+        "@SP",
+        "M=M-1",
+        "@{label}",
+        "D;{jump}",
+        "",
+    ]
+)
+
+SHARED_CALL_LABEL: str = "N2T$CALL"
+
+SHARED_RETURN_LABEL: str = "N2T$RETURN"
+
+RUNTIME_HALT_FORMAT: str = "\n".join(["(N2T$HALT)", "@N2T$HALT", "0;JMP", ""])
+
+SHARED_CALL_FORMAT: str = "\n".join(
+    [
+        "@{function_name}",
+        "D=A",
+        "@13",
+        "M=D",
+        "@{return_label}",
+        "D=A",
+        "@14",
+        "M=D",
+        "@{num_arguments}",
+        "D=A",
+        "@" + SHARED_CALL_LABEL,
+        "0;JMP",
+        "({return_label})",
+        "",
+    ]
+)
+
+SHARED_RETURN_FORMAT: str = "\n".join(["@" + SHARED_RETURN_LABEL, "0;JMP", ""])
+
+SHARED_CALL_ROUTINE: str = "\n".join(
+    [
+        f"({SHARED_CALL_LABEL})",
+        "@SP",
+        "D=M-D",
+        "@15",
+        "M=D",
+        "@14",
+        "D=M",
+        "@SP",
+        "AM=M+1",
+        "A=A-1",
+        "M=D",
+        "@LCL",
+        "D=M",
+        "@SP",
+        "AM=M+1",
+        "A=A-1",
+        "M=D",
+        "@ARG",
+        "D=M",
+        "@SP",
+        "AM=M+1",
+        "A=A-1",
+        "M=D",
+        "@THIS",
+        "D=M",
+        "@SP",
+        "AM=M+1",
+        "A=A-1",
+        "M=D",
+        "@THAT",
+        "D=M",
+        "@SP",
+        "AM=M+1",
+        "A=A-1",
+        "M=D",
+        "@15",
+        "D=M",
+        "@ARG",
+        "M=D",
+        "@SP",
+        "D=M",
+        "@LCL",
+        "M=D",
+        "@13",
+        "A=M",
+        "0;JMP",
+        "",
+    ]
+)
+
+SHARED_RETURN_ROUTINE: str = f"({SHARED_RETURN_LABEL})\n" + RETURN_FORMAT
+
+SHARED_COMPARISON_FORMAT: str = "\n".join(
+    [
+        "@{file_name}$COMPARE{branching_counter}",
+        "D=A",
+        "@13",
+        "M=D",
+        "@N2T${operator}",
+        "0;JMP",
+        "({file_name}$COMPARE{branching_counter})",
+        "",
+    ]
+)
+
+SHARED_COMPARISON_ROUTINE: str = "\n".join(
+    [
+        "(N2T${operator})",
+        "@SP",
+        "AM=M-1",
+        "D=M",
+        "A=A-1",
+        "D=M-D",
+        "M=-1",
+        "@N2T${operator}$TRUE",
+        "D;J{operator}",
+        "@SP",
+        "A=M-1",
+        "M=0",
+        "(N2T${operator}$TRUE)",
+        "@13",
+        "A=M",
+        "0;JMP",
+        "",
+    ]
+)
+
+TOS_SPILL_FORMAT: str = "\n".join(["@SP", "AM=M+1", "A=A-1", "M=D", ""])
+
+TOS_FILL_FORMAT: str = "\n".join(["@SP", "AM=M-1", "D=M", ""])
+
+TOS_BINARY_OPERATION_FORMAT: str = "\n".join(["@SP", "AM=M-1", "D={computation}", ""])
+
+TOS_NEGATION_FORMAT: str = "\n".join(["D={operator}D", ""])
+
+TOS_BRANCH_OPERATION_FORMAT: str = "\n".join(
+    [
+        "@SP",
+        "AM=M-1",
+        "D=M-D",
+        "@{file_name}$TRUE{branching_counter}",
+        "D;J{operator}",
+        "D=0",
+        "@{file_name}$END{branching_counter}",
+        "0;JMP",
+        "({file_name}$TRUE{branching_counter})",
+        "D=-1",
+        "({file_name}$END{branching_counter})",
+        "",
+    ]
+)
+
+TOS_IF_GOTO_FORMAT: str = "\n".join(["@{label}", "D;JNE", ""])
+
+TOS_COMPARE_GOTO_FORMAT: str = "\n".join(
+    ["@SP", "AM=M-1", "D=M-D", "@{label}", "D;{jump}", ""]
+)
+
+TOS_OFFSET_LIMIT: int = 8
+
+TOS_STORE_FORMATS: Dict[str, str] = {
+    "static": "\n".join(["@{file_name}.{num}", "M=D", ""]),
+    "direct": "\n".join(["@{address}", "M=D", ""]),
+    "near": "\n".join(["@{address_type}", "A=M", "{offset}M=D", ""]),
+    "indirect": "\n".join(
+        [
+            "@14",
+            "M=D",
+            "@{address_type}",
+            "D=M",
+            "@{num}",
+            "D=D+A",
+            "@13",
+            "M=D",
+            "@14",
+            "D=M",
+            "@13",
+            "A=M",
+            "M=D",
+            "",
+        ]
+    ),
+}
@@ -1,11 +1,42 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
 from dataclasses import dataclass, field
-from typing import Iterable
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from n2t.core.util.parser import DeleteCommentAndStrip, InstructionParser
 from n2t.core.util.trash_filter import CompositeTrashFilter, TrashFilter
-from n2t.core.vm_translator.constants import SYS_INIT_CALL
+from n2t.core.vm_translator.cache import FileTranslation, TranslationCache
+from n2t.core.vm_translator.call_graph import (
+    CallGraph,
+    DeadFunctionReport,
+    VMSource,
+    split_functions,
+)
+from n2t.core.vm_translator.constants import (
+    BOOT_NAMESPACE,
+    RUNTIME_HALT_FORMAT,
+    SYS_INIT_CALL,
+)
 from n2t.core.vm_translator.instruction_factory import StackInstructionFactory
-from n2t.core.vm_translator.stack_instruction import BootInstruction, TranslationData
+from n2t.core.vm_translator.ir import Opcode, VMCommand, VMParser
+from n2t.core.vm_translator.optimizer import VMOptimizer
+from n2t.core.vm_translator.rom_report import OPCODE_CATEGORIES, RomReport
+from n2t.core.vm_translator.stack_instruction import (
+    BootInstruction,
+    TranslationData,
+    count_instructions,
+)
+from n2t.core.vm_translator.tos_cache import TopOfStackInstructionFactory, spill
+
+Mapper = Callable[..., Iterable[Any]]
+
+
+@dataclass
+class RomSizeReport:
+    before: int = 0
+    after: int = 0
 
 
 @dataclass
@@ -13,28 +44,174 @@ class VMTranslator:
     trash_filter: TrashFilter = field(default_factory=CompositeTrashFilter)
     parser: InstructionParser = field(default_factory=DeleteCommentAndStrip)
     translation_data: TranslationData = field(default_factory=TranslationData)
+    optimizer: Optional[VMOptimizer] = None
 
-    def translate_boot(self) -> Iterable[str]:
-        stack_instruction = map(
-            lambda string: BootInstruction.create(SYS_INIT_CALL, self.translation_data),
-            [SYS_INIT_CALL],
+    def translate_boot(self) -> Iterator[str]:
+        self._start(BOOT_NAMESPACE)
+        instruction = BootInstruction.create(
+            VMParser.parse(SYS_INIT_CALL), self.translation_data
         )
-        translated = map(lambda instruction: instruction.translate(), stack_instruction)
-        return translated
+        yield self._measure(instruction.translate())
 
-    def translate(self, vm: Iterable[str], file_name: str) -> Iterable[str]:
-        self.translation_data.file_name = file_name
-        parsed_vm = map(self.parser, filter(self.trash_filter.passes, vm))
-        instructions = map(
-            lambda stack_str: StackInstructionFactory.build(
-                stack_str, self.translation_data
-            ),
-            parsed_vm,
+    def translate_runtime(self) -> Iterator[str]:
+        data = self.translation_data
+        if not (data.shared_calls or data.shared_comparisons) or not data.routines:
+            return
+        for routine in [RUNTIME_HALT_FORMAT, *data.routines.values()]:
+            self.translation_data.saved_size -= count_instructions(routine)
+            yield self._measure(routine)
+
+    def size_report(self) -> RomSizeReport:
+        data = self.translation_data
+        return RomSizeReport(
+            before=data.rom_size + data.saved_size, after=data.rom_size
         )
-        translated = map(lambda instruction: instruction.translate(), instructions)
 
-        return translated
+    def rom_report(self) -> RomReport:
+        return self.translation_data.rom_report
+
+    def parse(self, vm: Iterable[str]) -> Iterable[VMCommand]:
+        return map(
+            VMParser.parse, map(self.parser, filter(self.trash_filter.passes, vm))
+        )
+
+    def translate(self, vm: Iterable[str], file_name: str) -> Iterator[str]:
+        yield from self.translate_commands(self.parse(vm), file_name)
+
+    def translate_commands(
+        self, commands: Iterable[VMCommand], file_name: str
+    ) -> Iterator[str]:
+        self._start(file_name)
+        parsed_vm = commands
+        if self.optimizer is not None:
+            parsed_vm = self.optimizer(parsed_vm)
+        factory = StackInstructionFactory
+        if self.translation_data.tos_cache:
+            factory = TopOfStackInstructionFactory
+        report = self.translation_data.rom_report
+        for command in parsed_vm:
+            if command.opcode is Opcode.FUNCTION:
+                report.begin(file_name, command.name)
+            instruction = factory.build(command, self.translation_data)
+            yield self._measure(
+                instruction.translate(), OPCODE_CATEGORIES[command.opcode]
+            )
+        if self.translation_data.tos_cached:
+            yield self._measure(
+                spill(self.translation_data), OPCODE_CATEGORIES[Opcode.PUSH]
+            )
+
+    def translate_files(
+        self,
+        sources: List[VMSource],
+        jobs: int = 1,
+        cache: Optional[TranslationCache] = None,
+    ) -> Iterator[str]:
+        if jobs <= 1:
+            yield from self._translate_files(map, sources, cache)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from self._translate_files(executor.map, sources, cache)
+
+    def eliminate_dead_functions(
+        self, sources: List[VMSource]
+    ) -> Tuple[List[VMSource], DeadFunctionReport]:
+        live = CallGraph.build(sources).reachable(VMParser.parse(SYS_INIT_CALL).name)
+        report = DeadFunctionReport()
+        pruned: List[VMSource] = []
+        for file_name, commands in sources:
+            kept: List[VMCommand] = []
+            removed: List[VMCommand] = []
+            for name, body in split_functions(commands):
+                if name in live:
+                    kept += body
+                    continue
+                removed += body
+                report.functions.setdefault(file_name, []).append(str(name))
+            if removed:
+                report.saved_words[file_name] = self._size_of(removed, file_name)
+            pruned.append((file_name, kept))
+        return pruned, report
+
+    def _size_of(self, commands: List[VMCommand], file_name: str) -> int:
+        scratch = VMTranslator(translation_data=self._template_data())
+        return sum(
+            map(count_instructions, scratch.translate_commands(commands, file_name))
+        )
+
+    def _template_data(self) -> TranslationData:
+        return TranslationData(
+            shared_calls=self.translation_data.shared_calls,
+            shared_comparisons=self.translation_data.shared_comparisons,
+            tos_cache=self.translation_data.tos_cache,
+        )
+
+    def _translate_files(
+        self,
+        mapper: Mapper,
+        sources: List[VMSource],
+        cache: Optional[TranslationCache],
+    ) -> Iterator[str]:
+        template = VMTranslator(
+            self.trash_filter,
+            self.parser,
+            self._template_data(),
+            None if self.optimizer is None else type(self.optimizer)(),
+        )
+        options = self._options()
+        keys = [TranslationCache.key(options, *source) for source in sources]
+        cached: Dict[int, FileTranslation] = {}
+        for index, key in enumerate(keys):
+            hit = cache.get(key) if cache is not None else None
+            if hit is not None:
+                cached[index] = hit
+
+        missing = [
+            source for index, source in enumerate(sources) if index not in cached
+        ]
+        translated = iter(mapper(_translate_source, [template] * len(missing), missing))
+        for index, key in enumerate(keys):
+            translation = cached.get(index)
+            if translation is None:
+                translation = next(translated)
+                if cache is not None:
+                    cache.put(key, translation)
+            self.translation_data.merge(translation.data)
+            if self.optimizer is not None and translation.optimization is not None:
+                self.optimizer.report.merge(translation.optimization)
+            yield translation.assembly
+
+    def _options(self) -> str:
+        data = self.translation_data
+        optimizer = "" if self.optimizer is None else type(self.optimizer).__name__
+        flags = [data.shared_calls, data.shared_comparisons, data.tos_cache]
+        return ":".join([*map(str, flags), optimizer])
+
+    def _start(self, file_name: str) -> None:
+        self.translation_data.file_name = file_name
+        self.translation_data.branching_counter = 0
+        self.translation_data.return_counter = 0
+        self.translation_data.tos_cached = False
+
+    def _measure(self, assembly: str, category: Optional[str] = None) -> str:
+        data = self.translation_data
+        size = count_instructions(assembly)
+        data.rom_size += size
+        if category is None:
+            data.rom_report.runtime += size
+        else:
+            data.rom_report.record(data.file_name, category, size)
+        return assembly
 
     @classmethod
-    def create(cls) -> "VMTranslator":
+    def create(cls) -> VMTranslator:
         return cls()
+
+
+def _translate_source(template: VMTranslator, source: VMSource) -> FileTranslation:
+    translator = deepcopy(template)
+    file_name, vm = source
+    assembly = "".join(translator.translate_commands(vm, file_name))
+    optimization = None if translator.optimizer is None else translator.optimizer.report
+    return FileTranslation(assembly, translator.translation_data, optimization)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from n2t.core.util.parser import DeleteCommentAndStrip
+from n2t.core.util.trash_filter import CompositeTrashFilter
+
+
+class Opcode(IntEnum):
+    ADD = 0
+    SUB = 1
+    NEG = 2
+    EQ = 3
+    GT = 4
+    LT = 5
+    AND = 6
+    OR = 7
+    NOT = 8
+    PUSH = 9
+    POP = 10
+    LABEL = 11
+    GOTO = 12
+    IF_GOTO = 13
+    FUNCTION = 14
+    CALL = 15
+    RETURN = 16
+    MOVE = 17
+    COMPARE_GOTO = 18
+    TRASH = 19
+
+    @property
+    def keyword(self) -> str:
+        return self.name.lower().replace("_", "-")
+
+
+class Segment(IntEnum):
+    NONE = 0
+    CONSTANT = 1
+    LOCAL = 2
+    ARGUMENT = 3
+    THIS = 4
+    THAT = 5
+    POINTER = 6
+    TEMP = 7
+    STATIC = 8
+
+    @property
+    def keyword(self) -> str:
+        return self.name.lower()
+
+
+class Jump(IntEnum):
+    JGT = 0b001
+    JEQ = 0b010
+    JGE = 0b011
+    JLT = 0b100
+    JNE = 0b101
+    JLE = 0b110
+
+    @property
+    def inverse(self) -> Jump:
+        return Jump(self ^ 0b111)
+
+
+OPCODES: Dict[str, Opcode] = {
+    opcode.keyword: opcode for opcode in Opcode if opcode is not Opcode.TRASH
+}
+SEGMENTS: Dict[str, Segment] = {
+    segment.keyword: segment for segment in Segment if segment is not Segment.NONE
+}
+
+
+class VMCommand:
+    __slots__ = ("opcode", "segment", "index", "name", "target_segment", "target_index")
+
+    def __init__(
+        self,
+        opcode: Opcode,
+        segment: Segment = Segment.NONE,
+        index: int = 0,
+        name: str = "",
+        target_segment: Segment = Segment.NONE,
+        target_index: int = 0,
+    ) -> None:
+        self.opcode = opcode
+        self.segment = segment
+        self.index = index
+        self.name = name
+        self.target_segment = target_segment
+        self.target_index = target_index
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VMCommand):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self.__slots__
+        )
+        return f"VMCommand({fields})"
+
+    def __str__(self) -> str:
+        return " ".join([self.opcode.keyword, *ARGUMENT_RENDERERS[self.opcode](self)])
+
+
+def _parse_segment(command: List[str]) -> VMCommand:
+    opcode, segment, index = command
+    return VMCommand(OPCODES[opcode], SEGMENTS[segment], int(index))
+
+
+def _parse_label(command: List[str]) -> VMCommand:
+    opcode, name = command
+    return VMCommand(OPCODES[opcode], name=name)
+
+
+def _parse_function(command: List[str]) -> VMCommand:
+    opcode, name, count = command
+    return VMCommand(OPCODES[opcode], index=int(count), name=name)
+
+
+def _parse_move(command: List[str]) -> VMCommand:
+    opcode, segment, index, target_segment, target_index = command
+    return VMCommand(
+        Opcode.MOVE,
+        SEGMENTS[segment],
+        int(index),
+        target_segment=SEGMENTS[target_segment],
+        target_index=int(target_index),
+    )
+
+
+def _parse_compare_goto(command: List[str]) -> VMCommand:
+    opcode, jump, label = command
+    return VMCommand(Opcode.COMPARE_GOTO, index=Jump[jump], name=label)
+
+
+def _parse_arithmetic(command: List[str]) -> VMCommand:
+    return VMCommand(OPCODES[command[0]])
+
+
+PARSERS: Dict[Opcode, Callable[[List[str]], VMCommand]] = {
+    Opcode.PUSH: _parse_segment,
+    Opcode.POP: _parse_segment,
+    Opcode.LABEL: _parse_label,
+    Opcode.GOTO: _parse_label,
+    Opcode.IF_GOTO: _parse_label,
+    Opcode.FUNCTION: _parse_function,
+    Opcode.CALL: _parse_function,
+    Opcode.MOVE: _parse_move,
+    Opcode.COMPARE_GOTO: _parse_compare_goto,
+}
+
+ARGUMENT_RENDERERS: Dict[Opcode, Callable[[VMCommand], List[str]]] = {
+    Opcode.PUSH: lambda command: [command.segment.keyword, str(command.index)],
+    Opcode.POP: lambda command: [command.segment.keyword, str(command.index)],
+    Opcode.LABEL: lambda command: [command.name],
+    Opcode.GOTO: lambda command: [command.name],
+    Opcode.IF_GOTO: lambda command: [command.name],
+    Opcode.FUNCTION: lambda command: [command.name, str(command.index)],
+    Opcode.CALL: lambda command: [command.name, str(command.index)],
+    Opcode.MOVE: lambda command: [
+        command.segment.keyword,
+        str(command.index),
+        command.target_segment.keyword,
+        str(command.target_index),
+    ],
+    Opcode.COMPARE_GOTO: lambda command: [Jump(command.index).name, command.name],
+}
+ARGUMENT_RENDERERS.update(
+    {
+        opcode: lambda command: []
+        for opcode in Opcode
+        if opcode not in ARGUMENT_RENDERERS
+    }
+)
+
+TRASH_COMMAND: VMCommand = VMCommand(Opcode.TRASH)
+
+
+class VMParser:
+    @classmethod
+    def parse(cls, line: str) -> VMCommand:
+        command = line.split()
+        opcode = OPCODES.get(command[0]) if command else None
+        if opcode is None:
+            return TRASH_COMMAND
+        return PARSERS.get(opcode, _parse_arithmetic)(command)
+
+    @classmethod
+    def parse_program(cls, vm: Iterable[str]) -> List[VMCommand]:
+        trash_filter = CompositeTrashFilter()
+        return [
+            cls.parse(DeleteCommentAndStrip.parse(line))
+            for line in vm
+            if trash_filter.passes(line)
+        ]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, FrozenSet, Iterable, List, Protocol
+
+from n2t.core.vm_translator.constants import MAX_CONSTANT
+from n2t.core.vm_translator.ir import Jump, Opcode, Segment, VMCommand
+
+FOLDED_OPERATIONS: Dict[Opcode, Callable[[int, int], int]] = {
+    Opcode.ADD: lambda x, y: (x + y) & 0xFFFF,
+    Opcode.SUB: lambda x, y: (x - y) & 0xFFFF,
+    Opcode.AND: lambda x, y: x & y,
+    Opcode.OR: lambda x, y: x | y,
+}
+INVOLUTIONS: FrozenSet[Opcode] = frozenset({Opcode.NOT, Opcode.NEG})
+COMPARISON_JUMPS: Dict[Opcode, Jump] = {
+    Opcode.EQ: Jump.JEQ,
+    Opcode.LT: Jump.JLT,
+    Opcode.GT: Jump.JGT,
+}
+
+
+@dataclass
+class VMOptimizationReport:
+    folded_constants: int = 0
+    fused_moves: int = 0
+    removed_negations: int = 0
+    fused_branches: int = 0
+    before: int = 0
+    after: int = 0
+
+    def merge(self, other: VMOptimizationReport) -> None:
+        for name in fields(self):
+            setattr(
+                self, name.name, getattr(self, name.name) + getattr(other, name.name)
+            )
+
+
+class VMOptimizer(Protocol):
+    report: VMOptimizationReport
+
+    def __call__(self, vm: Iterable[VMCommand]) -> Iterable[VMCommand]:
+        pass
+
+
+@dataclass
+class VMPeepholeOptimizer(VMOptimizer):
+    report: VMOptimizationReport = field(default_factory=VMOptimizationReport)
+
+    def optimize(self, vm: Iterable[VMCommand]) -> List[VMCommand]:
+        result: List[VMCommand] = []
+        for command in vm:
+            self.report.before += 1
+            result.append(command)
+            while self._rewrite(result):
+                pass
+        self.report.after += len(result)
+        return result
+
+    def __call__(self, vm: Iterable[VMCommand]) -> Iterable[VMCommand]:
+        return self.optimize(vm)
+
+    def _rewrite(self, result: List[VMCommand]) -> bool:
+        return (
+            self._fold_constants(result)
+            or self._fuse_move(result)
+            or self._remove_double_negation(result)
+            or self._fuse_branch(result)
+        )
+
+    def _fold_constants(self, result: List[VMCommand]) -> bool:
+        if len(result) < 3 or result[-1].opcode not in FOLDED_OPERATIONS:
+            return False
+        if not (self._is_constant(result[-3]) and self._is_constant(result[-2])):
+            return False
+        fold = FOLDED_OPERATIONS[result[-1].opcode]
+        value = fold(result[-3].index, result[-2].index)
+        if value > MAX_CONSTANT:
+            return False
+        result[-3:] = [VMCommand(Opcode.PUSH, Segment.CONSTANT, value)]
+        self.report.folded_constants += 1
+        return True
+
+    def _fuse_move(self, result: List[VMCommand]) -> bool:
+        if len(result) < 2:
+            return False
+        push, pop = result[-2], result[-1]
+        if push.opcode is not Opcode.PUSH or pop.opcode is not Opcode.POP:
+            return False
+        result[-2:] = [
+            VMCommand(
+                Opcode.MOVE,
+                push.segment,
+                push.index,
+                target_segment=pop.segment,
+                target_index=pop.index,
+            )
+        ]
+        self.report.fused_moves += 1
+        return True
+
+    def _remove_double_negation(self, result: List[VMCommand]) -> bool:
+        if len(result) < 2 or result[-1].opcode not in INVOLUTIONS:
+            return False
+        if result[-2].opcode is not result[-1].opcode:
+            return False
+        del result[-2:]
+        self.report.removed_negations += 1
+        return True
+
+    def _fuse_branch(self, result: List[VMCommand]) -> bool:
+        goto = result[-1]
+        if goto.opcode is not Opcode.IF_GOTO or len(result) < 2:
+            return False
+        previous = [command.opcode for command in result[-3:-1]]
+        if previous[-1] in COMPARISON_JUMPS:
+            jump = COMPARISON_JUMPS[previous[-1]]
+            del result[-2:]
+        elif previous[-1] is Opcode.NOT and previous[0] in COMPARISON_JUMPS:
+            jump = COMPARISON_JUMPS[previous[0]].inverse
+            del result[-3:]
+            self.report.removed_negations += 1
+        else:
+            return False
+        result.append(VMCommand(Opcode.COMPARE_GOTO, index=jump, name=goto.name))
+        self.report.fused_branches += 1
+        return True
+
+    @classmethod
+    def _is_constant(cls, command: VMCommand) -> bool:
+        return command.opcode is Opcode.PUSH and command.segment is Segment.CONSTANT
@@ -9,6 +9,7 @@ from n2t.core.vm_translator.constants import (
     THAT_POINTER_POP_FORMAT,
     THIS_POINTER_POP_FORMAT,
 )
+from n2t.core.vm_translator.ir import Segment, VMCommand
 from n2t.core.vm_translator.stack_instruction import (
     PopOperation,
     StackInstruction,
@@ -21,7 +22,7 @@ class PointerPopOperation(PopOperation):
     that_format_str: ClassVar[str] = THAT_POINTER_POP_FORMAT
 
     def translate(self) -> str:
-        if self.stack_str.split()[2] == "0":
+        if self.command.index == 0:
             return self.this_format_str
         return self.that_format_str
 
@@ -30,44 +31,40 @@ class TempPopOperation(PopOperation):
     format_str: ClassVar[str] = TEMP_POP_FORMAT
 
     def translate(self) -> str:
-        num = self.stack_str.split()[2]
-        return self.format_str.format(num=num)
+        return self.format_str.format(num=self.command.index)
 
 
 class StaticPopOperation(PopOperation):
     format_str: ClassVar[str] = STATIC_POP_FORMAT
 
     def translate(self) -> str:
-        num = self.stack_str.split()[2]
-        return self.format_str.format(file_name=self.data.file_name, num=num)
+        return self.format_str.format(
+            file_name=self.data.file_name, num=self.command.index
+        )
 
 
 class NonStaticAddressPopOperation(PopOperation):
     format_str: ClassVar[str] = NON_STATIC_POP_FORMAT
 
     def translate(self) -> str:
-        split = self.stack_str.split()
-        address_type = ADDRESS_TYPE_TABLE.get(split[1])
-        num = split[2]
-        return self.format_str.format(address_type=address_type, num=num)
+        address_type = ADDRESS_TYPE_TABLE[self.command.segment.keyword]
+        return self.format_str.format(address_type=address_type, num=self.command.index)
 
 
 class PopOperationFactory:
-    pop_objects: ClassVar[Dict[str, Type["PopOperation"]]] = {
-        "pointer": PointerPopOperation,
-        "temp": TempPopOperation,
-        "static": StaticPopOperation,
+    pop_objects: ClassVar[Dict[Segment, Type["PopOperation"]]] = {
+        Segment.POINTER: PointerPopOperation,
+        Segment.TEMP: TempPopOperation,
+        Segment.STATIC: StaticPopOperation,
     }
 
     @classmethod
-    def build(cls, stack_str: str, data: TranslationData) -> StackInstruction:
-        keyword = stack_str.split()[1]
-        if keyword in cls.pop_objects:
-            return cls.pop_objects[keyword].create(stack_str, data)
-        return NonStaticAddressPopOperation.create(stack_str, data)
+    def build(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        operation = cls.pop_objects.get(command.segment, NonStaticAddressPopOperation)
+        return operation.create(command, data)
 
 
 class PopOperationFactoryAdapter(PopOperation, ABC):
     @classmethod
-    def create(cls, stack_str: str, data: TranslationData) -> StackInstruction:
-        return PopOperationFactory.build(stack_str, data)
+    def create(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        return PopOperationFactory.build(command, data)
@@ -6,10 +6,12 @@ from n2t.core.vm_translator.constants import (
     ADDRESS_TYPE_TABLE,
     CONSTANT_PUSH_FORMAT,
     NON_STATIC_PUSH_FORMAT,
+    POINTER_ADDRESS_TABLE,
     POINTER_PUSH_FORMAT,
     STATIC_PUSH_FORMAT,
     TEMP_PUSH_FORMAT,
 )
+from n2t.core.vm_translator.ir import Segment, VMCommand
 from n2t.core.vm_translator.stack_instruction import (
     PushOperation,
     StackInstruction,
@@ -19,14 +21,12 @@ from n2t.core.vm_translator.stack_instruction import (
 
 @dataclass
 class PointerPushOperation(PushOperation):
-    this_prefix: ClassVar[str] = "@THIS\n"
-    that_prefix: ClassVar[str] = "@THAT\n"
+    prefix_format: ClassVar[str] = "@{address}\n"
     format_str: ClassVar[str] = POINTER_PUSH_FORMAT
 
     def translate(self) -> str:
-        if self.stack_str.split()[2] == "0":
-            return self.this_prefix + self.format_str
-        return self.this_prefix + self.format_str
+        address = POINTER_ADDRESS_TABLE[self.command.index]
+        return self.prefix_format.format(address=address) + self.format_str
 
 
 @dataclass
@@ -34,8 +34,7 @@ class TempPushOperation(PushOperation):
     format_str: ClassVar[str] = TEMP_PUSH_FORMAT
 
     def translate(self) -> str:
-        num = self.stack_str.split()[2]
-        return self.format_str.format(num=num)
+        return self.format_str.format(num=self.command.index)
 
 
 @dataclass
@@ -43,45 +42,41 @@ class ConstantPushOperation(PushOperation):
     format_str: ClassVar[str] = CONSTANT_PUSH_FORMAT
 
     def translate(self) -> str:
-        num = self.stack_str.split()[2]
-        return self.format_str.format(num=num)
+        return self.format_str.format(num=self.command.index)
 
 
 class StaticPushOperation(PushOperation):
     format_str: ClassVar[str] = STATIC_PUSH_FORMAT
 
     def translate(self) -> str:
-        num = self.stack_str.split()[2]
-        return self.format_str.format(file_name=self.data.file_name, num=num)
+        return self.format_str.format(
+            file_name=self.data.file_name, num=self.command.index
+        )
 
 
 class NonStaticAddressPushOperation(PushOperation):
     format_str: ClassVar[str] = NON_STATIC_PUSH_FORMAT
 
     def translate(self) -> str:
-        split = self.stack_str.split()
-        address_type = ADDRESS_TYPE_TABLE.get(split[1])
-        num = split[2]
-        return self.format_str.format(address_type=address_type, num=num)
+        address_type = ADDRESS_TYPE_TABLE[self.command.segment.keyword]
+        return self.format_str.format(address_type=address_type, num=self.command.index)
 
 
 class PushOperationFactory:
-    push_objects: ClassVar[Dict[str, Type[PushOperation]]] = {
-        "pointer": PointerPushOperation,
-        "temp": TempPushOperation,
-        "constant": ConstantPushOperation,
-        "static": StaticPushOperation,
+    push_objects: ClassVar[Dict[Segment, Type[PushOperation]]] = {
+        Segment.POINTER: PointerPushOperation,
+        Segment.TEMP: TempPushOperation,
+        Segment.CONSTANT: ConstantPushOperation,
+        Segment.STATIC: StaticPushOperation,
     }
 
     @classmethod
-    def build(cls, stack_str: str, data: TranslationData) -> StackInstruction:
-        keyword = stack_str.split()[1]
-        if keyword in cls.push_objects:
-            return cls.push_objects[keyword].create(stack_str, data)
-        return NonStaticAddressPushOperation.create(stack_str, data)
+    def build(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        operation = cls.push_objects.get(command.segment, NonStaticAddressPushOperation)
+        return operation.create(command, data)
 
 
 class PushOperationFactoryAdapter(PushOperation, ABC):
     @classmethod
-    def create(cls, stack_str: str, data: TranslationData) -> StackInstruction:
-        return PushOperationFactory.build(stack_str, data)
+    def create(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        return PushOperationFactory.build(command, data)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from n2t.core.vm_translator.ir import Opcode
+
+ROM_CAPACITY: int = 32768
+RUNTIME_NAME: str = "(runtime)"
+
+OPCODE_CATEGORIES: Dict[Opcode, str] = {
+    Opcode.ADD: "arithmetic",
+    Opcode.SUB: "arithmetic",
+    Opcode.NEG: "arithmetic",
+    Opcode.AND: "arithmetic",
+    Opcode.OR: "arithmetic",
+    Opcode.NOT: "arithmetic",
+    Opcode.EQ: "comparison",
+    Opcode.GT: "comparison",
+    Opcode.LT: "comparison",
+    Opcode.PUSH: "memory",
+    Opcode.POP: "memory",
+    Opcode.MOVE: "memory",
+    Opcode.LABEL: "branching",
+    Opcode.GOTO: "branching",
+    Opcode.IF_GOTO: "branching",
+    Opcode.COMPARE_GOTO: "branching",
+    Opcode.FUNCTION: "function",
+    Opcode.CALL: "function",
+    Opcode.RETURN: "function",
+    Opcode.TRASH: "other",
+}
+CATEGORIES: List[str] = list(dict.fromkeys(OPCODE_CATEGORIES.values()))
+
+
+@dataclass
+class FunctionSize:
+    file_name: str
+    name: str
+    categories: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def instructions(self) -> int:
+        return sum(self.categories.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file_name,
+            "function": self.name,
+            "instructions": self.instructions,
+            "categories": self.categories,
+        }
+
+
+@dataclass
+class RomReport:
+    functions: List[FunctionSize] = field(default_factory=list)
+    runtime: int = 0
+
+    def begin(self, file_name: str, name: str) -> None:
+        self.functions.append(FunctionSize(file_name, name))
+
+    def record(self, file_name: str, category: str, size: int) -> None:
+        if not self.functions or self.functions[-1].file_name != file_name:
+            self.begin(file_name, file_name)
+        categories = self.functions[-1].categories
+        categories[category] = categories.get(category, 0) + size
+
+    def merge(self, other: RomReport) -> None:
+        self.functions += other.functions
+        self.runtime += other.runtime
+
+    @property
+    def total(self) -> int:
+        return self.runtime + sum(function.instructions for function in self.functions)
+
+    @property
+    def headroom(self) -> int:
+        return ROM_CAPACITY - self.total
+
+    def file_totals(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for function in self.functions:
+            file_name = function.file_name
+            totals[file_name] = totals.get(file_name, 0) + function.instructions
+        return totals
+
+    def sorted_functions(self) -> List[FunctionSize]:
+        return sorted(
+            self.functions, key=lambda function: (-function.instructions, function.name)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": ROM_CAPACITY,
+            "total": self.total,
+            "headroom": self.headroom,
+            "runtime": self.runtime,
+            "files": self.file_totals(),
+            "functions": [function.to_dict() for function in self.sorted_functions()],
+        }
+
+    def table(self) -> List[str]:
+        width = max([len(RUNTIME_NAME), *(len(f.name) for f in self.functions)])
+        header = "".join(f"{category:>12}" for category in CATEGORIES)
+        lines = [f"{'function':<{width}}{'total':>8}{header}"]
+        for function in self.sorted_functions():
+            counts = "".join(
+                f"{function.categories.get(category, 0):>12}" for category in CATEGORIES
+            )
+            lines.append(f"{function.name:<{width}}{function.instructions:>8}{counts}")
+        lines.append(f"{RUNTIME_NAME:<{width}}{self.runtime:>8}")
+        for file_name, total in sorted(self.file_totals().items()):
+            lines.append(f"{file_name + '.vm':<{width}}{total:>8}")
+        lines.append(
+            f"ROM: {self.total} of {ROM_CAPACITY} words, {self.headroom} to spare"
+        )
+        return lines
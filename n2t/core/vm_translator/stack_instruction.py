@@ -1,23 +1,72 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import ClassVar
+from typing import ClassVar, Dict
 
 from n2t.core.vm_translator.constants import (
+    ADDRESS_TYPE_TABLE,
+    BINARY_COMPUTATIONS_TABLE,
     BINARY_OPERATION_FORMAT,
-    BINARY_SYMBOLS_TABLE,
     BOOT_FORMAT,
     BRANCH_OPERATION_FORMAT,
+    COMPARE_GOTO_FORMAT,
     FUNCTION_CALL_FORMAT,
     FUNCTION_DECLARATION_NAME_PREFIX,
     FUNCTION_DECLARATION_SEGMENT_FORMAT,
     GOTO_FORMAT,
     IF_GOTO_FORMAT,
     LABEL_FORMAT,
+    MOVE_LOAD_FORMATS,
+    MOVE_STORE_FORMATS,
     NEGATION_FORMAT,
     NEGATION_SYMBOLS_TABLE,
+    POINTER_ADDRESS_TABLE,
     RETURN_FORMAT,
     RETURN_LABEL_FORMAT,
+    SHARED_CALL_FORMAT,
+    SHARED_CALL_LABEL,
+    SHARED_CALL_ROUTINE,
+    SHARED_COMPARISON_FORMAT,
+    SHARED_COMPARISON_ROUTINE,
+    SHARED_RETURN_FORMAT,
+    SHARED_RETURN_LABEL,
+    SHARED_RETURN_ROUTINE,
+    TEMP_BASE_ADDRESS,
+)
+from n2t.core.vm_translator.ir import Jump, Opcode, Segment, VMCommand
+from n2t.core.vm_translator.rom_report import RomReport
+
+
+def count_instructions(assembly: str) -> int:
+    return sum(1 for line in assembly.splitlines() if line and line[0] != "(")
+
+
+SHARED_CALL_SAVING: int = count_instructions(FUNCTION_CALL_FORMAT) - count_instructions(
+    SHARED_CALL_FORMAT
+)
+SHARED_RETURN_SAVING: int = count_instructions(RETURN_FORMAT) - count_instructions(
+    SHARED_RETURN_FORMAT
 )
+SHARED_COMPARISON_SAVING: int = count_instructions(
+    BRANCH_OPERATION_FORMAT
+) - count_instructions(SHARED_COMPARISON_FORMAT)
+
+
+def format_segment(
+    formats: Dict[str, str], segment: Segment, num: int, file_name: str, load: str = ""
+) -> str:
+    if segment in (Segment.CONSTANT, Segment.STATIC):
+        return formats[segment.keyword].format(file_name=file_name, num=num, load=load)
+    if segment is Segment.TEMP:
+        address = str(TEMP_BASE_ADDRESS + num)
+        return formats["direct"].format(address=address, load=load)
+    if segment is Segment.POINTER:
+        address = POINTER_ADDRESS_TABLE[num]
+        return formats["direct"].format(address=address, load=load)
+    return formats["indirect"].format(
+        address_type=ADDRESS_TYPE_TABLE[segment.keyword], num=num, load=load
+    )
 
 
 @dataclass
@@ -25,11 +74,25 @@ class TranslationData:
     file_name: str = field(default="")
     branching_counter: int = field(default=0)
     return_counter: int = field(default=0)
+    shared_calls: bool = field(default=False)
+    shared_comparisons: bool = field(default=False)
+    tos_cache: bool = field(default=False)
+    tos_cached: bool = field(default=False)
+    routines: Dict[str, str] = field(default_factory=dict)
+    rom_size: int = field(default=0)
+    saved_size: int = field(default=0)
+    rom_report: RomReport = field(default_factory=RomReport)
+
+    def merge(self, other: TranslationData) -> None:
+        self.routines.update(other.routines)
+        self.rom_size += other.rom_size
+        self.saved_size += other.saved_size
+        self.rom_report.merge(other.rom_report)
 
 
 @dataclass
 class StackInstruction(ABC):
-    stack_str: str
+    command: VMCommand
     data: TranslationData
 
     @abstractmethod
@@ -37,34 +100,43 @@ class StackInstruction(ABC):
         pass
 
     @classmethod
-    def create(cls, stack_str: str, data: TranslationData) -> "StackInstruction":
-        return cls(stack_str, data)
+    def create(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        return cls(command, data)
 
 
 class BinaryOperation(StackInstruction):
     format_str: ClassVar[str] = BINARY_OPERATION_FORMAT
 
     def translate(self) -> str:
-        operator = BINARY_SYMBOLS_TABLE.get(self.stack_str.split()[0])
-        return self.format_str.format(operator=operator)
+        computation = BINARY_COMPUTATIONS_TABLE[self.command.opcode.keyword]
+        return self.format_str.format(computation=computation)
 
 
 class Negation(StackInstruction):
     format_str: ClassVar[str] = NEGATION_FORMAT
 
     def translate(self) -> str:
-        operator = NEGATION_SYMBOLS_TABLE.get(self.stack_str.split()[0])
+        operator = NEGATION_SYMBOLS_TABLE[self.command.opcode.keyword]
         return self.format_str.format(operator=operator)
 
 
 class BranchOperation(StackInstruction):
     format_str: ClassVar[str] = BRANCH_OPERATION_FORMAT
+    shared_format_str: ClassVar[str] = SHARED_COMPARISON_FORMAT
+    routine_str: ClassVar[str] = SHARED_COMPARISON_ROUTINE
 
     def translate(self) -> str:
         self.data.branching_counter += 1
-        operator = self.stack_str.split()[0].upper()
-        return self.format_str.format(
-            operator=operator, branching_counter=self.data.branching_counter
+        operator = self.command.opcode.name
+        format_str = self.format_str
+        if self.data.shared_comparisons:
+            format_str = self.shared_format_str
+            self.data.routines[operator] = self.routine_str.format(operator=operator)
+            self.data.saved_size += SHARED_COMPARISON_SAVING
+        return format_str.format(
+            file_name=self.data.file_name,
+            operator=operator,
+            branching_counter=self.data.branching_counter,
         )
 
 
@@ -76,15 +148,39 @@ class PopOperation(StackInstruction, ABC):
     pass
 
 
+class MoveOperation(StackInstruction):
+    load_formats: ClassVar[Dict[str, str]] = MOVE_LOAD_FORMATS
+    store_formats: ClassVar[Dict[str, str]] = MOVE_STORE_FORMATS
+
+    def translate(self) -> str:
+        command, file_name = self.command, self.data.file_name
+        load = format_segment(
+            self.load_formats, command.segment, command.index, file_name
+        )
+        return format_segment(
+            self.store_formats,
+            command.target_segment,
+            command.target_index,
+            file_name,
+            load,
+        )
+
+
+class CompareGotoInstruction(StackInstruction):
+    format_str: ClassVar[str] = COMPARE_GOTO_FORMAT
+
+    def translate(self) -> str:
+        jump = Jump(self.command.index).name
+        return self.format_str.format(jump=jump, label=self.command.name)
+
+
 class GotoInstruction(StackInstruction):
     goto_format: ClassVar[str] = GOTO_FORMAT
     if_goto_format: ClassVar[str] = IF_GOTO_FORMAT
 
     def translate(self) -> str:
-        split = self.stack_str.split()
-        keyword = split[0]
-        label = split[1]
-        if keyword == "goto":
+        label = self.command.name
+        if self.command.opcode is Opcode.GOTO:
             return self.goto_format.format(label=label)
         return self.if_goto_format.format(label=label)
 
@@ -94,26 +190,30 @@ class FunctionDeclaration(StackInstruction):
     arg_segment_format: ClassVar[str] = FUNCTION_DECLARATION_SEGMENT_FORMAT
 
     def translate(self) -> str:
-        split = self.stack_str.split()
-        function_name = split[1]
-        num_arguments = int(split[2])
-        prefix = self.prefix_format.format(function_name=function_name)
-        return prefix + self.arg_segment_format * num_arguments
+        prefix = self.prefix_format.format(function_name=self.command.name)
+        return prefix + self.arg_segment_format * self.command.index
 
 
 class FunctionCall(StackInstruction):
     format_str: ClassVar[str] = FUNCTION_CALL_FORMAT
+    shared_format_str: ClassVar[str] = SHARED_CALL_FORMAT
     return_label: ClassVar[str] = RETURN_LABEL_FORMAT
 
     def translate(self) -> str:
         self.data.return_counter += 1
-        split = self.stack_str.split()
-        function_name = split[1]
-        num_arguments = split[2]
+        function_name = self.command.name
+        num_arguments = self.command.index
         return_label = self.return_label.format(
-            function_name=function_name, return_counter=self.data.return_counter
+            file_name=self.data.file_name,
+            function_name=function_name,
+            return_counter=self.data.return_counter,
         )
-        return self.format_str.format(
+        format_str = self.format_str
+        if self.data.shared_calls:
+            format_str = self.shared_format_str
+            self.data.routines[SHARED_CALL_LABEL] = SHARED_CALL_ROUTINE
+            self.data.saved_size += SHARED_CALL_SAVING
+        return format_str.format(
             function_name=function_name,
             num_arguments=num_arguments,
             return_label=return_label,
@@ -122,8 +222,13 @@ class FunctionCall(StackInstruction):
 
 class ReturnInstruction(StackInstruction):
     format_str: ClassVar[str] = RETURN_FORMAT
+    shared_format_str: ClassVar[str] = SHARED_RETURN_FORMAT
 
     def translate(self) -> str:
+        if self.data.shared_calls:
+            self.data.routines[SHARED_RETURN_LABEL] = SHARED_RETURN_ROUTINE
+            self.data.saved_size += SHARED_RETURN_SAVING
+            return self.shared_format_str
         return self.format_str
 
 
@@ -131,7 +236,7 @@ class BootInstruction(StackInstruction):
     format_str: ClassVar[str] = BOOT_FORMAT
 
     def translate(self) -> str:
-        function_call = FunctionCall.create(self.stack_str, self.data).translate()
+        function_call = FunctionCall.create(self.command, self.data).translate()
         return self.format_str.format(function_call=function_call)
 
 
@@ -139,8 +244,7 @@ class LabelInstruction(StackInstruction):
     format_str: ClassVar[str] = LABEL_FORMAT
 
     def translate(self) -> str:
-        label_name = self.stack_str.split()[1]
-        return self.format_str.format(label_name=label_name)
+        return self.format_str.format(label_name=self.command.name)
 
 
 class TrashInstruction(StackInstruction):
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from abc import ABC
+from typing import ClassVar, Dict, Type
+
+from n2t.core.vm_translator.constants import (
+    ADDRESS_TYPE_TABLE,
+    BINARY_COMPUTATIONS_TABLE,
+    MOVE_LOAD_FORMATS,
+    NEGATION_SYMBOLS_TABLE,
+    TOS_BINARY_OPERATION_FORMAT,
+    TOS_BRANCH_OPERATION_FORMAT,
+    TOS_COMPARE_GOTO_FORMAT,
+    TOS_FILL_FORMAT,
+    TOS_IF_GOTO_FORMAT,
+    TOS_NEGATION_FORMAT,
+    TOS_OFFSET_LIMIT,
+    TOS_SPILL_FORMAT,
+    TOS_STORE_FORMATS,
+)
+from n2t.core.vm_translator.instruction_factory import StackInstructionFactory
+from n2t.core.vm_translator.ir import Jump, Opcode, Segment, VMCommand
+from n2t.core.vm_translator.stack_instruction import (
+    BranchOperation,
+    StackInstruction,
+    TranslationData,
+    TrashInstruction,
+    format_segment,
+)
+
+INDIRECT_SEGMENTS = (Segment.LOCAL, Segment.ARGUMENT, Segment.THIS, Segment.THAT)
+
+
+def spill(data: TranslationData) -> str:
+    if not data.tos_cached:
+        return ""
+    data.tos_cached = False
+    return TOS_SPILL_FORMAT
+
+
+class CachedStackInstruction(StackInstruction, ABC):
+    def fill(self) -> str:
+        if self.data.tos_cached:
+            return ""
+        self.data.tos_cached = True
+        return TOS_FILL_FORMAT
+
+    def spill(self) -> str:
+        return spill(self.data)
+
+
+class CachedPushOperation(CachedStackInstruction):
+    load_formats: ClassVar[Dict[str, str]] = MOVE_LOAD_FORMATS
+
+    def translate(self) -> str:
+        command = self.command
+        load = format_segment(
+            self.load_formats, command.segment, command.index, self.data.file_name
+        )
+        spilled = self.spill()
+        self.data.tos_cached = True
+        return spilled + load
+
+
+class CachedPopOperation(CachedStackInstruction):
+    store_formats: ClassVar[Dict[str, str]] = TOS_STORE_FORMATS
+
+    def translate(self) -> str:
+        command = self.command
+        filled = self.fill()
+        self.data.tos_cached = False
+        if command.segment in INDIRECT_SEGMENTS and command.index <= TOS_OFFSET_LIMIT:
+            return filled + self.store_formats["near"].format(
+                address_type=ADDRESS_TYPE_TABLE[command.segment.keyword],
+                offset="A=A+1\n" * command.index,
+            )
+        return filled + format_segment(
+            self.store_formats, command.segment, command.index, self.data.file_name
+        )
+
+
+class CachedBinaryOperation(CachedStackInstruction):
+    format_str: ClassVar[str] = TOS_BINARY_OPERATION_FORMAT
+
+    def translate(self) -> str:
+        computation = BINARY_COMPUTATIONS_TABLE[self.command.opcode.keyword]
+        return self.fill() + self.format_str.format(computation=computation)
+
+
+class CachedNegation(CachedStackInstruction):
+    format_str: ClassVar[str] = TOS_NEGATION_FORMAT
+
+    def translate(self) -> str:
+        operator = NEGATION_SYMBOLS_TABLE[self.command.opcode.keyword]
+        return self.fill() + self.format_str.format(operator=operator)
+
+
+class CachedBranchOperation(CachedStackInstruction):
+    format_str: ClassVar[str] = TOS_BRANCH_OPERATION_FORMAT
+
+    def translate(self) -> str:
+        if self.data.shared_comparisons:
+            return (
+                self.spill()
+                + BranchOperation.create(self.command, self.data).translate()
+            )
+        filled = self.fill()
+        self.data.branching_counter += 1
+        return filled + self.format_str.format(
+            file_name=self.data.file_name,
+            operator=self.command.opcode.name,
+            branching_counter=self.data.branching_counter,
+        )
+
+
+class CachedIfGotoInstruction(CachedStackInstruction):
+    format_str: ClassVar[str] = TOS_IF_GOTO_FORMAT
+
+    def translate(self) -> str:
+        filled = self.fill()
+        self.data.tos_cached = False
+        return filled + self.format_str.format(label=self.command.name)
+
+
+class CachedCompareGotoInstruction(CachedStackInstruction):
+    format_str: ClassVar[str] = TOS_COMPARE_GOTO_FORMAT
+
+    def translate(self) -> str:
+        filled = self.fill()
+        self.data.tos_cached = False
+        jump = Jump(self.command.index).name
+        return filled + self.format_str.format(jump=jump, label=self.command.name)
+
+
+class SpillingInstruction(CachedStackInstruction):
+    def translate(self) -> str:
+        spilled = self.spill()
+        return (
+            spilled + StackInstructionFactory.build(self.command, self.data).translate()
+        )
+
+
+class TopOfStackInstructionFactory(StackInstructionFactory):
+    operation_objects: Dict[Opcode, Type[StackInstruction]] = {
+        Opcode.ADD: CachedBinaryOperation,
+        Opcode.SUB: CachedBinaryOperation,
+        Opcode.AND: CachedBinaryOperation,
+        Opcode.OR: CachedBinaryOperation,
+        Opcode.NOT: CachedNegation,
+        Opcode.NEG: CachedNegation,
+        Opcode.EQ: CachedBranchOperation,
+        Opcode.LT: CachedBranchOperation,
+        Opcode.GT: CachedBranchOperation,
+        Opcode.PUSH: CachedPushOperation,
+        Opcode.POP: CachedPopOperation,
+        Opcode.IF_GOTO: CachedIfGotoInstruction,
+        Opcode.COMPARE_GOTO: CachedCompareGotoInstruction,
+        Opcode.TRASH: TrashInstruction,
+    }
+
+    @classmethod
+    def build(cls, command: VMCommand, data: TranslationData) -> StackInstruction:
+        operation = cls.operation_objects.get(command.opcode, SpillingInstruction)
+        return operation.create(command, data)
@@ -1,12 +1,15 @@
-from n2t.infra.asm import AsmProgram
-from n2t.infra.hack import HackProgram
-from n2t.infra.io import FileFormat
+from n2t.infra.asm import AsmProgram, AssemblerEngine
+from n2t.infra.hack import HackBatch, HackProgram
+from n2t.infra.io import FileFormat, HackFormat
 from n2t.infra.jack import JackProgram
 from n2t.infra.vm import VmProgram
 
 __all__ = [
     "FileFormat",
+    "HackFormat",
     "AsmProgram",
+    "AssemblerEngine",
+    "HackBatch",
     "HackProgram",
     "JackProgram",
     "VmProgram",
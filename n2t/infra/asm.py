@@ -1,28 +1,102 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Iterable, Iterator, Optional, Protocol
 
 from n2t.core import Assembler as DefaultAssembler
-from n2t.infra.io import File, FileFormat
+from n2t.core import (
+    AssemblyCache,
+    CompactAssembler,
+    IncrementalAssembler,
+    ParallelAssembler,
+    PeepholeOptimizer,
+    ReuseReport,
+    StreamingAssembler,
+)
+from n2t.core.assembler.vectorized import HackTextRenderer
+from n2t.infra.io import BinaryFile, File, FileFormat, HackFormat, SourceMapFile
+
+
+class AssemblerEngine(str, Enum):
+    classic = "classic"
+    streaming = "streaming"
+    compact = "compact"
+
+    def create(self) -> Assembler:
+        if self is AssemblerEngine.streaming:
+            return StreamingAssembler.create()
+        if self is AssemblerEngine.compact:
+            return CompactAssembler.create()
+        return DefaultAssembler.create()
 
 
 @dataclass
 class AsmProgram:
     path: Path
     assembler: Assembler = field(default_factory=DefaultAssembler.create)
+    optimizer: Optional[PeepholeOptimizer] = None
 
     @classmethod
-    def load_from(cls, file_name: str) -> AsmProgram:
-        return cls(Path(file_name))
+    def load_from(
+        cls,
+        file_name: str,
+        engine: AssemblerEngine = AssemblerEngine.classic,
+        optimize: bool = False,
+        jobs: int = 1,
+    ) -> AsmProgram:
+        if jobs > 1:
+            return cls(Path(file_name), ParallelAssembler.create(jobs))
+        if optimize:
+            optimizer = PeepholeOptimizer()
+            assembler = CompactAssembler(optimizer=optimizer)
+            return cls(Path(file_name), assembler, optimizer)
+        return cls(Path(file_name), engine.create())
 
     def __post_init__(self) -> None:
         FileFormat.asm.validate(self.path)
 
-    def assemble(self) -> None:
-        hack_file = File(FileFormat.hack.convert(self.path))
-        hack_file.save(self.assembler.assemble(self))
+    def assemble(self, hack_format: HackFormat = HackFormat.text) -> None:
+        self._assemble_with(self.assembler, hack_format)
+
+    def assemble_incrementally(
+        self, hack_format: HackFormat = HackFormat.text
+    ) -> ReuseReport:
+        cache_path = self._sidecar_path("cache")
+        cache = AssemblyCache()
+        if cache_path.exists():
+            cache = AssemblyCache.loads(cache_path.read_text())
+
+        assembler = IncrementalAssembler.create(cache)
+        self._assemble_with(assembler, hack_format)
+        cache_path.write_text(assembler.cache.dumps())
+        return assembler.report
+
+    def assemble_with_source_map(
+        self, hack_format: HackFormat = HackFormat.text
+    ) -> Path:
+        assembler = CompactAssembler(optimizer=self.optimizer)
+        words, source_map = assembler.assemble_mapped(self, self.path.name)
+        self._save(words, hack_format)
+        map_path = self._sidecar_path("map")
+        SourceMapFile(map_path).save(source_map)
+        return map_path
+
+    def _assemble_with(self, assembler: Assembler, hack_format: HackFormat) -> None:
+        self._save(assembler.assemble_words(self), hack_format)
+
+    def _save(self, words: array[int], hack_format: HackFormat) -> None:
+        hack_path = FileFormat.hack.convert(self.path)
+        if hack_format is HackFormat.binary:
+            BinaryFile(hack_path).save(words)
+        else:
+            File(hack_path).save_bytes(HackTextRenderer.render(words))
+
+    def _sidecar_path(self, suffix: str) -> Path:
+        hack_path = FileFormat.hack.convert(self.path)
+        return hack_path.with_name(f"{hack_path.name}.{suffix}")
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()
@@ -31,3 +105,6 @@ class AsmProgram:
 class Assembler(Protocol):  # pragma: no cover
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
         pass
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        pass
@@ -1,33 +1,179 @@
 from __future__ import annotations
 
+import glob
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from itertools import count
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Iterable, Iterator, List, Protocol, Sequence, Tuple, Type
 
+from n2t.core import ControlFlowGraph
 from n2t.core import Disassembler as DefaultDisassembler
-from n2t.infra.io import File, FileFormat
+from n2t.infra.io import (
+    BinaryFile,
+    ControlFlowGraphFile,
+    File,
+    FileFormat,
+    HackFormat,
+)
+
+DISASSEMBLY_ERRORS: Tuple[Type[Exception], ...] = (
+    AssertionError,
+    OSError,
+    ValueError,
+)
 
 
 @dataclass
 class HackProgram:
     path: Path
     disassembler: Disassembler = field(default_factory=DefaultDisassembler.create)
+    hack_format: HackFormat = HackFormat.text
+    labels: bool = False
 
     def __post_init__(self) -> None:
         FileFormat.hack.validate(self.path)
 
     @classmethod
-    def load_from(cls, file_name: str) -> HackProgram:
-        return cls(Path(file_name))
+    def load_from(
+        cls,
+        file_name: str,
+        hack_format: HackFormat = HackFormat.text,
+        labels: bool = False,
+    ) -> HackProgram:
+        return cls(Path(file_name), hack_format=hack_format, labels=labels)
 
-    def disassemble(self) -> None:
+    def disassemble(self) -> int:
         assembly_file = File(FileFormat.asm.convert(self.path))
-        assembly_file.save(self.disassembler.disassemble(self))
+        if self.labels:
+            words = self.words()
+            graph = self.control_flow_graph(words)
+            assembly_file.save(self.disassembler.disassemble_labeled(words, graph))
+            return len(words)
+        if self.hack_format is HackFormat.binary:
+            with BinaryFile(self.path).load() as rom:
+                assembly_file.save(self.disassembler.disassemble_words(rom))
+                return len(rom)
+
+        counter = count()
+        lines = (line for line, _ in zip(self, counter))
+        assembly_file.save(self.disassembler.disassemble(lines))
+        return next(counter)
+
+    def words(self) -> array[int]:
+        if self.hack_format is HackFormat.binary:
+            with BinaryFile(self.path).load() as rom:
+                return array("H", rom)
+        return array("H", (int(word, base=2) for word in self))
+
+    def control_flow_graph(self, words: Sequence[int]) -> ControlFlowGraph:
+        cache = ControlFlowGraphFile(self.path.with_name(f"{self.path.name}.cfg"))
+        if cache.path.exists():
+            graph = cache.load()
+            if graph.matches(words):
+                return graph
+
+        graph = ControlFlowGraph.build(words)
+        cache.save(graph)
+        return graph
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()
 
 
+@dataclass
+class BatchReport:
+    files: int = 0
+    words: int = 0
+    seconds: float = 0.0
+    failures: List[Tuple[Path, str]] = field(default_factory=list)
+
+    @property
+    def words_per_second(self) -> float:
+        return self.words / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class HackBatch:
+    paths: List[Path]
+    hack_format: HackFormat = HackFormat.text
+    labels: bool = False
+    report: BatchReport = field(default_factory=BatchReport)
+
+    @classmethod
+    def load_from(
+        cls,
+        pattern: str,
+        hack_format: HackFormat = HackFormat.text,
+        labels: bool = False,
+    ) -> HackBatch:
+        path = Path(pattern)
+        if path.is_dir():
+            paths = sorted(path.glob(f"*{FileFormat.hack.value}"))
+        elif glob.has_magic(pattern):
+            paths = sorted(
+                Path(name)
+                for name in glob.glob(pattern, recursive=True)
+                if name.endswith(FileFormat.hack.value)
+            )
+        else:
+            paths = [path]
+        return cls(paths, hack_format, labels)
+
+    def disassemble(self, jobs: int = 1) -> Iterator[Tuple[Path, int]]:
+        self.report = BatchReport()
+        start = time.perf_counter()
+        for path, words in self._disassemble_all(jobs):
+            self.report.files += 1
+            self.report.words += words
+            self.report.seconds = time.perf_counter() - start
+            yield path, words
+
+    def _disassemble_all(self, jobs: int) -> Iterator[Tuple[Path, int]]:
+        if jobs <= 1:
+            for path in self.paths:
+                try:
+                    words = _disassemble(path, self.hack_format, self.labels)
+                except DISASSEMBLY_ERRORS as error:
+                    self._fail(path, error)
+                    continue
+                yield path, words
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(_disassemble, path, self.hack_format, self.labels): path
+                for path in self.paths
+            }
+            for future in as_completed(futures):
+                try:
+                    words = future.result()
+                except DISASSEMBLY_ERRORS as error:
+                    self._fail(futures[future], error)
+                    continue
+                yield futures[future], words
+
+    def _fail(self, path: Path, error: Exception) -> None:
+        self.report.failures.append((path, f"{type(error).__name__}: {error}"))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+def _disassemble(path: Path, hack_format: HackFormat, labels: bool) -> int:
+    return HackProgram(path, hack_format=hack_format, labels=labels).disassemble()
+
+
 class Disassembler(Protocol):  # pragma: no cover
     def disassemble(self, words: Iterable[str]) -> Iterable[str]:
         pass
+
+    def disassemble_words(self, words: Iterable[int]) -> Iterable[str]:
+        pass
+
+    def disassemble_labeled(
+        self, words: Sequence[int], graph: ControlFlowGraph
+    ) -> Iterable[str]:
+        pass
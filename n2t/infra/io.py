@@ -1,11 +1,23 @@
 from __future__ import annotations
 
 import glob
+import mmap
 import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
+
+from n2t.core.assembler import SourceMap, SourceMapView
+from n2t.core.disassembler import ControlFlowGraph
+
+BINARY_MAGIC: bytes = b"HACK"
+BINARY_VERSION: int = 1
+BINARY_HEADER = struct.Struct("<4sHHI")
 
 
 class FileFormat(Enum):
@@ -19,6 +31,11 @@ class FileFormat(Enum):
         return path.with_suffix(self.value)
 
 
+class HackFormat(str, Enum):
+    text = "text"
+    binary = "binary"
+
+
 @dataclass(frozen=True)
 class File:
     path: Path
@@ -32,6 +49,82 @@ class File:
             for line in lines:
                 file.write(f"{line}\n")
 
+    def save_bytes(self, content: bytes) -> None:
+        with self.path.open("wb") as file:
+            file.write(content)
+
+
+@dataclass(frozen=True)
+class BinaryFile:
+    path: Path
+
+    @contextmanager
+    def load(self) -> Iterator[memoryview]:
+        with self.path.open("rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            magic, version, _, count = BINARY_HEADER.unpack_from(mapped)
+            assert magic == BINARY_MAGIC, f"{self.path} is not a binary hack file"
+            assert version == BINARY_VERSION, f"Unsupported version {version}"
+
+            payload = memoryview(mapped)[BINARY_HEADER.size :]
+            words = self._as_words(payload)
+            try:
+                assert len(words) == count, f"{self.path} is truncated"
+                yield words
+            finally:
+                words.release()
+                payload.release()
+
+    def save(self, words: array[int]) -> None:
+        if sys.byteorder != "little":
+            words = array("H", words)
+            words.byteswap()
+        with self.path.open("wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(words)))
+            file.write(words.tobytes())
+
+    @classmethod
+    def _as_words(cls, payload: memoryview) -> memoryview:
+        if sys.byteorder == "little":
+            return payload.cast("H")
+        words = array("H", payload.tobytes())
+        words.byteswap()
+        return memoryview(words)
+
+
+@dataclass(frozen=True)
+class SourceMapFile:
+    path: Path
+
+    @contextmanager
+    def load(self) -> Iterator[SourceMapView]:
+        with self.path.open("rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            view = SourceMapView(memoryview(mapped))
+            try:
+                yield view
+            finally:
+                view.buffer.release()
+
+    def save(self, source_map: SourceMap) -> None:
+        with self.path.open("wb") as file:
+            file.write(source_map.to_bytes())
+
+
+@dataclass(frozen=True)
+class ControlFlowGraphFile:
+    path: Path
+
+    def load(self) -> ControlFlowGraph:
+        with self.path.open("rb") as file:
+            return ControlFlowGraph.from_bytes(file.read())
+
+    def save(self, graph: ControlFlowGraph) -> None:
+        with self.path.open("wb") as file:
+            file.write(graph.to_bytes())
+
 
 def remove_files(pattern: str) -> None:
     for file in glob.glob(pattern):
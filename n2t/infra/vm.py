@@ -1,47 +1,180 @@
 from __future__ import annotations
 
+import json
+import time
 from dataclasses import dataclass, field
 from itertools import chain
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Iterable, Iterator, List, Optional, Protocol, Tuple
 
-from n2t.core.vm_translator.facade import VMTranslator
+from n2t.core.vm_emulator import VMEmulator, VMProfiler
+from n2t.core.vm_emulator.constants import MAX_STEPS
+from n2t.core.vm_emulator.natives import NativeSpeedup
+from n2t.core.vm_translator.cache import TranslationCache
+from n2t.core.vm_translator.call_graph import DeadFunctionReport, VMSource
+from n2t.core.vm_translator.facade import RomSizeReport, VMTranslator
+from n2t.core.vm_translator.ir import VMCommand, VMParser
+from n2t.core.vm_translator.optimizer import VMPeepholeOptimizer
+from n2t.core.vm_translator.rom_report import RomReport
+from n2t.core.vm_translator.stack_instruction import TranslationData
 from n2t.infra.io import File, FileFormat
 
 
+@dataclass
+class VMRunReport:
+    steps: int = 0
+    seconds: float = 0.0
+    halted: bool = False
+    error: Optional[int] = None
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.steps / self.seconds if self.seconds else 0.0
+
+
 @dataclass
 class VmProgram:
     path: Path
     translator: IVMTranslator = field(default_factory=VMTranslator.create)
+    optimizer: Optional[VMPeepholeOptimizer] = None
+    jobs: int = 1
+    prune: bool = False
+    dead_functions: Optional[DeadFunctionReport] = None
+    use_cache: bool = True
+    cache: Optional[TranslationCache] = None
+    rom_report: bool = False
+    emulator: Optional[VMEmulator] = None
+    profiler: Optional[VMProfiler] = None
 
     @classmethod
-    def load_from(cls, file_or_directory_name: str) -> VmProgram:
-        return cls(Path(file_or_directory_name))
+    def load_from(
+        cls,
+        file_or_directory_name: str,
+        optimize: bool = False,
+        shared_calls: bool = False,
+        shared_comparisons: bool = False,
+        jobs: int = 1,
+        prune: bool = False,
+        use_cache: bool = True,
+        tos_cache: bool = False,
+        rom_report: bool = False,
+    ) -> VmProgram:
+        optimizer = VMPeepholeOptimizer() if optimize else None
+        translator = VMTranslator(
+            translation_data=TranslationData(
+                shared_calls=shared_calls,
+                shared_comparisons=shared_comparisons,
+                tos_cache=tos_cache,
+            ),
+            optimizer=optimizer,
+        )
+        return cls(
+            Path(file_or_directory_name),
+            translator,
+            optimizer,
+            jobs,
+            prune,
+            use_cache=use_cache,
+            rom_report=rom_report,
+        )
 
     def translate(self) -> None:
         if self.path.is_dir():
             self._translate_directory()
         else:
             self._translate_file()
+        if self.rom_report:
+            report = self.translator.rom_report().to_dict()
+            self.rom_report_path().write_text(json.dumps(report, indent=2))
+
+    def run(
+        self,
+        max_steps: int = MAX_STEPS,
+        profile: bool = False,
+        native: bool = False,
+        jit_threshold: Optional[int] = None,
+    ) -> VMRunReport:
+        self.emulator = VMEmulator.create(self._vm_sources(), native, jit_threshold)
+        start = time.perf_counter()
+        if profile:
+            self.profiler = self.emulator.profile(max_steps)
+            self.folded_path().write_text("\n".join(self.profiler.folded()) + "\n")
+        else:
+            self.emulator.run(max_steps)
+        seconds = time.perf_counter() - start
+        return VMRunReport(
+            self.emulator.steps, seconds, self.emulator.halted, self.emulator.error
+        )
+
+    def compare_natives(self, max_steps: int = MAX_STEPS) -> List[NativeSpeedup]:
+        baseline = VMEmulator.create(self._vm_sources())
+        start = time.perf_counter()
+        profiler = baseline.profile(max_steps)
+        seconds_per_step = (time.perf_counter() - start) / max(baseline.steps, 1)
+        self.run(max_steps, native=True)
+        assert self.emulator is not None and self.emulator.native is not None
+        return self.emulator.native.speedups(profiler, seconds_per_step)
+
+    def folded_path(self) -> Path:
+        return self.asm_path().with_suffix(".folded")
+
+    def asm_path(self) -> Path:
+        if self.path.is_dir():
+            return self.path.joinpath(self.path.name + ".asm")
+        return FileFormat.asm.convert(self.path)
+
+    def rom_report_path(self) -> Path:
+        return self.asm_path().with_suffix(".rom.json")
 
     def _translate_directory(self) -> None:
-        asm_file = File(self.path.joinpath(self.path.name + ".asm"))
-        content = self.translator.translate_boot()
-        for path in self.path.iterdir():
-            if str(path).endswith(".vm"):
-                content = chain(
-                    content,
-                    self.translator.translate(
-                        self._iterate_file(path), path.name.removesuffix(".vm")
-                    ),
-                )
+        asm_file = File(self.asm_path())
+        sources = [
+            (
+                path.name.removesuffix(".vm"),
+                list(self.translator.parse(self._iterate_file(path))),
+            )
+            for path in self._vm_paths()
+        ]
+        if self.prune:
+            sources, self.dead_functions = self.translator.eliminate_dead_functions(
+                sources
+            )
+        cache_path = asm_file.path.with_name(f"{asm_file.path.name}.cache")
+        if self.use_cache:
+            self.cache = TranslationCache()
+            if cache_path.exists():
+                self.cache = TranslationCache.loads(cache_path.read_text())
+        content = chain(
+            self.translator.translate_boot(),
+            self.translator.translate_files(sources, self.jobs, self.cache),
+            self.translator.translate_runtime(),
+        )
         asm_file.save(content)
+        if self.cache is not None:
+            cache_path.write_text(self.cache.dumps())
 
     def _translate_file(self) -> None:
-        asm_file = File(FileFormat.asm.convert(self.path))
-        content = self.translator.translate(self, self.path.name.removesuffix(".vm"))
+        asm_file = File(self.asm_path())
+        content = chain(
+            self.translator.translate(self, self.path.name.removesuffix(".vm")),
+            self.translator.translate_runtime(),
+        )
         asm_file.save(content)
 
+    def _vm_sources(self) -> List[VMSource]:
+        return [
+            (
+                path.name.removesuffix(".vm"),
+                VMParser.parse_program(self._iterate_file(path)),
+            )
+            for path in self._vm_paths()
+        ]
+
+    def _vm_paths(self) -> List[Path]:
+        if not self.path.is_dir():
+            return [self.path]
+        return [path for path in sorted(self.path.iterdir()) if path.suffix == ".vm"]
+
     @classmethod
     def _iterate_file(cls, path: Path) -> Iterator[str]:
         yield from File(path).load()
@@ -54,5 +187,30 @@ class IVMTranslator(Protocol):  # pragma: no cover
     def translate_boot(self) -> Iterable[str]:
         pass
 
+    def translate_runtime(self) -> Iterable[str]:
+        pass
+
+    def parse(self, vm: Iterable[str]) -> Iterable[VMCommand]:
+        pass
+
     def translate(self, assembly: Iterable[str], file_name: str) -> Iterable[str]:
         pass
+
+    def translate_files(
+        self,
+        sources: List[VMSource],
+        jobs: int = 1,
+        cache: Optional[TranslationCache] = None,
+    ) -> Iterable[str]:
+        pass
+
+    def eliminate_dead_functions(
+        self, sources: List[VMSource]
+    ) -> Tuple[List[VMSource], DeadFunctionReport]:
+        pass
+
+    def size_report(self) -> RomSizeReport:
+        pass
+
+    def rom_report(self) -> RomReport:
+        pass
@@ -1,6 +1,22 @@
-from typer import Typer, echo
+from itertools import combinations
+from typing import Annotated, List, Optional, Set
 
-from n2t.infra import AsmProgram, HackProgram, JackProgram, VmProgram
+from typer import BadParameter, Exit, Option, Typer, echo
+
+from n2t.core.vm_emulator.constants import JIT_THRESHOLD, MAX_STEPS
+from n2t.infra import (
+    AsmProgram,
+    AssemblerEngine,
+    HackBatch,
+    HackFormat,
+    JackProgram,
+    VmProgram,
+)
+
+COMPATIBLE_OPTIONS: List[Set[str]] = [
+    {"--engine", "--optimize"},
+    {"--source-map", "--optimize"},
+]
 
 cli = Typer(
     name="Nand 2 Tetris Software",
@@ -10,23 +26,179 @@ cli = Typer(
 
 
 @cli.command("disassemble", no_args_is_help=True)
-def run_disassembler(hack_file: str) -> None:
+def run_disassembler(
+    hack_file: str,
+    hack_format: Annotated[HackFormat, Option("--format")] = HackFormat.text,
+    labels: bool = False,
+    jobs: int = 1,
+) -> None:
     echo(f"Disassembling {hack_file}")
-    HackProgram.load_from(hack_file).disassemble()
+    batch = HackBatch.load_from(hack_file, hack_format, labels)
+    for path, words in batch.disassemble(jobs):
+        if len(batch) > 1:
+            echo(f"  {path}: {words} words")
+    report = batch.report
+    echo(
+        f"Disassembled {report.words} words from {report.files} files "
+        f"in {report.seconds:.2f}s ({report.words_per_second:.0f} words/s)"
+    )
+    for path, message in report.failures:
+        echo(f"  {path}: failed with {message}")
+    if report.failures:
+        echo(f"Failed to disassemble {len(report.failures)} files")
+        raise Exit(code=1)
     echo("Done!")
 
 
 @cli.command("assemble", no_args_is_help=True)
-def run_assembler(assembly_file: str) -> None:
+def run_assembler(
+    assembly_file: str,
+    engine: Optional[AssemblerEngine] = None,
+    hack_format: Annotated[HackFormat, Option("--format")] = HackFormat.text,
+    incremental: bool = False,
+    source_map: bool = False,
+    optimize: bool = False,
+    jobs: int = 1,
+) -> None:
+    chosen = {
+        "--engine": engine is not None,
+        "--incremental": incremental,
+        "--source-map": source_map,
+        "--optimize": optimize,
+        "--jobs": jobs > 1,
+    }
+    _reject_conflicts([option for option, used in chosen.items() if used])
+    if optimize and engine not in (None, AssemblerEngine.compact):
+        raise BadParameter("--optimize requires --engine compact")
     echo(f"Assembling {assembly_file}")
-    AsmProgram.load_from(assembly_file).assemble()
+    program = AsmProgram.load_from(
+        assembly_file, engine or AssemblerEngine.classic, optimize, jobs
+    )
+    if source_map:
+        echo(f"Source map written to {program.assemble_with_source_map(hack_format)}")
+    elif incremental:
+        report = program.assemble_incrementally(hack_format)
+        if report.full_build:
+            echo("Variable allocation changed, rebuilt every chunk")
+        echo(f"Reused {report.reused_words} of {report.total_words} words")
+    else:
+        program.assemble(hack_format)
+    if program.optimizer is not None:
+        optimization = program.optimizer.report
+        if optimization.skipped:
+            echo("Optimization skipped: program jumps to fixed ROM addresses")
+        else:
+            echo(f"Peephole optimizer saved {optimization.saved} instructions")
     echo("Done!")
 
 
+def _reject_conflicts(options: List[str]) -> None:
+    for first, second in combinations(options, 2):
+        if {first, second} not in COMPATIBLE_OPTIONS:
+            raise BadParameter(f"{first} cannot be combined with {second}")
+
+
 @cli.command("translate_vm", no_args_is_help=True)
-def run_vm_translator(vm_file_or_directory: str) -> None:
+def run_vm_translator(
+    vm_file_or_directory: str,
+    optimize: bool = False,
+    shared_calls: bool = False,
+    shared_comparisons: bool = False,
+    jobs: int = 1,
+    prune: bool = False,
+    cache: bool = True,
+    tos_cache: bool = False,
+    rom_report: bool = False,
+) -> None:
     echo(f"Translating {vm_file_or_directory}")
-    VmProgram.load_from(vm_file_or_directory).translate()
+    program = VmProgram.load_from(
+        vm_file_or_directory,
+        optimize,
+        shared_calls,
+        shared_comparisons,
+        jobs,
+        prune,
+        cache,
+        tos_cache,
+        rom_report,
+    )
+    program.translate()
+    if program.cache is not None:
+        reused, total = program.cache.hits, program.cache.hits + program.cache.misses
+        echo(f"Reused {reused} of {total} translated files from cache")
+    if program.dead_functions is not None:
+        dead = program.dead_functions
+        for file_name, saved in dead.saved_bytes().items():
+            functions = len(dead.functions[file_name])
+            echo(f"  {file_name}: removed {functions} functions, saved {saved} bytes")
+        echo(f"Dead functions saved {sum(dead.saved_bytes().values())} bytes")
+    if shared_calls or shared_comparisons:
+        size = program.translator.size_report()
+        echo(
+            f"ROM size: {size.before} words inlined, {size.after} with shared routines"
+        )
+    if rom_report:
+        for line in program.translator.rom_report().table():
+            echo(line)
+        echo(f"ROM report saved to {program.rom_report_path()}")
+    if program.optimizer is not None:
+        optimization = program.optimizer.report
+        echo(
+            f"VM optimizer reduced {optimization.before} commands "
+            f"to {optimization.after}"
+        )
+    echo("Done!")
+
+
+@cli.command("run_vm", no_args_is_help=True)
+def run_vm(
+    vm_file_or_directory: str,
+    max_steps: int = MAX_STEPS,
+    profile: bool = False,
+    native: bool = False,
+    compare_natives: bool = False,
+    jit: bool = False,
+    jit_threshold: int = JIT_THRESHOLD,
+) -> None:
+    _reject_conflicts(
+        [
+            option
+            for option, used in {"--jit": jit, "--profile": profile}.items()
+            if used
+        ]
+    )
+    echo(f"Running {vm_file_or_directory}")
+    program = VmProgram.load_from(vm_file_or_directory)
+    if compare_natives:
+        for speedup in program.compare_natives(max_steps):
+            echo(
+                f"  {speedup.name}: {speedup.calls} calls, "
+                f"{speedup.vm_seconds * 1000:.2f}ms interpreted, "
+                f"{speedup.native_seconds * 1000:.2f}ms native "
+                f"({speedup.speedup:.1f}x)"
+            )
+        echo("Done!")
+        return
+    report = program.run(max_steps, profile, native, jit_threshold if jit else None)
+    status = "halted" if report.halted else "stopped at the step limit"
+    if report.error is not None:
+        status = f"halted by Sys.error {report.error}"
+    echo(
+        f"Executed {report.steps} VM commands in {report.seconds:.2f}s "
+        f"({report.cycles_per_second:.0f} cycles/s), {status}"
+    )
+    if program.profiler is not None:
+        for line in program.profiler.table():
+            echo(line)
+        echo(f"Folded stacks saved to {program.folded_path()}")
+    if program.emulator is not None and program.emulator.jit is not None:
+        stats = program.emulator.jit.stats
+        compiled = stats.compiled_steps / report.steps if report.steps else 0.0
+        echo(
+            f"JIT compiled {stats.tier_ups} functions in "
+            f"{stats.compile_seconds * 1000:.2f}ms, "
+            f"{compiled:.0%} of commands ran compiled"
+        )
     echo("Done!")
 
 
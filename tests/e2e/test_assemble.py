@@ -1,8 +1,12 @@
 import filecmp
 from pathlib import Path
+from typing import Any, Dict
 
 import pytest
+from typer import BadParameter
 
+from n2t.infra import AssemblerEngine, HackFormat
+from n2t.infra.io import BinaryFile, File
 from n2t.runner.cli import run_assembler
 
 _TEST_PROGRAMS = ["empty", "addL", "maxL", "rectL", "pongL", "max", "rect", "pong"]
@@ -20,3 +24,64 @@ def test_should_assemble(program: str, asm_directory: Path) -> None:
         f1=str(asm_directory.joinpath(f"{program}.cmp")),
         f2=str(asm_directory.joinpath(f"{program}.hack")),
     )
+
+
+@pytest.mark.parametrize("engine", [AssemblerEngine.streaming, AssemblerEngine.compact])
+@pytest.mark.parametrize("program", _TEST_PROGRAMS)
+def test_should_assemble_with_engine(
+    program: str, engine: AssemblerEngine, asm_directory: Path
+) -> None:
+    asm_file = str(asm_directory.joinpath(f"{program}.asm"))
+
+    run_assembler(asm_file, engine=engine)
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(asm_directory.joinpath(f"{program}.cmp")),
+        f2=str(asm_directory.joinpath(f"{program}.hack")),
+    )
+
+
+@pytest.mark.parametrize("program", _TEST_PROGRAMS)
+def test_should_assemble_binary(program: str, asm_directory: Path) -> None:
+    asm_file = str(asm_directory.joinpath(f"{program}.asm"))
+
+    run_assembler(asm_file, hack_format=HackFormat.binary)
+
+    with BinaryFile(asm_directory.joinpath(f"{program}.hack")).load() as words:
+        hack = [format(word, "016b") for word in words]
+    assert hack == list(File(asm_directory.joinpath(f"{program}.cmp")).load())
+
+
+@pytest.mark.parametrize("program", _TEST_PROGRAMS)
+def test_should_assemble_in_parallel(program: str, asm_directory: Path) -> None:
+    asm_file = str(asm_directory.joinpath(f"{program}.asm"))
+
+    run_assembler(asm_file, jobs=3)
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(asm_directory.joinpath(f"{program}.cmp")),
+        f2=str(asm_directory.joinpath(f"{program}.hack")),
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"incremental": True, "optimize": True},
+        {"incremental": True, "source_map": True},
+        {"source_map": True, "engine": AssemblerEngine.compact},
+        {"optimize": True, "engine": AssemblerEngine.streaming},
+        {"jobs": 2, "optimize": True},
+        {"jobs": 2, "incremental": True},
+        {"jobs": 2, "source_map": True},
+    ],
+)
+def test_should_reject_conflicting_options(
+    options: Dict[str, Any], asm_directory: Path
+) -> None:
+    asm_file = str(asm_directory.joinpath("max.asm"))
+
+    with pytest.raises(BadParameter):
+        run_assembler(asm_file, **options)
@@ -1,8 +1,12 @@
 import filecmp
+from array import array
 from pathlib import Path
 
 import pytest
 
+from n2t.core import Assembler
+from n2t.infra import HackBatch, HackFormat
+from n2t.infra.io import BinaryFile, File
 from n2t.runner.cli import run_disassembler
 
 _TEST_PROGRAMS = ["empty", "wrong", "add", "max", "rect", "pong"]
@@ -19,3 +23,87 @@ def test_should_disassemble(program: str, hack_directory: Path) -> None:
         f1=str(hack_directory.joinpath(f"{program}.cmp")),
         f2=str(hack_directory.joinpath(f"{program}.asm")),
     )
+
+
+@pytest.mark.parametrize("program", ["empty", "add", "max", "rect", "pong"])
+def test_should_disassemble_binary(
+    program: str, hack_directory: Path, tmp_path: Path
+) -> None:
+    text = File(hack_directory.joinpath(f"{program}.hack")).load()
+    words = array("H", (int(word, base=2) for word in text))
+    hack_file = tmp_path.joinpath(f"{program}.hack")
+    BinaryFile(hack_file).save(words)
+
+    run_disassembler(str(hack_file), hack_format=HackFormat.binary)
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(hack_directory.joinpath(f"{program}.cmp")),
+        f2=str(tmp_path.joinpath(f"{program}.asm")),
+    )
+
+
+@pytest.mark.parametrize("program", ["max", "rect", "pong"])
+def test_should_disassemble_with_labels(
+    program: str, hack_directory: Path, tmp_path: Path
+) -> None:
+    hack_file = tmp_path.joinpath(f"{program}.hack")
+    hack_file.write_bytes(hack_directory.joinpath(f"{program}.hack").read_bytes())
+
+    run_disassembler(str(hack_file), labels=True)
+
+    assembly = File(tmp_path.joinpath(f"{program}.asm")).load()
+    words = Assembler.create().assemble(assembly)
+    assert list(words) == list(File(hack_directory.joinpath(f"{program}.hack")).load())
+    assert tmp_path.joinpath(f"{program}.hack.cfg").exists()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_should_disassemble_directory(
+    jobs: int, hack_directory: Path, tmp_path: Path
+) -> None:
+    programs = ["add", "max", "rect", "pong"]
+    for program in programs:
+        source = hack_directory.joinpath(f"{program}.hack")
+        tmp_path.joinpath(f"{program}.hack").write_bytes(source.read_bytes())
+
+    run_disassembler(str(tmp_path), jobs=jobs)
+
+    for program in programs:
+        assert filecmp.cmp(
+            shallow=False,
+            f1=str(hack_directory.joinpath(f"{program}.cmp")),
+            f2=str(tmp_path.joinpath(f"{program}.asm")),
+        )
+
+
+def test_should_disassemble_glob(hack_directory: Path, tmp_path: Path) -> None:
+    for program in ["add", "max", "rect"]:
+        source = hack_directory.joinpath(f"{program}.hack")
+        tmp_path.joinpath(f"{program}.hack").write_bytes(source.read_bytes())
+
+    batch = HackBatch.load_from(str(tmp_path.joinpath("[am]*.hack")))
+    results = dict(batch.disassemble())
+
+    assert sorted(path.name for path in results) == ["add.hack", "max.hack"]
+    assert batch.report.files == 2
+    assert batch.report.words == sum(results.values())
+    assert not tmp_path.joinpath("rect.asm").exists()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_should_report_failures_per_file(
+    jobs: int, hack_directory: Path, tmp_path: Path
+) -> None:
+    source = hack_directory.joinpath("add.hack")
+    tmp_path.joinpath("add.hack").write_bytes(source.read_bytes())
+    tmp_path.joinpath("bad.hack").write_text("0000000000000002\n")
+    tmp_path.joinpath("notes.txt").write_text("not a rom\n")
+
+    batch = HackBatch.load_from(str(tmp_path.joinpath("*")), labels=True)
+    results = dict(batch.disassemble(jobs))
+
+    assert [path.name for path in batch.paths] == ["add.hack", "bad.hack"]
+    assert [path.name for path in results] == ["add.hack"]
+    assert [path.name for path, _ in batch.report.failures] == ["bad.hack"]
+    assert batch.report.failures[0][1].startswith("ValueError")
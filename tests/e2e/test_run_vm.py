@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+from typer import BadParameter
+
+from n2t.infra import VmProgram
+from n2t.runner.cli import run_vm
+from tests.e2e.test_translate_vm import _PROGRAM
+
+
+def _write_program(directory: Path) -> None:
+    for name, vm in _PROGRAM.items():
+        directory.joinpath(f"{name}.vm").write_text(vm)
+
+
+def test_should_run_vm_directory(tmp_path: Path) -> None:
+    _write_program(tmp_path)
+    program = VmProgram.load_from(str(tmp_path))
+
+    report = program.run()
+
+    assert report.halted and report.steps > 0
+    assert program.emulator is not None
+    assert program.emulator.ram[16:20] == [5, 0xFFFF, 9, 0xFFFF]
+
+
+def test_should_report_cycles(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    _write_program(tmp_path)
+
+    run_vm(str(tmp_path), max_steps=10)
+
+    output = capsys.readouterr().out
+    assert "Executed 10 VM commands" in output and "step limit" in output
+
+
+def test_should_report_jit_metrics(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    _write_program(tmp_path)
+
+    run_vm(str(tmp_path), jit=True, jit_threshold=1)
+
+    output = capsys.readouterr().out
+    assert "halted" in output and "JIT compiled" in output
+
+
+def test_should_reject_profiling_jit_code(tmp_path: Path) -> None:
+    _write_program(tmp_path)
+
+    with pytest.raises(BadParameter, match="--jit cannot be combined with --profile"):
+        run_vm(str(tmp_path), profile=True, jit=True)
+
+
+def test_should_save_folded_stacks(tmp_path: Path) -> None:
+    _write_program(tmp_path)
+    program = VmProgram.load_from(str(tmp_path))
+
+    program.run(profile=True)
+
+    folded = program.folded_path().read_text().splitlines()
+    assert folded == ["Sys.init 1"]
+    assert program.profiler is not None
+    calls = {profile.name: profile.calls for profile in program.profiler.report()}
+    assert calls == {"Main.main": 1, "Other.set": 1, "Sys.init": 1}
+
+
+_MULTIPLY = """
+function Math.multiply 1
+label LOOP
+push argument 1
+push constant 0
+eq
+if-goto DONE
+push local 0
+push argument 0
+add
+pop local 0
+push argument 1
+push constant 1
+sub
+pop argument 1
+goto LOOP
+label DONE
+push local 0
+return
+"""
+
+_SYS = """
+function Sys.init 0
+push constant 123
+push constant 45
+call Math.multiply 2
+pop static 0
+label END
+goto END
+"""
+
+
+def test_should_compare_native_os_functions(tmp_path: Path) -> None:
+    tmp_path.joinpath("Math.vm").write_text(_MULTIPLY)
+    tmp_path.joinpath("Sys.vm").write_text(_SYS)
+    program = VmProgram.load_from(str(tmp_path))
+
+    speedups = program.compare_natives()
+
+    assert program.emulator is not None and program.emulator.ram[16] == 123 * 45
+    assert [(speedup.name, speedup.calls) for speedup in speedups] == [
+        ("Math.multiply", 1)
+    ]
+    assert speedups[0].vm_seconds > 0 and speedups[0].native_seconds > 0
+
+
+def test_should_report_native_sys_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    divide = _SYS.replace("45", "0").replace("Math.multiply", "Math.divide")
+    tmp_path.joinpath("Sys.vm").write_text(divide)
+
+    run_vm(str(tmp_path), native=True)
+
+    assert "halted by Sys.error 3" in capsys.readouterr().out
@@ -0,0 +1,173 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from n2t.core import Assembler
+from n2t.core.vm_translator import cache as translation_cache
+from n2t.core.vm_translator.cache import CACHE_VERSION, TranslationCache
+from n2t.infra import VmProgram
+from n2t.infra.io import File
+from n2t.runner.cli import run_vm_translator
+from tests.unit.emulator import HackEmulator
+
+_PROGRAM: Dict[str, str] = {
+    "Sys": """
+function Sys.init 0
+call Main.main 0
+pop temp 0
+label END
+goto END
+""",
+    "Main": """
+function Main.main 0
+push constant 5
+pop static 0
+call Other.set 0
+pop temp 0
+push static 0
+push constant 5
+eq
+pop static 1
+push constant 0
+return
+""",
+    "Other": """
+function Other.set 0
+push constant 9
+pop static 0
+push static 0
+push constant 1
+gt
+pop static 1
+push constant 0
+return
+function Other.unused 1
+push constant 1
+pop local 0
+call Other.set 0
+return
+""",
+}
+
+
+def _translate(
+    directory: Path, jobs: int, prune: bool = False, cache: bool = True
+) -> List[str]:
+    directory.mkdir()
+    for name, vm in _PROGRAM.items():
+        directory.joinpath(f"{name}.vm").write_text(vm)
+
+    run_vm_translator(str(directory), jobs=jobs, prune=prune, cache=cache)
+
+    return list(File(directory.joinpath(f"{directory.name}.asm")).load())
+
+
+@pytest.mark.parametrize("prune", [False, True])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_should_translate_directory(jobs: int, prune: bool, tmp_path: Path) -> None:
+    assembly = _translate(tmp_path.joinpath("Program"), jobs, prune)
+
+    words = [int(word, base=2) for word in Assembler.create().assemble(assembly)]
+    emulator = HackEmulator(words)
+    emulator.run()
+
+    assert emulator.ram[16:20] == [5, 0xFFFF, 9, 0xFFFF]
+
+
+def test_should_translate_directory_reproducibly(tmp_path: Path) -> None:
+    serial = _translate(tmp_path.joinpath("Serial"), jobs=1)
+    parallel = _translate(tmp_path.joinpath("Parallel"), jobs=2)
+
+    assert serial == parallel
+
+
+def test_should_eliminate_dead_functions(tmp_path: Path) -> None:
+    program = VmProgram.load_from(str(tmp_path), prune=True)
+    for name, vm in _PROGRAM.items():
+        tmp_path.joinpath(f"{name}.vm").write_text(vm)
+    tmp_path.joinpath("Dead.vm").write_text("function Dead.code 0\npush constant 1\n")
+
+    program.translate()
+
+    assembly = tmp_path.joinpath(f"{tmp_path.name}.asm").read_text()
+    assert "(Other.set)" in assembly and "(Other.unused)" not in assembly
+    assert program.dead_functions is not None
+    assert program.dead_functions.functions == {
+        "Dead": ["Dead.code"],
+        "Other": ["Other.unused"],
+    }
+    assert program.dead_functions.saved_bytes()["Dead"] == 2 * 7
+
+
+def test_should_reuse_cached_translations(tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("Cached")
+    first = _translate(directory, jobs=1, cache=True)
+
+    program = VmProgram.load_from(str(directory), use_cache=True)
+    program.translate()
+    assert program.cache is not None and program.cache.hits == len(_PROGRAM)
+    assert list(File(directory.joinpath("Cached.asm")).load()) == first
+
+    directory.joinpath("Other.vm").write_text(_PROGRAM["Other"] + "push constant 2\n")
+    program = VmProgram.load_from(str(directory), use_cache=True)
+    program.translate()
+    assert program.cache is not None
+    assert (program.cache.hits, program.cache.misses) == (len(_PROGRAM) - 1, 1)
+
+
+def test_should_cache_by_default(tmp_path: Path) -> None:
+    _translate(tmp_path.joinpath("Cached"), jobs=1)
+
+    assert tmp_path.joinpath("Cached", "Cached.asm.cache").exists()
+
+
+def test_should_not_cache_when_disabled(tmp_path: Path) -> None:
+    _translate(tmp_path.joinpath("Plain"), jobs=1, cache=False)
+
+    assert not tmp_path.joinpath("Plain", "Plain.asm.cache").exists()
+
+
+@pytest.mark.parametrize(
+    "name, version", [("CACHE_VERSION", CACHE_VERSION + 1), ("__version__", "0.0.0")]
+)
+def test_should_drop_cache_from_other_translator_versions(
+    name: str, version: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = tmp_path.joinpath("Stale")
+    _translate(directory, jobs=1, cache=True)
+    text = directory.joinpath("Stale.asm.cache").read_text()
+    assert TranslationCache.loads(text).entries
+
+    monkeypatch.setattr(translation_cache, name, version)
+
+    assert not TranslationCache.loads(text).entries
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_should_report_rom_size_per_function(jobs: int, tmp_path: Path) -> None:
+    for name, vm in _PROGRAM.items():
+        tmp_path.joinpath(f"{name}.vm").write_text(vm)
+
+    program = VmProgram.load_from(str(tmp_path), jobs=jobs, rom_report=True)
+    program.translate()
+
+    report = json.loads(program.rom_report_path().read_text())
+    assembly = File(program.asm_path()).load()
+    assert report["total"] == sum(1 for line in assembly if line and line[0] != "(")
+    assert report["headroom"] == 32768 - report["total"]
+    assert report["files"] == {
+        "Main": _size_of(report, "Main.main"),
+        "Other": _size_of(report, "Other.set") + _size_of(report, "Other.unused"),
+        "Sys": _size_of(report, "Sys.init"),
+    }
+    sizes = [function["instructions"] for function in report["functions"]]
+    assert sizes == sorted(sizes, reverse=True)
+    main = next(f for f in report["functions"] if f["function"] == "Main.main")
+    assert set(main["categories"]) == {"memory", "function", "comparison"}
+
+
+def _size_of(report: Dict[str, Any], name: str) -> int:
+    functions = report["functions"]
+    return next(f["instructions"] for f in functions if f["function"] == name)
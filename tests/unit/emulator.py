@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+WORD_MASK = 0xFFFF
+RAM_SIZE = 32768
+
+_COMPUTATIONS: Dict[int, Callable[[int, int, int], int]] = {
+    0b0101010: lambda d, a, m: 0,
+    0b0111111: lambda d, a, m: 1,
+    0b0111010: lambda d, a, m: -1,
+    0b0001100: lambda d, a, m: d,
+    0b0110000: lambda d, a, m: a,
+    0b1110000: lambda d, a, m: m,
+    0b0001101: lambda d, a, m: ~d,
+    0b0110001: lambda d, a, m: ~a,
+    0b1110001: lambda d, a, m: ~m,
+    0b0001111: lambda d, a, m: -d,
+    0b0110011: lambda d, a, m: -a,
+    0b1110011: lambda d, a, m: -m,
+    0b0011111: lambda d, a, m: d + 1,
+    0b0110111: lambda d, a, m: a + 1,
+    0b1110111: lambda d, a, m: m + 1,
+    0b0001110: lambda d, a, m: d - 1,
+    0b0110010: lambda d, a, m: a - 1,
+    0b1110010: lambda d, a, m: m - 1,
+    0b0000010: lambda d, a, m: d + a,
+    0b1000010: lambda d, a, m: d + m,
+    0b0010011: lambda d, a, m: d - a,
+    0b0000111: lambda d, a, m: a - d,
+    0b1010011: lambda d, a, m: d - m,
+    0b1000111: lambda d, a, m: m - d,
+    0b0000000: lambda d, a, m: d & a,
+    0b1000000: lambda d, a, m: d & m,
+    0b0010101: lambda d, a, m: d | a,
+    0b1010101: lambda d, a, m: d | m,
+}
+
+
+def _signed(value: int) -> int:
+    return value - 0x10000 if value & 0x8000 else value
+
+
+@dataclass
+class HackEmulator:
+    rom: Sequence[int]
+    ram: List[int] = field(default_factory=lambda: [0] * RAM_SIZE)
+    pc: int = 0
+    a: int = 0
+    d: int = 0
+
+    def run(self, max_steps: int = 1_000_000) -> int:
+        for step in range(max_steps):
+            if self.pc >= len(self.rom) or self._is_halted():
+                return step
+            self.step()
+        return max_steps
+
+    def step(self) -> None:
+        word = self.rom[self.pc]
+        if not word & 0x8000:
+            self.a = word
+            self.pc += 1
+            return
+
+        m = self.ram[self.a & 0x7FFF]
+        result = _COMPUTATIONS[(word >> 6) & 0x7F](self.d, self.a, m) & WORD_MASK
+        if word & 0b001000:
+            self.ram[self.a & 0x7FFF] = result
+        address = self.a
+        if word & 0b100000:
+            self.a = result
+        if word & 0b010000:
+            self.d = result
+
+        value = _signed(result)
+        jump = word & 0b111
+        if (
+            (jump & 0b100 and value < 0)
+            or (jump & 0b010 and value == 0)
+            or (jump & 0b001 and value > 0)
+        ):
+            self.pc = address
+        else:
+            self.pc += 1
+
+    def _is_halted(self) -> bool:
+        word = self.rom[self.pc]
+        return (
+            word & 0xE007 == 0xE007
+            and self.pc > 0
+            and self.rom[self.pc - 1] == self.pc - 1
+        )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from hypothesis.strategies import (
+    SearchStrategy,
+    builds,
+    composite,
+    integers,
+    sampled_from,
+    text,
+)
+
+from n2t.core.disassembler.entities import Computation, Destination, Jump
+
+_BITS = sampled_from("01")
+
+
+@dataclass(frozen=True)
+class HackAssemblyPair:
+    hack: str
+    assembly: str
+
+
+def short_words() -> SearchStrategy[str]:
+    return text(_BITS, max_size=15)
+
+
+def long_words() -> SearchStrategy[str]:
+    return text(_BITS, min_size=17, max_size=64)
+
+
+@composite
+def gibberish_words(draw) -> str:  # type: ignore[no-untyped-def]
+    word = draw(text(min_size=16, max_size=16))
+    if not word.strip("01"):
+        word = word[:-1] + draw(text(min_size=1, max_size=1).filter(str.isalpha))
+    return word
+
+
+def hack_words() -> SearchStrategy[str]:
+    return text(_BITS, min_size=16, max_size=16)
+
+
+def a_instructions() -> SearchStrategy[HackAssemblyPair]:
+    return builds(
+        lambda address: HackAssemblyPair(format(address, "016b"), f"@{address}"),
+        integers(min_value=0, max_value=2**15 - 1),
+    )
+
+
+def c_instructions() -> SearchStrategy[HackAssemblyPair]:
+    return builds(
+        lambda comp, dest, jump: HackAssemblyPair(
+            f"111{comp}{dest}{jump}",
+            f"{Destination.MAP[dest]}{Computation.MAP[comp]}{Jump.MAP[jump]}",
+        ),
+        sampled_from(sorted(Computation.MAP)),
+        sampled_from(sorted(Destination.MAP)),
+        sampled_from(sorted(Jump.MAP)),
+    )
@@ -0,0 +1,252 @@
+from array import array
+from typing import Any, Callable, List
+
+import pytest
+
+from n2t.core import (
+    Assembler,
+    AssemblyCache,
+    CompactAssembler,
+    IncrementalAssembler,
+    ParallelAssembler,
+    PeepholeOptimizer,
+    StreamingAssembler,
+)
+from n2t.core.assembler import SourceLocation, SourceMapView
+from n2t.core.assembler.constants import C_INSTRUCTION_TABLE
+from n2t.core.assembler.instruction import CInstruction
+from n2t.core.assembler.ir import IREncoder
+from n2t.core.assembler.vectorized import HackTextRenderer
+from n2t.core.vm_translator.facade import VMTranslator
+from tests.unit.emulator import HackEmulator
+from tests.unit.test_vm_translator import _FUNCTIONS
+
+
+@pytest.mark.parametrize(
+    "instruction, bits",
+    [
+        ("A=M-1", "1111110010100000"),
+        ("M=D", "1110001100001000"),
+        ("D;JNE", "1110001100000101"),
+        ("AMD=D|M;JMP", "1111010101111111"),
+        ("0;JMP", "1110101010000111"),
+    ],
+)
+def test_should_encode_c_instruction(instruction: str, bits: str) -> None:
+    assert CInstruction(instruction).get_bits() == bits
+    assert CInstruction.encode(instruction) == int(bits, base=2)
+
+
+def test_should_cover_every_c_instruction_spelling() -> None:
+    assert len(C_INSTRUCTION_TABLE) == 28 * 8 * 8
+
+
+@pytest.mark.parametrize("instruction", ["M=M+D", "D;JUMP", "X=1", "D=M;"])
+def test_should_reject_unknown_c_instruction(instruction: str) -> None:
+    with pytest.raises(ValueError, match="Unknown C-instruction"):
+        CInstruction(instruction).get_bits()
+
+
+ENGINES: List[Callable[[], Any]] = [
+    Assembler.create,
+    StreamingAssembler.create,
+    CompactAssembler.create,
+    lambda: CompactAssembler(encoder=IREncoder()),
+    lambda: IncrementalAssembler.create(AssemblyCache()),
+    lambda: ParallelAssembler.create(2),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("constant", ["32768", "65536", "100000"])
+def test_should_reject_out_of_range_constants(
+    engine: Callable[[], Any], constant: str
+) -> None:
+    with pytest.raises(ValueError, match="out of range"):
+        engine().assemble_words(["@1", f"@{constant}", "D=A"])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_should_reject_duplicate_labels(engine: Callable[[], Any]) -> None:
+    assembly = ["(LOOP)", "@LOOP", "0;JMP", *["D=A"] * 100, "(LOOP)", "@LOOP"]
+
+    with pytest.raises(ValueError, match="Duplicate label <LOOP>"):
+        engine().assemble_words(assembly)
+
+
+def test_should_render_words_as_hack_text() -> None:
+    words = array("H", [0, 1, 0x8000, 0xFFFF, 0b1110001100000101])
+
+    text = HackTextRenderer.render(words)
+
+    assert text.decode("ascii").splitlines() == [f"{word:016b}" for word in words]
+
+
+def test_should_reuse_unchanged_chunks_incrementally() -> None:
+    program = [f"@R{index % 16}\nD=M\n@{index}\nD=D+A\n@R0\nM=D" for index in range(64)]
+    assembly = "\n".join(program).splitlines()
+    assembler = IncrementalAssembler.create(AssemblyCache())
+    first = assembler.assemble_words(assembly)
+
+    assembly[100] = "D=D-A"
+    cache = AssemblyCache.loads(assembler.cache.dumps())
+    assembler = IncrementalAssembler.create(cache)
+    second = assembler.assemble_words(assembly)
+
+    assert list(second) == list(CompactAssembler.create().assemble_words(assembly))
+    assert list(second) != list(first)
+    assert 0 < assembler.report.reused_words < assembler.report.total_words
+    assert not assembler.report.full_build
+
+
+def test_should_rebuild_everything_when_variables_move() -> None:
+    assembly = ["@first", "M=1", "@second", "M=1"] * 20
+    assembler = IncrementalAssembler.create(AssemblyCache())
+    assembler.assemble_words(assembly)
+
+    assembler.assemble_words(["@second", "M=0"] + assembly)
+
+    assert assembler.report.full_build
+    assert assembler.report.reused_words == 0
+
+
+def test_should_map_rom_addresses_to_source_lines() -> None:
+    assembly = ["// counts down", "@10", "D=A", "(LOOP)", "", "D=D-1 // step", "@LOOP"]
+    assembly += ["D;JGT"]
+
+    words, source_map = CompactAssembler.create().assemble_mapped(assembly, "a.asm")
+    view = SourceMapView(memoryview(source_map.to_bytes()))
+
+    assert len(view) == len(words) == 5
+    assert [view.lookup(address).line for address in range(5)] == [2, 3, 6, 7, 8]
+    assert view.lookup(0) == SourceLocation("a.asm", 2)
+    assert dict(view.labels()) == {"LOOP": 2}
+    with pytest.raises(IndexError):
+        view.lookup(5)
+
+
+_REDUNDANT_ASSEMBLY = """
+@256
+D=A
+@SP
+M=D
+@7
+D=A
+@SP
+A=M
+M=D
+@SP
+M=M+1
+@SP
+M=M-1
+A=M
+D=M
+@SP
+M=M-1
+@SP
+AM=M+1
+M=D+1
+@END
+0;JMP
+@SP
+M=0
+(END)
+@END
+0;JMP
+""".split()
+
+
+def test_should_drop_redundant_instructions() -> None:
+    optimizer = PeepholeOptimizer()
+
+    words = CompactAssembler(optimizer=optimizer).assemble_words(_REDUNDANT_ASSEMBLY)
+
+    assert optimizer.report.redundant_loads == 2
+    assert optimizer.report.fused_pairs == 2
+    assert optimizer.report.dead_instructions == 2
+    assert len(words) == len(_REDUNDANT_ASSEMBLY) - 1 - optimizer.report.saved
+
+
+def test_should_preserve_semantics_when_optimizing() -> None:
+    plain = CompactAssembler.create().assemble_words(_REDUNDANT_ASSEMBLY)
+    optimized = CompactAssembler(optimizer=PeepholeOptimizer()).assemble_words(
+        _REDUNDANT_ASSEMBLY
+    )
+
+    expected, actual = HackEmulator(plain), HackEmulator(optimized)
+    expected.run()
+    actual.run()
+
+    assert actual.ram == expected.ram
+    assert actual.ram[0] == 256 and actual.ram[256] == 8
+
+
+@pytest.mark.parametrize(
+    "assembly",
+    [
+        ["@5", "D=A", "@5", "D;JGT", "0;JMP", "@1"],
+        ["@R0", "0;JMP", "@1"],
+        ["@KBD", "D;JEQ", "@1"],
+    ],
+)
+def test_should_not_optimize_jumps_to_non_labels(assembly: List[str]) -> None:
+    optimizer = PeepholeOptimizer()
+
+    words = CompactAssembler(optimizer=optimizer).assemble_words(assembly)
+
+    assert optimizer.report.skipped
+    assert len(words) == len(assembly)
+
+
+def test_should_optimize_indirect_returns_through_labels() -> None:
+    assembly = """
+@RET
+D=A
+@R13
+M=D
+@SUB
+0;JMP
+(RET)
+@R14
+M=1
+(END)
+@END
+0;JMP
+@R14
+M=0
+(SUB)
+@R13
+A=M
+0;JMP
+""".split()
+    optimizer = PeepholeOptimizer()
+
+    emulator = HackEmulator(
+        CompactAssembler(optimizer=optimizer).assemble_words(assembly)
+    )
+    emulator.run()
+
+    assert not optimizer.report.skipped and optimizer.report.saved == 2
+    assert emulator.ram[14] == 1
+
+
+def test_should_preserve_translated_vm_programs() -> None:
+    translator = VMTranslator.create()
+    vm = _FUNCTIONS.strip().splitlines()
+    assembly = "".join(
+        [*translator.translate_boot(), *translator.translate(vm, "Main")]
+    ).splitlines()
+    optimizer = PeepholeOptimizer()
+
+    plain = HackEmulator(CompactAssembler.create().assemble_words(assembly))
+    optimized = HackEmulator(
+        CompactAssembler(optimizer=optimizer).assemble_words(assembly)
+    )
+    plain.run()
+    optimized.run()
+
+    assert optimizer.report.saved > 0
+    assert len(optimized.rom) == len(plain.rom) - optimizer.report.saved
+    assert optimized.ram[:13] == plain.ram[:13]
+    assert optimized.ram[16:256] == plain.ram[16:256]
+    assert optimized.ram[16:18] == [8, 7]
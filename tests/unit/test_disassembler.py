@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from array import array
+
 from hypothesis import given
 from hypothesis.strategies import one_of
 
-from n2t.core.disassembler import Disassembler
+from n2t.core.assembler.instruction import CInstruction
+from n2t.core.disassembler import ControlFlowGraph, Disassembler
+from n2t.core.disassembler.entities import Word
 from tests.unit.strategies import (
     HackAssemblyPair,
     a_instructions,
@@ -47,3 +51,84 @@ def test_should_not_fail_fuzzing(hack_word: str) -> None:
     disassembler = Disassembler.create()
 
     disassembler.disassemble_one(word=hack_word)
+
+
+def test_should_match_chain_for_every_word() -> None:
+    disassembler = Disassembler.create()
+
+    for value in range(2**16):
+        word = format(value, "016b")
+        assert disassembler.disassemble_one(word) == disassembler.chain.disassemble(
+            Word(word)
+        )
+
+
+@given(instruction=one_of(a_instructions(), c_instructions()))
+def test_should_disassemble_integer_words(instruction: HackAssemblyPair) -> None:
+    disassembler = Disassembler.create()
+
+    (assembly,) = disassembler.disassemble_words([int(instruction.hack, base=2)])
+
+    assert assembly == instruction.assembly
+
+
+def _words(*assembly: str) -> array[int]:
+    return array(
+        "H",
+        (
+            int(word[1:]) if word.startswith("@") else CInstruction.encode(word)
+            for word in assembly
+        ),
+    )
+
+
+def test_should_split_program_into_basic_blocks() -> None:
+    words = _words("@0", "D=M", "@5", "D;JGT", "@1", "M=D", "@6", "0;JMP")
+
+    graph = ControlFlowGraph.build(words)
+
+    assert list(graph.targets) == [5, 6]
+    assert list(graph.blocks()) == [range(0, 4), range(4, 5), range(5, 6), range(6, 8)]
+    assert [list(graph.successors_of(block)) for block in range(len(graph))] == [
+        [2, 1],
+        [2],
+        [3],
+        [3],
+    ]
+    restored = ControlFlowGraph.from_bytes(graph.to_bytes())
+    assert restored == graph and restored.matches(words)
+
+
+def test_should_flag_indirect_jumps() -> None:
+    graph = ControlFlowGraph.build(_words("@13", "A=M", "0;JMP", "@0"))
+
+    assert graph.is_indirect(0)
+    assert list(graph.successors_of(0)) == []
+
+
+def test_should_label_jump_targets() -> None:
+    words = _words("@3", "D;JEQ", "@3", "D=A", "@0", "0;JMP")
+
+    graph = ControlFlowGraph.build(words)
+
+    assert list(Disassembler.create().disassemble_labeled(words, graph)) == [
+        "(L0)",
+        "@L3",
+        "D;JEQ",
+        "@3",
+        "(L3)",
+        "D=A",
+        "@L0",
+        "0;JMP",
+    ]
+
+
+def test_should_index_full_rom() -> None:
+    words = _words(*(["@16", "D=M", "@100", "D;JGT", "M=D+1"] * 6553))
+
+    graph = ControlFlowGraph.build(words)
+
+    assert len(graph) == 6553 + 2
+    assert list(graph.targets) == [100]
+    assert len(graph.successors) == 2 * 6553 + 1
+    assert list(graph.successors_of(0)) == [graph.block_of(100), 1]
@@ -0,0 +1,292 @@
+from typing import List, Optional
+
+import pytest
+
+from n2t.core import VMEmulator
+from n2t.core.vm_emulator.constants import RAM_SIZE
+from n2t.core.vm_emulator.natives import NativeOS, SysError
+from n2t.core.vm_translator.facade import VMTranslator
+from n2t.core.vm_translator.ir import VMParser
+from tests.unit.test_vm_translator import _FUNCTIONS, _run_program
+
+
+def _emulate(vm: str, file_name: str = "Main") -> VMEmulator:
+    emulator = VMEmulator.create([(file_name, VMParser.parse_program(vm.splitlines()))])
+    emulator.run()
+    return emulator
+
+
+def test_should_match_translated_program() -> None:
+    expected = _run_program(VMTranslator.create())
+
+    actual = _emulate(_FUNCTIONS)
+
+    assert actual.halted
+    assert actual.ram[16:18] == expected.ram[16:18] == [8, 7]
+    assert actual.ram[0] == expected.ram[0]
+
+
+def test_should_wrap_and_compare_signed_words() -> None:
+    vm = """
+push constant 32767
+push constant 1
+add
+pop static 0
+push constant 0
+push constant 1
+sub
+push constant 1
+lt
+pop static 1
+push static 0
+push constant 0
+gt
+pop static 2
+push constant 5
+neg
+not
+pop static 3
+"""
+    emulator = _emulate(vm)
+
+    assert emulator.ram[16:20] == [0x8000, 0xFFFF, 0, 4]
+    assert emulator.steps == 19
+
+
+def test_should_scope_labels_to_functions() -> None:
+    vm = """
+function Sys.init 0
+call Main.twice 0
+pop static 0
+label LOOP
+goto LOOP
+function Main.twice 1
+label LOOP
+push local 0
+push constant 1
+add
+pop local 0
+push local 0
+push constant 2
+lt
+if-goto LOOP
+push local 0
+return
+"""
+    emulator = _emulate(vm)
+
+    assert emulator.halted and emulator.ram[16] == 2
+
+
+def test_should_stop_at_step_limit() -> None:
+    vm = ["function Sys.init 0", "label SPIN", "push constant 1", "if-goto SPIN"]
+    emulator = VMEmulator.create([("Sys", VMParser.parse_program(vm))])
+
+    assert emulator.run(max_steps=100) == 100
+    assert not emulator.halted
+    assert emulator.ram[0] == 261
+
+
+def test_should_profile_calls_and_instructions() -> None:
+    emulator = VMEmulator.create(
+        [("Main", VMParser.parse_program(_FUNCTIONS.split("\n")))]
+    )
+
+    profiler = emulator.profile(sample_steps=50)
+
+    assert emulator.ram[16:18] == [8, 7] and emulator.profiler is None
+    profiles = {profile.name: profile for profile in profiler.report()}
+    assert profiles["Main.fibonacci"].calls == 25
+    assert profiles["Main.sum"].calls == 1
+    assert profiles["Sys.init"].inclusive == emulator.steps - 1
+    assert sum(profile.exclusive for profile in profiler.functions) == emulator.steps
+    folded = [line.rsplit(" ", 1) for line in profiler.folded()]
+    assert sum(int(count) for _, count in folded) == -(-emulator.steps // 50)
+    assert all(stack.startswith("Sys.init") for stack, _ in folded)
+
+
+@pytest.mark.parametrize(
+    "name, arguments, result",
+    [
+        ("Math.multiply", [300, 300], 90000 & 0xFFFF),
+        ("Math.multiply", [0xFFFF, 7], 0xFFF9),
+        ("Math.divide", [0xFFF9, 2], 0xFFFD),
+        ("Math.divide", [7, 0xFFFE], 0xFFFD),
+        ("Math.divide", [0x8000, 0xFFFF], 0x8000),
+    ],
+)
+def test_should_wrap_native_arithmetic(
+    name: str, arguments: List[int], result: int
+) -> None:
+    assert NativeOS([0] * RAM_SIZE).call(name, arguments) == result
+
+
+def test_should_reuse_freed_heap_blocks() -> None:
+    native = NativeOS([0] * RAM_SIZE)
+    blocks = [native.call("Memory.alloc", [size]) for size in (10, 20, 30)]
+
+    assert blocks == [2049, 2060, 2081]
+    native.call("Memory.deAlloc", [blocks[1]])
+    assert native.call("Memory.alloc", [5]) == blocks[1]
+    for block in [blocks[0], blocks[2], blocks[1]]:
+        native.call("Memory.deAlloc", [block])
+    assert native.free == [(2048, 16384 - 2048)]
+    with pytest.raises(SysError):
+        native.call("Memory.alloc", [16384])
+
+
+def test_should_run_os_calls_natively() -> None:
+    vm = """
+push constant 2
+call String.new 1
+push constant 72
+call String.appendChar 2
+push constant 105
+call String.appendChar 2
+pop static 0
+push static 0
+call String.length 1
+push constant 3
+call Math.multiply 2
+push constant 2
+call Math.divide 2
+pop static 1
+"""
+    emulator = VMEmulator.create(
+        [("Main", VMParser.parse_program(vm.splitlines()))], native=True
+    )
+    emulator.run()
+
+    this = emulator.ram[16]
+    chars = emulator.ram[this]
+    assert emulator.ram[chars : chars + 2] == [72, 105]
+    assert emulator.ram[17] == 3 and emulator.ram[0] == 256
+    assert emulator.native is not None
+    assert emulator.native.stats["String.appendChar"].calls == 2
+
+
+_NESTED_CALLS = """
+function Sys.init 1
+label LOOP
+push local 0
+push constant 20
+lt
+not
+if-goto DONE
+push local 0
+call Main.twice 1
+pop static 0
+push local 0
+call Main.id 1
+call Main.id 1
+pop static 1
+push local 0
+push constant 1
+add
+pop local 0
+goto LOOP
+label DONE
+goto DONE
+function Main.twice 0
+push argument 0
+call Main.id 1
+return
+function Main.id 0
+push argument 0
+return
+"""
+
+
+@pytest.mark.parametrize("threshold", [1, 5])
+def test_should_not_enter_compiled_code_at_calls_and_returns(threshold: int) -> None:
+    sources = [("Main", VMParser.parse_program(_NESTED_CALLS.split("\n")))]
+    interpreted = VMEmulator.create(sources)
+    interpreted.run(5000)
+
+    compiled = VMEmulator.create(sources, jit_threshold=threshold)
+
+    assert compiled.run(5000) == interpreted.steps
+    assert compiled.halted and compiled.ram[16:18] == interpreted.ram[16:18] == [19, 19]
+    assert compiled.jit is not None
+    assert "Main.twice" in compiled.jit.stats.functions
+
+
+@pytest.mark.parametrize("threshold", [1, 3])
+def test_should_match_interpreter_after_tier_up(threshold: int) -> None:
+    sources = [("Main", VMParser.parse_program(_FUNCTIONS.split("\n")))]
+    interpreted = VMEmulator.create(sources)
+    interpreted.run()
+
+    compiled = VMEmulator.create(sources, jit_threshold=threshold)
+    compiled.run()
+
+    live = interpreted.ram[0]
+    assert compiled.halted and compiled.ram[:live] == interpreted.ram[:live]
+    assert compiled.steps == interpreted.steps
+    assert compiled.jit is not None
+    stats = compiled.jit.stats
+    assert "Main.fibonacci" in stats.functions
+    assert stats.tier_ups == len(stats.functions) and stats.compile_seconds > 0
+    assert 0 < stats.compiled_steps < compiled.steps
+
+
+def test_should_stop_compiled_loops_at_step_limit() -> None:
+    vm = ["function Sys.init 0", "label SPIN", "push constant 1", "if-goto SPIN"]
+    emulator = VMEmulator.create([("Sys", VMParser.parse_program(vm))], jit_threshold=1)
+
+    assert emulator.run(max_steps=100) >= 100
+    assert not emulator.halted
+    assert emulator.ram[0] == 261
+
+
+@pytest.mark.parametrize("threshold", [None, 1])
+def test_should_halt_on_native_sys_error(threshold: Optional[int]) -> None:
+    vm = """
+function Sys.init 0
+push constant 7
+push constant 0
+call Math.divide 2
+pop static 0
+push constant 1
+pop static 1
+label END
+goto END
+"""
+    emulator = VMEmulator.create(
+        [("Sys", VMParser.parse_program(vm.splitlines()))],
+        native=True,
+        jit_threshold=threshold,
+    )
+    emulator.run()
+
+    assert emulator.halted and emulator.error == 3
+    assert emulator.ram[17] == 0
+
+
+def test_should_run_whole_string_class_natively() -> None:
+    vm = """
+push constant 6
+call String.new 1
+pop static 0
+push static 0
+push constant 65413
+call String.setInt 2
+pop temp 0
+push static 0
+call String.intValue 1
+pop static 1
+push static 0
+call String.length 1
+pop static 2
+call String.newLine 0
+pop static 3
+"""
+    emulator = VMEmulator.create(
+        [("Main", VMParser.parse_program(vm.splitlines()))], native=True
+    )
+    emulator.run()
+
+    chars = emulator.ram[emulator.ram[16]]
+    assert emulator.ram[chars : chars + 4] == [ord(char) for char in "-123"]
+    assert emulator.ram[17:20] == [65413, 4, 128]
+    assert emulator.image.natives.count("String.setInt") == 1
@@ -0,0 +1,276 @@
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler
+from n2t.core.vm_translator.cache import FileTranslation, TranslationCache
+from n2t.core.vm_translator.facade import VMTranslator
+from n2t.core.vm_translator.ir import Opcode, VMParser
+from n2t.core.vm_translator.optimizer import VMPeepholeOptimizer
+from n2t.core.vm_translator.stack_instruction import TranslationData
+from tests.unit.emulator import HackEmulator
+
+_HALT = ["(HALT)", "@HALT", "0;JMP"]
+_SEGMENTS = {0: 256, 1: 300, 2: 400, 3: 3000, 4: 3010}
+_OBSERVED = [range(0, 16), range(16, 256), range(300, 310), range(400, 410)]
+
+_PROGRAM = """
+push constant 3
+push constant 4
+add
+pop local 0
+push constant 10
+pop local 1
+label LOOP
+push local 1
+push constant 1
+sub
+pop local 1
+push local 1
+push constant 0
+gt
+not
+if-goto DONE
+push local 0
+push local 1
+add
+pop local 0
+goto LOOP
+label DONE
+push local 0
+pop static 3
+push static 3
+pop temp 2
+push temp 2
+pop pointer 0
+push pointer 0
+pop argument 1
+push argument 1
+pop this 2
+push constant 5
+not
+not
+neg
+neg
+push constant 5
+eq
+if-goto EQUAL
+push constant 99
+pop local 2
+label EQUAL
+push constant 1
+push constant 2
+sub
+push constant 6
+push constant 3
+and
+push constant 8
+or
+"""
+
+
+def _run(translator: VMTranslator) -> HackEmulator:
+    vm = _PROGRAM.strip().splitlines()
+    assembly = "".join(translator.translate(vm, "Test")).splitlines() + _HALT
+    words = [int(word, base=2) for word in Assembler.create().assemble(assembly)]
+    emulator = HackEmulator(words)
+    for address, value in _SEGMENTS.items():
+        emulator.ram[address] = value
+    emulator.run()
+    return emulator
+
+
+def _observe(emulator: HackEmulator) -> List[int]:
+    stack = range(256, emulator.ram[0])
+    return [emulator.ram[address] for part in [*_OBSERVED, stack] for address in part]
+
+
+def test_should_preserve_semantics_when_optimizing_vm() -> None:
+    optimizer = VMPeepholeOptimizer()
+
+    expected = _run(VMTranslator.create())
+    actual = _run(VMTranslator(optimizer=optimizer))
+
+    assert _observe(actual) == _observe(expected)
+    assert actual.ram[0] == 258 and actual.ram[300] == 52
+    assert optimizer.report.folded_constants == 3
+    assert optimizer.report.fused_branches == 2
+    assert optimizer.report.removed_negations == 3
+    assert optimizer.report.after < optimizer.report.before
+
+
+def test_should_shrink_translated_code() -> None:
+    vm = _PROGRAM.strip().splitlines()
+
+    plain = "".join(VMTranslator.create().translate(vm, "Test")).splitlines()
+    optimized = VMTranslator(optimizer=VMPeepholeOptimizer()).translate(vm, "Test")
+
+    assert len("".join(optimized).splitlines()) < len(plain) * 2 // 3
+
+
+_FUNCTIONS = """
+function Sys.init 0
+push constant 6
+call Main.fibonacci 1
+pop static 0
+push constant 3
+push constant 4
+call Main.sum 2
+pop static 1
+label END
+goto END
+function Main.fibonacci 0
+push argument 0
+push constant 2
+lt
+if-goto BASE
+push argument 0
+push constant 1
+sub
+call Main.fibonacci 1
+push argument 0
+push constant 2
+sub
+call Main.fibonacci 1
+add
+return
+label BASE
+push argument 0
+return
+function Main.sum 1
+push argument 0
+push argument 1
+add
+pop local 0
+push local 0
+return
+"""
+
+
+def _run_program(translator: VMTranslator) -> HackEmulator:
+    vm = _FUNCTIONS.strip().splitlines()
+    content = [
+        *translator.translate_boot(),
+        *translator.translate(vm, "Main"),
+        *translator.translate_runtime(),
+    ]
+    assembly = "".join(content).splitlines()
+    words = [int(word, base=2) for word in Assembler.create().assemble(assembly)]
+    emulator = HackEmulator(words)
+    emulator.run()
+    return emulator
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        TranslationData(shared_calls=True),
+        TranslationData(shared_comparisons=True),
+        TranslationData(shared_calls=True, shared_comparisons=True),
+    ],
+)
+def test_should_share_runtime_routines(data: TranslationData) -> None:
+    plain = VMTranslator.create()
+    shared = VMTranslator(translation_data=data)
+
+    expected, actual = _run_program(plain), _run_program(shared)
+
+    assert actual.ram[:13] == expected.ram[:13]
+    assert actual.ram[16:256] == expected.ram[16:256]
+    assert actual.ram[16:18] == [8, 7]
+    report = shared.size_report()
+    assert report.before == plain.size_report().after
+    assert report.after < report.before or not data.shared_calls
+
+
+@pytest.mark.parametrize("data", [TranslationData(), TranslationData(tos_cache=True)])
+def test_should_not_emit_runtime_without_shared_routines(data: TranslationData) -> None:
+    translator = VMTranslator(translation_data=data)
+
+    list(translator.translate(_FUNCTIONS.strip().splitlines(), "Main"))
+
+    assert list(translator.translate_runtime()) == []
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_should_preserve_semantics_when_caching_top_of_stack(optimize: bool) -> None:
+    plain = VMTranslator(optimizer=VMPeepholeOptimizer() if optimize else None)
+    cached = VMTranslator(
+        translation_data=TranslationData(tos_cache=True),
+        optimizer=VMPeepholeOptimizer() if optimize else None,
+    )
+
+    expected, actual = _run(plain), _run(cached)
+    for emulator in (expected, actual):
+        emulator.ram[13:16] = [0, 0, 0]
+
+    assert _observe(actual) == _observe(expected)
+    assert cached.translation_data.rom_size < plain.translation_data.rom_size
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        TranslationData(tos_cache=True),
+        TranslationData(tos_cache=True, shared_calls=True, shared_comparisons=True),
+    ],
+)
+def test_should_run_functions_when_caching_top_of_stack(data: TranslationData) -> None:
+    expected = _run_program(VMTranslator.create())
+    actual = _run_program(VMTranslator(translation_data=data))
+
+    assert actual.ram[:13] == expected.ram[:13]
+    assert actual.ram[16:18] == [8, 7]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "push constant 7",
+        "pop that 2",
+        "add",
+        "not",
+        "label LOOP",
+        "if-goto LOOP",
+        "function Main.main 2",
+        "call Math.multiply 2",
+        "return",
+        "move local 0 pointer 1",
+        "compare-goto JLE END",
+    ],
+)
+def test_should_parse_vm_command_once(line: str) -> None:
+    command = VMParser.parse(line)
+
+    assert str(command) == line
+    assert VMParser.parse(f"  {line}  ") == command
+
+
+def test_should_parse_unknown_command_as_trash() -> None:
+    assert VMParser.parse("jump somewhere").opcode is Opcode.TRASH
+
+
+def test_should_push_that_pointer() -> None:
+    vm = ["push constant 3000", "pop pointer 0", "push constant 4000", "pop pointer 1"]
+    vm += ["push pointer 1", "pop static 0", "push pointer 0", "pop static 1"]
+    assembly = "".join(VMTranslator.create().translate(vm, "Test")).splitlines()
+    words = Assembler.create().assemble(assembly + _HALT)
+    emulator = HackEmulator([int(word, base=2) for word in words])
+    emulator.ram[0] = 256
+    emulator.run()
+
+    assert emulator.ram[16:18] == [4000, 3000]
+
+
+def test_translation_cache_should_evict_least_recently_used() -> None:
+    cache = TranslationCache(capacity=2)
+    for key in "abc":
+        if key == "c":
+            cache.get("a")
+        cache.put(key, FileTranslation(key, TranslationData(branching_counter=1)))
+
+    restored = TranslationCache.loads(cache.dumps())
+
+    assert list(restored.entries) == ["a", "c"]
+    assert restored.entries["c"] == cache.entries["c"]
+    assert TranslationCache.loads("not json").entries == {}